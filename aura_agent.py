@@ -1,4 +1,3 @@
-import boto3
 import json
 from typing import List, Dict, Callable, Any
 from dataclasses import dataclass
@@ -6,16 +5,19 @@ import re
 import time
 from botocore.exceptions import ClientError
 
+from aura_mock_bedrock import make_bedrock_runtime, pacing_delay
+
 # Initialize Bedrock client
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# (AURA_BEDROCK_MOCK selects the offline mock runtime)
+bedrock_runtime = make_bedrock_runtime(region_name='us-east-1')
 
 # Model configuration
 CLAUDE_MODEL = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
 
 # Rate limiting configuration
-RETRY_DELAY = 2  # seconds between retries
+RETRY_DELAY = pacing_delay(2, bedrock_runtime)  # seconds between retries
 MAX_RETRIES = 3
-INTER_CALL_DELAY = 1  # seconds between normal API calls
+INTER_CALL_DELAY = pacing_delay(1, bedrock_runtime)  # seconds between normal API calls
 
 # --- Tool Definitions ---
 
@@ -278,7 +280,7 @@ def main():
     
     # Wait between scenarios
     print("\n⏳ Waiting 3 seconds before next interaction...")
-    time.sleep(3)
+    time.sleep(pacing_delay(3, bedrock_runtime))
     
     # Scenario 2: Follow-up investigation
     print("\n" + "="*70)
@@ -294,7 +296,7 @@ def main():
     
     # Wait between scenarios
     print("\n⏳ Waiting 3 seconds before next interaction...")
-    time.sleep(3)
+    time.sleep(pacing_delay(3, bedrock_runtime))
     
     # Scenario 3: Grant approval
     print("\n" + "="*70)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+AURA Bedrock Client Pool
+Spreads model calls across regions and inference profiles.
+
+A single bedrock-runtime client in one region caps the agents at that
+region's quota and fails with it. The pool holds one client per
+configured endpoint (a region, an inference profile and, optionally, an
+AWS credentials profile) and picks one for each call. The pick is
+weighted by:
+
+    1 / latency EWMA  x  (1 - throttle rate)^2  x  (1 - error rate)^2
+
+An endpoint that throttles or errors is cooled down for an exponentially
+growing period, and the call fails over at once to the next endpoint
+that has not been tried yet. The caller only sees an error when every
+endpoint has failed the call. Each response carries a `servedBy` entry
+naming the endpoint that answered.
+
+Endpoints come from AURA_BEDROCK_ENDPOINTS, either inline JSON or a file:
+
+    [
+      {"region": "us-east-1", "model_id": "us.anthropic.claude-sonnet-4-20250514-v1:0"},
+      {"region": "us-west-2", "model_id": "us.anthropic.claude-sonnet-4-20250514-v1:0"},
+      {"region": "eu-west-1", "model_id": "eu.anthropic.claude-sonnet-4-20250514-v1:0",
+       "profile": "aura-eu"}
+    ]
+
+An endpoint with a "mock" key is a local fake. Its value is a
+MockBedrockRuntime config with that endpoint's own latency and RPM, so
+fail-over and quota scaling can be exercised offline:
+
+    python3 aura_bedrock_pool.py --calls 300 --concurrency 24
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from aura_mock_bedrock import MockBedrockRuntime
+
+# Errors that say nothing about the request itself, so another endpoint may succeed
+THROTTLE_CODES = {'ThrottlingException', 'TooManyRequestsException'}
+FAILOVER_CODES = {'ServiceUnavailableException', 'ModelNotReadyException',
+                  'InternalServerException', 'ModelTimeoutException',
+                  'AccessDeniedException', 'ResourceNotFoundException'}
+
+# Three regional fakes for the demo and offline tests
+DEMO_ENDPOINTS = [
+    {'region': 'us-east-1', 'mock': {'latency': {'median_ms': 900}, 'throttle': {'rpm': 60}}},
+    {'region': 'us-west-2', 'mock': {'latency': {'median_ms': 1100}, 'throttle': {'rpm': 60}}},
+    {'region': 'eu-west-1', 'mock': {'latency': {'median_ms': 1400}, 'throttle': {'rpm': 40, 'rate': 0.02}}},
+]
+
+
+class Endpoint:
+    """One region / inference profile and what the pool has observed of it"""
+
+    def __init__(self, client, region: str, model_id: Optional[str] = None,
+                 profile: Optional[str] = None):
+        self.client = client
+        self.region = region
+        self.model_id = model_id
+        self.profile = profile
+        self.name = '/'.join(part for part in (profile, region, model_id) if part)
+        self.latency_ms = None
+        self.throttle_rate = 0.0
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.counters = {'calls': 0, 'served': 0, 'throttled': 0, 'errors': 0}
+
+    def weight(self, default_latency_ms: float) -> float:
+        latency_s = (self.latency_ms or default_latency_ms) / 1000
+        health = (1 - self.throttle_rate) ** 2 * (1 - self.error_rate) ** 2
+        # Never zero, so a recovered endpoint keeps being sampled
+        return max(health, 0.01) / max(latency_s, 0.001)
+
+    def stats(self) -> dict:
+        return dict(self.counters,
+                    latency_ms=round(self.latency_ms, 1) if self.latency_ms else None,
+                    throttle_rate=round(self.throttle_rate, 3),
+                    error_rate=round(self.error_rate, 3),
+                    cooling_down=self.cooldown_until > time.monotonic())
+
+
+class BedrockClientPool:
+    """invoke_model() over several endpoints with weighted choice and fail-over"""
+
+    def __init__(self, endpoints: List[Endpoint], alpha: float = 0.2,
+                 rate_alpha: float = 0.1, base_cooldown_s: float = 1.0,
+                 max_cooldown_s: float = 30.0, seed: Optional[int] = None):
+        if not endpoints:
+            raise ValueError("BedrockClientPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.alpha = alpha
+        self.rate_alpha = rate_alpha
+        self.base_cooldown_s = base_cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @property
+    def pacing_scale(self) -> Optional[float]:
+        """Scale for pacing_delay(): only an all-fake pool skips real pacing"""
+        scales = [getattr(e.client, 'pacing_scale', None) for e in self.endpoints]
+        return None if None in scales else max(scales)
+
+    def _order(self) -> List[Endpoint]:
+        """Endpoints to try for one call: a weighted pick first, then by weight"""
+        with self.lock:
+            now = time.monotonic()
+            known = [e.latency_ms for e in self.endpoints if e.latency_ms]
+            default_latency = sum(known) / len(known) if known else 1000.0
+            ready = [e for e in self.endpoints if e.cooldown_until <= now]
+            cooling = sorted((e for e in self.endpoints if e.cooldown_until > now),
+                             key=lambda e: e.cooldown_until)
+            weights = {e.name: e.weight(default_latency) for e in ready}
+            order = []
+            while ready:
+                pick = self.random.choices(ready, weights=[weights[e.name] for e in ready])[0]
+                order.append(pick)
+                ready.remove(pick)
+            # Cooling endpoints are a last resort, soonest-available first
+            return order + cooling
+
+    def _record(self, endpoint: Endpoint, latency_ms: float = None,
+                throttled: bool = False, error: bool = False):
+        with self.lock:
+            endpoint.counters['calls'] += 1
+            endpoint.throttle_rate += self.rate_alpha * (throttled - endpoint.throttle_rate)
+            endpoint.error_rate += self.rate_alpha * (error - endpoint.error_rate)
+            if throttled or error:
+                endpoint.counters['throttled' if throttled else 'errors'] += 1
+                endpoint.consecutive_failures += 1
+                cooldown = min(self.max_cooldown_s,
+                               self.base_cooldown_s * 2 ** (endpoint.consecutive_failures - 1))
+                endpoint.cooldown_until = time.monotonic() + cooldown
+                return
+            endpoint.counters['served'] += 1
+            endpoint.consecutive_failures = 0
+            endpoint.cooldown_until = 0.0
+            if endpoint.latency_ms is None:
+                endpoint.latency_ms = latency_ms
+            else:
+                endpoint.latency_ms += self.alpha * (latency_ms - endpoint.latency_ms)
+
+    def invoke_model(self, modelId: str, body, **kwargs) -> dict:
+        last_error = None
+        order = self._order()
+        for attempt, endpoint in enumerate(order, 1):
+            started = time.monotonic()
+            try:
+                response = endpoint.client.invoke_model(
+                    modelId=endpoint.model_id or modelId, body=body, **kwargs)
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code not in THROTTLE_CODES and code not in FAILOVER_CODES:
+                    # The request itself is bad; another region would refuse it too
+                    raise
+                self._record(endpoint, throttled=code in THROTTLE_CODES, error=code in FAILOVER_CODES)
+                last_error = e
+                continue
+            except BotoCoreError as e:
+                self._record(endpoint, error=True)
+                last_error = e
+                continue
+            self._record(endpoint, latency_ms=(time.monotonic() - started) * 1000)
+            response['servedBy'] = {
+                'endpoint': endpoint.name,
+                'region': endpoint.region,
+                'model_id': endpoint.model_id or modelId,
+                'attempts': attempt
+            }
+            return response
+        raise last_error
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {e.name: e.stats() for e in self.endpoints}
+
+
+def build_endpoint(spec: dict) -> Endpoint:
+    """An Endpoint from one AURA_BEDROCK_ENDPOINTS entry"""
+    if 'mock' in spec:
+        client = MockBedrockRuntime(spec['mock'])
+    else:
+        import boto3
+        session = boto3.Session(profile_name=spec['profile']) if spec.get('profile') else boto3
+        client = session.client('bedrock-runtime', region_name=spec['region'])
+    return Endpoint(client, spec['region'], spec.get('model_id'), spec.get('profile'))
+
+
+def load_endpoint_specs(setting: str) -> list:
+    """AURA_BEDROCK_ENDPOINTS value: inline JSON or a path to a JSON file"""
+    if setting.lstrip().startswith('['):
+        return json.loads(setting)
+    with open(setting, 'r') as f:
+        return json.load(f)
+
+
+def make_pool(specs: list, seed: Optional[int] = None) -> BedrockClientPool:
+    return BedrockClientPool([build_endpoint(spec) for spec in specs], seed=seed)
+
+
+def run_load(pool: BedrockClientPool, calls: int, concurrency: int) -> dict:
+    """Fire `calls` identical requests at the pool; returns served/failed-over/failed counts"""
+    body = json.dumps({
+        'anthropic_version': 'bedrock-2023-05-31',
+        'max_tokens': 200,
+        'messages': [{'role': 'user', 'content': 'Site DUB-07 has KPI degradation. Investigate.'}]
+    })
+
+    def one(_):
+        try:
+            return pool.invoke_model(modelId='us.anthropic.claude-sonnet-4-20250514-v1:0',
+                                     body=body)['servedBy']['attempts']
+        except (ClientError, BotoCoreError):
+            return None
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        attempts = list(executor.map(one, range(calls)))
+    served = [a for a in attempts if a]
+    return {
+        'elapsed_s': round(time.monotonic() - started, 2),
+        'served': len(served),
+        'failed_over': sum(1 for a in served if a > 1),
+        'failed': calls - len(served)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise the Bedrock client pool")
+    parser.add_argument('--endpoints', help='Endpoint JSON (default: three local regional fakes)')
+    parser.add_argument('--calls', type=int, default=150)
+    parser.add_argument('--concurrency', type=int, default=24)
+    parser.add_argument('--time-scale', type=float, default=0.05,
+                        help='Latency scale for fakes (1 = real time)')
+    args = parser.parse_args()
+
+    specs = load_endpoint_specs(args.endpoints) if args.endpoints else DEMO_ENDPOINTS
+    for spec in specs:
+        if 'mock' in spec:
+            spec['mock'].setdefault('time_scale', args.time_scale)
+
+    print("=" * 70)
+    print("AURA Bedrock Client Pool")
+    print("=" * 70)
+    single = run_load(make_pool(specs[:1], seed=7), args.calls, args.concurrency)
+    pool = make_pool(specs, seed=7)
+    pooled = run_load(pool, args.calls, args.concurrency)
+    for label, result in ((f"Single ({specs[0]['region']})", single), (f"Pool ({len(specs)})", pooled)):
+        print(f"{label:<22} {args.calls} calls in {result['elapsed_s']:.2f}s | served {result['served']} | "
+              f"failed over {result['failed_over']} | failed {result['failed']}")
+
+    print(f"\n{'ENDPOINT':<28} {'SERVED':>7} {'THROTTLED':>10} {'ERRORS':>7} {'EWMA':>9} {'THR%':>6}")
+    for name, s in pool.stats().items():
+        latency = f"{s['latency_ms']:.0f}ms" if s['latency_ms'] else '-'
+        print(f"{name:<28} {s['served']:>7} {s['throttled']:>10} {s['errors']:>7} "
+              f"{latency:>9} {s['throttle_rate'] * 100:>5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+AURA Circuit Breaker
+Per-vendor health tracking for the MCP Gateway Router.
+
+Each vendor adapter gets one breaker. The breaker keeps a rolling window
+of recent calls (outcome + latency) and moves between three states:
+
+    CLOSED     - normal operation, every call goes through
+    OPEN       - adapter is failing or too slow, calls fail fast
+    HALF_OPEN  - cooldown elapsed, a few probe calls test for recovery
+
+The state lives in module globals of the router, so it survives across
+warm Lambda invocations of the same container.
+"""
+
+import threading
+import time
+from collections import deque
+
+CLOSED = 'CLOSED'
+OPEN = 'OPEN'
+HALF_OPEN = 'HALF_OPEN'
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = int(round(pct / 100.0 * (len(sorted_values) - 1)))
+    return float(sorted_values[index])
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for a single vendor adapter"""
+
+    def __init__(self, name: str,
+                 window_size: int = 50,
+                 min_calls: int = 5,
+                 failure_rate_threshold: float = 0.5,
+                 slow_call_ms: float = 5000,
+                 slow_call_rate_threshold: float = 0.5,
+                 open_seconds: float = 30,
+                 half_open_max_calls: int = 1,
+                 clock=time.monotonic):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        # Each entry is (ok, latency_ms)
+        self.calls = deque(maxlen=window_size)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.half_open_in_flight = 0
+        self.trip_count = 0
+        self.rejected = 0
+        self.lock = threading.RLock()
+
+    def allow_request(self) -> bool:
+        """Return True if a call to the adapter may proceed"""
+        with self.lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at >= self.open_seconds:
+                    self.state = HALF_OPEN
+                    self.half_open_in_flight = 0
+                else:
+                    self.rejected += 1
+                    return False
+
+            if self.state == HALF_OPEN:
+                if self.half_open_in_flight >= self.half_open_max_calls:
+                    self.rejected += 1
+                    return False
+                self.half_open_in_flight += 1
+
+            return True
+
+    def record_success(self, latency_ms: float):
+        """Record a successful adapter call"""
+        with self.lock:
+            if self.state == HALF_OPEN:
+                if latency_ms >= self.slow_call_ms:
+                    self._trip()
+                    return
+                # Probe succeeded - start over with a clean window
+                self.state = CLOSED
+                self.half_open_in_flight = 0
+                self.calls.clear()
+            self.calls.append((True, latency_ms))
+            self._evaluate()
+
+    def record_failure(self, latency_ms: float):
+        """Record a failed or timed-out adapter call"""
+        with self.lock:
+            if self.state == HALF_OPEN:
+                self._trip()
+                return
+            self.calls.append((False, latency_ms))
+            self._evaluate()
+
+    def retry_after_seconds(self) -> float:
+        """Seconds until the breaker will let a probe through"""
+        with self.lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (self.clock() - self.opened_at))
+
+    def _evaluate(self):
+        if self.state != CLOSED or len(self.calls) < self.min_calls:
+            return
+        total = len(self.calls)
+        failures = sum(1 for ok, _ in self.calls if not ok)
+        slow = sum(1 for _, latency in self.calls if latency >= self.slow_call_ms)
+        if (failures / total >= self.failure_rate_threshold or
+                slow / total >= self.slow_call_rate_threshold):
+            self._trip()
+
+    def _trip(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self.half_open_in_flight = 0
+        self.trip_count += 1
+
+    def snapshot(self) -> dict:
+        """Current state, error rate and latency percentiles"""
+        with self.lock:
+            latencies = sorted(latency for _, latency in self.calls)
+            total = len(self.calls)
+            failures = sum(1 for ok, _ in self.calls if not ok)
+            return {
+                'name': self.name,
+                'state': self.state,
+                'calls_in_window': total,
+                'error_rate': round(failures / total, 3) if total else 0.0,
+                'p50_ms': round(percentile(latencies, 50), 1),
+                'p95_ms': round(percentile(latencies, 95), 1),
+                'p99_ms': round(percentile(latencies, 99), 1),
+                'trip_count': self.trip_count,
+                'rejected': self.rejected,
+                'retry_after_s': round(self.retry_after_seconds(), 1)
+            }
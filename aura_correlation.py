@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+AURA Alarm Correlation Engine
+Collapses alarm storms into one incident per probable root element.
+
+One upstream fiber cut raises KPI alarms on every dependent cell. Sending
+each of those to the agent costs several Bedrock round trips apiece, so
+alarms are correlated first:
+
+1. Each alarm's candidate root causes come from the topology: the alarmed
+   element plus everything upstream of it.
+2. Alarms whose candidate sets overlap are grouped into one cluster while
+   they keep arriving within `window_s` of each other (capped at
+   `max_span_s` per cluster).
+3. When a cluster closes, a greedy cover picks the element explaining the
+   most alarms. An upstream element only qualifies if at least
+   `min_coverage` of the sites it feeds are alarming, so two unrelated
+   faults are not blamed on a shared core router. Ties go to the most
+   specific element.
+
+Memory is bounded by `max_buffered` alarms; past that the oldest cluster
+is closed early. Run this file directly to measure alarms/sec.
+"""
+
+import argparse
+import itertools
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from aura_topology import TopologyIndex
+
+
+class AlarmCluster:
+    """Alarms that share topology and time, not yet turned into incidents"""
+
+    __slots__ = ('cluster_id', 'alarms', 'candidates', 'first_ts', 'last_ts')
+
+    def __init__(self, cluster_id: int, timestamp: float):
+        self.cluster_id = cluster_id
+        self.alarms = []       # (alarm, candidate set) pairs
+        self.candidates = set()
+        self.first_ts = timestamp
+        self.last_ts = timestamp
+
+
+class AlarmCorrelator:
+    """Streaming time-window + topology alarm grouping"""
+
+    def __init__(self, topology: TopologyIndex,
+                 window_s: float = 60.0,
+                 max_span_s: float = 300.0,
+                 min_coverage: float = 0.5,
+                 max_buffered: int = 50000,
+                 max_alarms_per_incident: int = 50,
+                 run_id: Optional[str] = None):
+        self.topology = topology
+        self.window_s = window_s
+        self.max_span_s = max_span_s
+        self.min_coverage = min_coverage
+        self.max_buffered = max_buffered
+        self.max_alarms_per_incident = max_alarms_per_incident
+
+        self.clusters: Dict[int, AlarmCluster] = {}
+        self.element_cluster: Dict[str, int] = {}
+        self.candidate_cache: Dict[str, frozenset] = {}
+        self.cluster_ids = itertools.count(1)
+        # Incident IDs key idempotent failovers downstream, so they must not
+        # repeat across runs: a per-run prefix ahead of the counter
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.incident_ids = itertools.count(1)
+        self.buffered = 0
+        self.last_flush = 0.0
+
+        self.stats = {'alarms_in': 0, 'incidents_out': 0, 'forced_closes': 0}
+
+    def _candidates(self, element_id: str) -> frozenset:
+        candidates = self.candidate_cache.get(element_id)
+        if candidates is None:
+            if len(self.candidate_cache) >= self.max_buffered:
+                self.candidate_cache.clear()
+            candidates = self.topology.alarm_candidates(element_id)
+            self.candidate_cache[element_id] = candidates
+        return candidates
+
+    def ingest(self, alarm: dict) -> List[dict]:
+        """
+        Add one alarm ({'element_id', 'timestamp', ...}).
+        Returns any incidents closed as a result.
+        """
+        timestamp = alarm.get('timestamp') or time.time()
+        self.stats['alarms_in'] += 1
+
+        # Scanning every open cluster per alarm would make ingest O(clusters);
+        # a tenth of the window is plenty of resolution for closing them
+        incidents = []
+        if timestamp - self.last_flush >= self.window_s / 10:
+            incidents = self.flush(now=timestamp)
+            self.last_flush = timestamp
+
+        candidates = self._candidates(alarm['element_id'])
+        matching = {self.element_cluster[e] for e in candidates if e in self.element_cluster}
+
+        if not matching:
+            cluster = AlarmCluster(next(self.cluster_ids), timestamp)
+            self.clusters[cluster.cluster_id] = cluster
+        else:
+            clusters = sorted((self.clusters[c] for c in matching),
+                              key=lambda c: -len(c.alarms))
+            cluster = clusters[0]
+            for other in clusters[1:]:
+                self._merge(cluster, other)
+
+        cluster.alarms.append((alarm, candidates))
+        cluster.last_ts = max(cluster.last_ts, timestamp)
+        for element in candidates - cluster.candidates:
+            self.element_cluster[element] = cluster.cluster_id
+        cluster.candidates |= candidates
+        self.buffered += 1
+
+        while self.buffered > self.max_buffered and self.clusters:
+            oldest = min(self.clusters.values(), key=lambda c: c.first_ts)
+            self.stats['forced_closes'] += 1
+            incidents.extend(self._close(oldest))
+
+        return incidents
+
+    def _merge(self, into: AlarmCluster, other: AlarmCluster):
+        into.alarms.extend(other.alarms)
+        into.first_ts = min(into.first_ts, other.first_ts)
+        into.last_ts = max(into.last_ts, other.last_ts)
+        for element in other.candidates:
+            self.element_cluster[element] = into.cluster_id
+        into.candidates |= other.candidates
+        del self.clusters[other.cluster_id]
+
+    def flush(self, now: Optional[float] = None, force: bool = False) -> List[dict]:
+        """Close clusters that went quiet or grew too long (all of them if force)"""
+        now = now or time.time()
+        incidents = []
+        for cluster in list(self.clusters.values()):
+            if (force or now - cluster.last_ts >= self.window_s or
+                    now - cluster.first_ts >= self.max_span_s):
+                incidents.extend(self._close(cluster))
+        return incidents
+
+    def _close(self, cluster: AlarmCluster) -> List[dict]:
+        del self.clusters[cluster.cluster_id]
+        for element in cluster.candidates:
+            if self.element_cluster.get(element) == cluster.cluster_id:
+                del self.element_cluster[element]
+        self.buffered -= len(cluster.alarms)
+
+        incidents = []
+        remaining = cluster.alarms
+        while remaining:
+            root, members = self._best_root(remaining)
+            incidents.append(self._incident(root, members))
+            remaining = [pair for pair in remaining if root not in pair[1]]
+        self.stats['incidents_out'] += len(incidents)
+        return incidents
+
+    def _best_root(self, alarms: list):
+        """The candidate element explaining the most alarms"""
+        covered: Dict[str, list] = {}
+        sites: Dict[str, set] = {}
+        for pair in alarms:
+            alarm, candidates = pair
+            site_id = self.topology.site_of(alarm['element_id'])
+            for element in candidates:
+                covered.setdefault(element, []).append(pair)
+                sites.setdefault(element, set()).add(site_id)
+
+        best, best_key = None, None
+        for element, members in covered.items():
+            coverage = len(sites[element]) / self.topology.dependent_site_count(element)
+            if coverage < self.min_coverage:
+                continue
+            key = (len(members),
+                   -self.topology.dependent_site_count(element),
+                   len(self._candidates(element)))
+            if best_key is None or key > best_key:
+                best, best_key = element, key
+
+        if best is None:
+            # Nothing upstream qualifies; the first alarm is its own root
+            first = alarms[0][0]['element_id']
+            return first, [pair for pair in alarms if first in pair[1]]
+        return best, covered[best]
+
+    def _incident(self, root: str, members: list) -> dict:
+        alarms = [alarm for alarm, _ in members]
+        sites = sorted({self.topology.site_of(a['element_id']) for a in alarms})
+        timestamps = [a.get('timestamp') or 0 for a in alarms]
+        blast = self.topology.blast_radius(root)
+        coverage = len(sites) / self.topology.dependent_site_count(root)
+        return {
+            'incident_id': f"INC-{self.run_id}-{next(self.incident_ids):06d}",
+            'root_element': root,
+            'confidence': round(min(1.0, coverage), 2),
+            'alarm_count': len(alarms),
+            'sites': sites,
+            'first_seen': min(timestamps),
+            'last_seen': max(timestamps),
+            'isolated_sites': blast['isolated_sites'],
+            'alarms': alarms[:self.max_alarms_per_incident],
+            'alarms_truncated': max(0, len(alarms) - self.max_alarms_per_incident),
+            'prompt': (f"Correlated incident: {len(alarms)} alarms across {len(sites)} "
+                       f"site(s) ({', '.join(sites[:10])}) point to probable root element "
+                       f"{root}. Please investigate {root} and propose remediation.")
+        }
+
+
+def synthetic_topology(sites_per_agg: int = 20, aggs: int = 10) -> TopologyIndex:
+    """A generated two-core, multi-aggregation topology for benchmarking"""
+    data = {'sites': {}, 'links': {}, 'upstream': {
+        'CORE-A': {'type': 'core', 'upstream': []},
+        'CORE-B': {'type': 'core', 'upstream': []},
+    }}
+    for a in range(aggs):
+        agg = f"AGG-{a:02d}"
+        data['upstream'][agg] = {'type': 'aggregation',
+                                 'upstream': ['CORE-A' if a % 2 else 'CORE-B']}
+        for s in range(sites_per_agg):
+            site = f"S{a:02d}-{s:03d}"
+            data['sites'][site] = {
+                'vendor': 'Nokia', 'region': f"S{a:02d}",
+                'cells': [f"{site}-C{c}" for c in range(3)],
+                'links': [f"{site}-FIBER", f"{site}-NTN"]
+            }
+            data['links'][f"{site}-FIBER"] = {'type': 'fiber', 'role': 'primary',
+                                              'backup': f"{site}-NTN", 'upstream': [agg]}
+            data['links'][f"{site}-NTN"] = {'type': 'satellite', 'role': 'backup',
+                                            'upstream': []}
+    return TopologyIndex(data)
+
+
+def benchmark(alarms: int):
+    """Replay a fiber-cut storm plus background noise and measure throughput"""
+    topology = synthetic_topology()
+    correlator = AlarmCorrelator(topology)
+    storm_sites = [s for s in topology.sites if s.startswith('S03-')]
+    all_cells = [c for site in topology.sites.values() for c in site['cells']]
+
+    stream = []
+    start = 1_700_000_000.0
+    for i in range(alarms):
+        if i % 10 == 0:
+            # Background noise on random cells across the network
+            cell = all_cells[(i * 7919) % len(all_cells)]
+        else:
+            site = storm_sites[i % len(storm_sites)]
+            cell = f"{site}-C{i % 3}"
+        stream.append({'alarm_id': i, 'element_id': cell,
+                       'timestamp': start + i * 0.001, 'type': 'KPI_DEGRADED'})
+
+    started = time.perf_counter()
+    incidents = []
+    for alarm in stream:
+        incidents.extend(correlator.ingest(alarm))
+    incidents.extend(correlator.flush(force=True))
+    elapsed = time.perf_counter() - started
+
+    roots = {}
+    for incident in incidents:
+        roots[incident['root_element']] = roots.get(incident['root_element'], 0) + incident['alarm_count']
+
+    print("=" * 70)
+    print("AURA Alarm Correlation - Benchmark")
+    print("=" * 70)
+    print(f"Alarms ingested:    {alarms:,}")
+    print(f"Throughput:         {alarms / elapsed:,.0f} alarms/sec")
+    print(f"Incidents raised:   {len(incidents)}")
+    top = sorted(roots.items(), key=lambda item: -item[1])[:3]
+    print(f"Top roots:          {', '.join(f'{r} ({n})' for r, n in top)}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the alarm correlator")
+    parser.add_argument('--alarms', type=int, default=100000)
+    args = parser.parse_args()
+    benchmark(args.alarms)
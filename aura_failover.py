@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+AURA Bulk Failover Orchestrator
+Fails over many sites at once without an LLM turn per site.
+
+A regional fiber event can take dozens of sites down together. Driving
+each failover through the agent costs one tool call to execute and more
+turns to verify, serialised behind Bedrock rate limits. Instead:
+
+1. plan() resolves every site to its vendor and backup link. The LLM (or
+   an operator) reviews and approves the whole batch once.
+2. execute() runs the failovers through the gateway, at most
+   `concurrency` at a time, with consecutive failovers on the same vendor
+   spaced `vendor_stagger_s` apart so no orchestration API is stampeded.
+   Given a `submit` call, each failover is submitted as an async
+   operation and polled until it finishes or `operation_timeout_s`
+   passes; a failover still running then is reported PENDING.
+3. Each failover is verified by polling measure_link_latency on the
+   backup link until it reports healthy within `max_latency_ms`.
+
+The result is one outcome row per site.
+
+Usage:
+    python3 aura_failover.py DUB-07 LON-15 PAR-03 --concurrency 4
+"""
+
+import argparse
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from aura_kpi_schema import VENDORS, canonical_health, normalize_record
+from aura_topology import TopologyIndex, site_from_name
+
+# Tool call signature shared with aura_with_gateway.call_gateway
+GatewayCall = Callable[[str, str], dict]
+
+
+class FailoverOrchestrator:
+    """Concurrency-limited, vendor-staggered, verified bulk failover"""
+
+    def __init__(self, call: GatewayCall,
+                 topology: Optional[TopologyIndex] = None,
+                 submit: Optional[GatewayCall] = None,
+                 concurrency: int = 4,
+                 vendor_stagger_s: float = 2.0,
+                 verify_attempts: int = 5,
+                 verify_interval_s: float = 2.0,
+                 max_latency_ms: float = 300.0,
+                 operation_poll_s: float = 5.0,
+                 operation_timeout_s: float = 900.0):
+        self.call = call
+        self.topology = topology
+        self.submit = submit
+        self.concurrency = concurrency
+        self.vendor_stagger_s = vendor_stagger_s
+        self.verify_attempts = verify_attempts
+        self.verify_interval_s = verify_interval_s
+        self.max_latency_ms = max_latency_ms
+        self.operation_poll_s = operation_poll_s
+        self.operation_timeout_s = operation_timeout_s
+
+        self.lock = threading.Lock()
+        self.vendor_next_start: Dict[str, float] = {}
+
+    def _backup_link(self, site_id: str) -> str:
+        if self.topology:
+            backups = self.topology.backup_links(site_id)
+            if backups:
+                return backups[0]
+        return f"{site_id}-NTN"
+
+    def plan(self, sites: List[str]) -> dict:
+        """What execute() would do, for approval; no network calls"""
+        entries, unknown = [], []
+        for site in dict.fromkeys(site_from_name(s.strip().upper()) for s in sites if s.strip()):
+            vendor = self.topology.vendor_of(site) if self.topology else None
+            if self.topology and site not in self.topology.sites:
+                unknown.append(site)
+                continue
+            entries.append({
+                'site_id': site,
+                'vendor': vendor,
+                'backup_link': self._backup_link(site)
+            })
+        by_vendor: Dict[str, int] = {}
+        for entry in entries:
+            by_vendor[entry['vendor'] or 'unknown'] = by_vendor.get(entry['vendor'] or 'unknown', 0) + 1
+        return {
+            'batch_id': f"FO-{uuid.uuid4().hex[:8]}",
+            'sites': entries,
+            'unknown_sites': unknown,
+            'by_vendor': by_vendor,
+            'concurrency': self.concurrency,
+            'vendor_stagger_s': self.vendor_stagger_s,
+            'estimated_duration_s': self._estimate(by_vendor, len(entries))
+        }
+
+    def _estimate(self, by_vendor: Dict[str, int], total: int) -> float:
+        """Lower bound: the slowest vendor's stagger chain or the concurrency waves"""
+        stagger = max((n - 1 for n in by_vendor.values()), default=0) * self.vendor_stagger_s
+        waves = -(-total // self.concurrency) if total else 0
+        return round(max(stagger, waves * self.verify_interval_s), 1)
+
+    def _wait_for_vendor_slot(self, vendor: Optional[str]):
+        key = vendor or 'unknown'
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.vendor_next_start.get(key, now))
+            self.vendor_next_start[key] = start + self.vendor_stagger_s
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _verify(self, backup_link: str) -> dict:
+        """Poll the backup link until it carries traffic within the latency limit"""
+        last = {}
+        for attempt in range(1, self.verify_attempts + 1):
+            last = self.call("measure_link_latency", backup_link)
+            latency = last.get('latency_ms')
+            if latency is None and last.get('vendor') in VENDORS:
+                # Vendors name it differently (Ericsson reports rtt_ms)
+                latency = normalize_record(last['vendor'], last)['kpis'].get('latency_ms')
+            # A degraded answer is the router's cache from before the failover
+            if ('error' not in last and not last.get('degraded')
+                    and canonical_health(last.get('status')) == 'OK'
+                    and latency is not None and latency <= self.max_latency_ms):
+                return {'verified': True, 'attempts': attempt, 'latency_ms': latency}
+            if attempt < self.verify_attempts:
+                time.sleep(self.verify_interval_s)
+        return {
+            'verified': False,
+            'attempts': self.verify_attempts,
+            'latency_ms': latency,
+            'verify_error': last.get('error') or (
+                f"cached answer ({last.get('cached_age_s')}s old)" if last.get('degraded')
+                else f"status {last.get('status')}")
+        }
+
+    def _wait_for_operation(self, operation_id: str) -> dict:
+        """Poll an async failover until it finishes or times out; returns the adapter result"""
+        deadline = time.monotonic() + self.operation_timeout_s
+        last_error = None
+        while True:
+            record = self.call("get_operation_status", operation_id)
+            if 'error' in record and 'status' not in record:
+                # A failed poll says nothing about the failover; keep polling
+                last_error = record.get('details') or record['error']
+            elif record.get('status') == 'SUCCEEDED':
+                return record.get('result', {})
+            elif record.get('status') == 'FAILED':
+                return {'error': record.get('error', 'operation failed')}
+            else:
+                last_error = None
+            if time.monotonic() + self.operation_poll_s > deadline:
+                state = (f"unknown (last poll: {last_error})" if last_error
+                         else f"still {record.get('status')}")
+                return {
+                    'error': f"operation {operation_id} {state} "
+                             f"after {self.operation_timeout_s:.0f}s",
+                    'operation_id': operation_id,
+                    'pending': True
+                }
+            time.sleep(self.operation_poll_s)
+
+    def _failover_site(self, entry: dict) -> dict:
+        self._wait_for_vendor_slot(entry['vendor'])
+        started = time.monotonic()
+        outcome = dict(entry)
+
+        result = (self.submit or self.call)("initiate_ntn_failover", entry['site_id'])
+        if 'operation_id' in result and 'error' not in result:
+            result = self._wait_for_operation(result['operation_id'])
+        if 'error' in result or result.get('status') != 'SUCCESS':
+            outcome.update({
+                # PENDING: may still complete; check the operation, don't retry
+                'outcome': 'PENDING' if result.get('pending') else 'FAILED',
+                'operation_id': result.get('operation_id'),
+                'error': result.get('error') or f"status {result.get('status')}",
+                'elapsed_s': round(time.monotonic() - started, 2)
+            })
+            return outcome
+
+        outcome['new_active_link'] = (result.get('new_active_link') or
+                                      result.get('new_primary_path') or entry['backup_link'])
+        outcome.update(self._verify(outcome['new_active_link']))
+        outcome['outcome'] = 'VERIFIED' if outcome['verified'] else 'UNVERIFIED'
+        outcome['elapsed_s'] = round(time.monotonic() - started, 2)
+        return outcome
+
+    def execute(self, plan: dict) -> dict:
+        """Run an approved plan; returns one outcome row per site"""
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            outcomes = list(pool.map(self._failover_site, plan['sites']))
+
+        totals: Dict[str, int] = {}
+        for outcome in outcomes:
+            totals[outcome['outcome']] = totals.get(outcome['outcome'], 0) + 1
+        return {
+            'batch_id': plan['batch_id'],
+            'elapsed_s': round(time.monotonic() - started, 2),
+            'totals': totals,
+            'outcomes': outcomes,
+            'unknown_sites': plan.get('unknown_sites', [])
+        }
+
+
+def format_outcomes(report: dict) -> str:
+    """Fixed-width outcome table for a terminal"""
+    lines = [f"{'SITE':<10} {'VENDOR':<10} {'OUTCOME':<11} {'ACTIVE LINK':<20} "
+             f"{'LATENCY':>8} {'TRIES':>5} {'TIME':>6}"]
+    for o in report['outcomes']:
+        latency = f"{o['latency_ms']}ms" if o.get('latency_ms') is not None else '-'
+        lines.append(f"{o['site_id']:<10} {str(o.get('vendor')):<10} {o['outcome']:<11} "
+                     f"{str(o.get('new_active_link', '-')):<20} {latency:>8} "
+                     f"{o.get('attempts', 0):>5} {o['elapsed_s']:>5}s")
+        if o.get('error') or o.get('verify_error'):
+            lines.append(f"{'':<10} └ {o.get('error') or o.get('verify_error')}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AURA bulk NTN failover")
+    parser.add_argument('sites', nargs='+', help='Site IDs to fail over')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--stagger', type=float, default=2.0, help='Seconds between failovers per vendor')
+    parser.add_argument('--yes', action='store_true', help='Skip the approval prompt')
+    args = parser.parse_args()
+
+    from aura_with_gateway import TOPOLOGY, call_gateway, submit_gateway_operation
+
+    orchestrator = FailoverOrchestrator(call_gateway, TOPOLOGY,
+                                        submit=submit_gateway_operation,
+                                        concurrency=args.concurrency,
+                                        vendor_stagger_s=args.stagger)
+    plan = orchestrator.plan(args.sites)
+
+    print("=" * 70)
+    print(f"AURA Bulk Failover - {plan['batch_id']}")
+    print("=" * 70)
+    for entry in plan['sites']:
+        print(f"  {entry['site_id']:<10} {str(entry['vendor']):<10} → {entry['backup_link']}")
+    if plan['unknown_sites']:
+        print(f"  Skipping unknown sites: {', '.join(plan['unknown_sites'])}")
+    print(f"Estimated duration: ≥{plan['estimated_duration_s']}s")
+
+    if not args.yes and input("\n⚠️  SERVICE-IMPACTING. Approve this batch? [y/N] ").strip().lower() != 'y':
+        print("❌ Not approved.")
+        return
+
+    report = orchestrator.execute(plan)
+    print()
+    print(format_outcomes(report))
+    print(f"\nTotals: {report['totals']}  ({report['elapsed_s']}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+AURA Gateway Fixtures
+Record gateway traffic once, replay it offline.
+
+Every script that talks to the MCP Gateway posts through gateway_post().
+The environment chooses what that does:
+
+    AURA_GATEWAY_RECORD=traffic.jsonl   call the live gateway and append every
+                                        request/response pair with its timing
+    AURA_GATEWAY_REPLAY=traffic.jsonl   answer from the fixture, no network
+    AURA_GATEWAY_REPLAY_SPEED=recorded  wait the recorded latency (default),
+                            instant     return at once, or a number that
+                                        scales the recorded latency
+
+A fixture is JSONL. A header line holds the endpoint it was recorded
+against, and each exchange after it holds the request body, status,
+latency, response body and a few headers. Transport failures such as
+timeouts are recorded too and replayed as the same requests exception.
+
+Replay matches on the request body. Fields that differ from run to run,
+such as idempotency keys and callback URLs, are left out of the match.
+Repeated identical requests get their recorded responses in order, and
+the last one is reused after that. A request that was never recorded
+raises ConnectionError, which callers already handle as a gateway
+failure.
+
+    python3 aura_gateway_fixtures.py traffic.jsonl    # summarize a fixture
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_VERSION = 1
+
+# Request fields that change between runs of the same scenario
+VOLATILE_FIELDS = ('idempotency_key', 'callback_url')
+
+# Response headers worth keeping; the rest is API Gateway noise
+KEPT_HEADERS = ('Content-Type', 'Idempotent-Replay', 'Retry-After')
+
+REPLAY_SPEEDS = {'recorded': 1.0, 'instant': 0.0}
+
+
+def match_key(payload) -> str:
+    """Canonical form of a request body for matching"""
+    if not isinstance(payload, dict):
+        return json.dumps(payload, sort_keys=True)
+    return json.dumps({k: v for k, v in payload.items() if k not in VOLATILE_FIELDS},
+                      sort_keys=True)
+
+
+class FixtureResponse:
+    """The parts of requests.Response the gateway callers use"""
+
+    def __init__(self, status_code: int, text: str, headers: dict, elapsed_ms: float):
+        self.status_code = status_code
+        self.text = text
+        self.headers = CaseInsensitiveDict(headers)
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class GatewayRecorder:
+    """Posts to the live gateway and appends each exchange to a fixture"""
+
+    def __init__(self, path: str, post=requests.post):
+        self.path = path
+        self.post_fn = post
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.header_written = os.path.exists(path) and os.path.getsize(path) > 0
+
+    def _write(self, url: str, entry: dict):
+        with self.lock, open(self.path, 'a') as f:
+            if not self.header_written:
+                f.write(json.dumps({
+                    'fixture': 'aura-gateway',
+                    'version': FIXTURE_VERSION,
+                    'endpoint': url,
+                    'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                }) + '\n')
+                self.header_written = True
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+    def post(self, url: str, json=None, **kwargs):
+        sent_at = time.monotonic()
+        entry = {'t': round(sent_at - self.started, 3), 'request': json}
+        try:
+            response = self.post_fn(url, json=json, **kwargs)
+        except requests.exceptions.RequestException as e:
+            entry.update(ms=round((time.monotonic() - sent_at) * 1000, 1),
+                         error=type(e).__name__, message=str(e))
+            self._write(url, entry)
+            raise
+        entry.update(
+            ms=round((time.monotonic() - sent_at) * 1000, 1),
+            status=response.status_code,
+            headers={name: response.headers[name] for name in KEPT_HEADERS
+                     if name in response.headers},
+            body=response.text
+        )
+        self._write(url, entry)
+        return response
+
+
+def load_fixture(path: str):
+    """(header, exchanges) from a fixture file"""
+    header, exchanges = {}, []
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get('fixture') == 'aura-gateway':
+                header = entry
+            else:
+                exchanges.append(entry)
+    return header, exchanges
+
+
+class GatewayReplayer:
+    """Answers gateway posts from a fixture"""
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self.header, exchanges = load_fixture(path)
+        self.lock = threading.Lock()
+        self.recorded = {}
+        for entry in exchanges:
+            self.recorded.setdefault(match_key(entry['request']), []).append(entry)
+        self.served = {}
+        self.misses = 0
+
+    @property
+    def endpoint(self) -> Optional[str]:
+        return self.header.get('endpoint')
+
+    def _next(self, key: str) -> Optional[dict]:
+        with self.lock:
+            entries = self.recorded.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            index = self.served.get(key, 0)
+            self.served[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def post(self, url: str, json=None, timeout=None, **kwargs):
+        entry = self._next(match_key(json))
+        if entry is None:
+            raise requests.exceptions.ConnectionError(
+                f"No recorded gateway response for {match_key(json)} in {self.path}")
+        delay_s = entry['ms'] * self.speed / 1000
+        if timeout is not None:
+            delay_s = min(delay_s, timeout)
+        if delay_s > 0:
+            time.sleep(delay_s)
+        if 'error' in entry:
+            error = getattr(requests.exceptions, entry['error'], requests.exceptions.ConnectionError)
+            raise error(entry.get('message', entry['error']))
+        return FixtureResponse(entry['status'], entry['body'], entry.get('headers', {}), entry['ms'])
+
+
+def replay_speed(setting: str) -> float:
+    return REPLAY_SPEEDS[setting] if setting in REPLAY_SPEEDS else float(setting)
+
+
+def make_gateway_post():
+    """The gateway post function selected by AURA_GATEWAY_RECORD / AURA_GATEWAY_REPLAY"""
+    if os.environ.get('AURA_GATEWAY_REPLAY'):
+        replayer = GatewayReplayer(
+            os.environ['AURA_GATEWAY_REPLAY'],
+            replay_speed(os.environ.get('AURA_GATEWAY_REPLAY_SPEED', 'recorded'))
+        )
+        print(f"📼 Replaying gateway traffic from {replayer.path}", file=sys.stderr)
+        return replayer.post, replayer
+    if os.environ.get('AURA_GATEWAY_RECORD'):
+        recorder = GatewayRecorder(os.environ['AURA_GATEWAY_RECORD'])
+        print(f"⏺️  Recording gateway traffic to {recorder.path}", file=sys.stderr)
+        return recorder.post, recorder
+    return requests.post, None
+
+
+gateway_post, fixture = make_gateway_post()
+
+
+def load_gateway_endpoint(config_file: str = None) -> str:
+    """
+    The gateway endpoint from the config file. When replaying without
+    one, the endpoint recorded in the fixture is used instead.
+    """
+    config_file = config_file or os.environ.get('AURA_GATEWAY_CONFIG', 'gateway_config.json')
+    try:
+        with open(config_file, 'r') as f:
+            return json.load(f)['endpoint']
+    except FileNotFoundError:
+        if isinstance(fixture, GatewayReplayer) and fixture.endpoint:
+            return fixture.endpoint
+        raise
+
+
+def summarize(path: str) -> dict:
+    """Per-tool counts, statuses and latencies of a fixture"""
+    header, exchanges = load_fixture(path)
+    tools = {}
+    for entry in exchanges:
+        request = entry['request'] if isinstance(entry['request'], dict) else {}
+        stats = tools.setdefault(request.get('tool', '?'), {'requests': 0, 'statuses': {}, 'ms': []})
+        stats['requests'] += 1
+        status = str(entry.get('status', entry.get('error')))
+        stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+        stats['ms'].append(entry['ms'])
+    for stats in tools.values():
+        ordered = sorted(stats.pop('ms'))
+        stats['p50_ms'] = ordered[len(ordered) // 2]
+        stats['max_ms'] = ordered[-1]
+    duration = exchanges[-1]['t'] if exchanges else 0
+    return {'endpoint': header.get('endpoint'), 'recorded_at': header.get('recorded_at'),
+            'exchanges': len(exchanges), 'duration_s': duration, 'tools': tools}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize an AURA gateway fixture")
+    parser.add_argument('fixture', help='Fixture file written with AURA_GATEWAY_RECORD')
+    args = parser.parse_args()
+
+    summary = summarize(args.fixture)
+    print(f"Endpoint:  {summary['endpoint']}")
+    print(f"Recorded:  {summary['recorded_at']}")
+    print(f"Exchanges: {summary['exchanges']} over {summary['duration_s']:.1f}s\n")
+    print(f"{'TOOL':<28} {'REQS':>6} {'P50':>9} {'MAX':>9}  STATUSES")
+    for tool, stats in sorted(summary['tools'].items()):
+        print(f"{tool:<28} {stats['requests']:>6} {stats['p50_ms']:>7.0f}ms {stats['max_ms']:>7.0f}ms  "
+              f"{stats['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+AURA Hedged Requests
+Tail-latency control for read-only gateway calls.
+
+A hedged call sends the primary request, waits for an adaptive delay
+(the observed p95 for that tool), and if no answer has arrived sends a
+second identical request. Whichever answers first wins.
+
+Hedges are paid for from a token budget that only refills by a fraction
+of each primary request, so hedging can never add more than
+`budget_ratio` extra load on top of normal traffic.
+
+The `requests` library cannot abort an HTTP call that is already in
+flight, so the losing attempt is abandoned: its response is discarded
+and only its latency is recorded. A hedge that has not started yet is
+cancelled outright.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict
+
+from aura_circuit_breaker import percentile
+
+
+class HedgeTimeout(TimeoutError):
+    """No attempt of a hedged call answered within its timeout"""
+
+    def __init__(self, tool: str, waited_s: float, attempts: int):
+        super().__init__(f"Gateway timeout: no response to {tool} after {waited_s:.1f}s "
+                         f"({attempts} attempt{'s' if attempts > 1 else ''} still pending)")
+        self.tool = tool
+        self.waited_s = waited_s
+        self.attempts = attempts
+
+
+class LatencyWindow:
+    """Rolling window of latency samples in milliseconds"""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def add(self, latency_ms: float):
+        self.samples.append(latency_ms)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentiles(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            'count': len(ordered),
+            'p50_ms': round(percentile(ordered, 50), 1),
+            'p95_ms': round(percentile(ordered, 95), 1),
+            'p99_ms': round(percentile(ordered, 99), 1)
+        }
+
+
+class HedgedCaller:
+    """Issues hedged calls and reports per-tool tail latency"""
+
+    def __init__(self,
+                 budget_ratio: float = 0.05,
+                 max_budget: float = 10.0,
+                 min_samples: int = 20,
+                 default_delay_s: float = 1.0,
+                 min_delay_s: float = 0.05,
+                 max_workers: int = 16):
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self.min_samples = min_samples
+        self.default_delay_s = default_delay_s
+        self.min_delay_s = min_delay_s
+
+        self.budget = 0.0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='aura-hedge')
+
+        # Latency of the first attempt alone: what an unhedged client sees
+        self.primary_latency: Dict[str, LatencyWindow] = {}
+        # Latency of the answer actually returned to the caller
+        self.effective_latency: Dict[str, LatencyWindow] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _window(self, table: dict, tool: str) -> LatencyWindow:
+        if tool not in table:
+            table[tool] = LatencyWindow()
+        return table[tool]
+
+    def _stats(self, tool: str) -> dict:
+        if tool not in self.stats:
+            self.stats[tool] = {'calls': 0, 'hedges_sent': 0, 'hedge_wins': 0,
+                                'budget_denied': 0}
+        return self.stats[tool]
+
+    def hedge_delay(self, tool: str, timeout: float) -> float:
+        """Adaptive hedge delay: the observed p95 of primary attempts"""
+        with self.lock:
+            window = self.primary_latency.get(tool)
+            if window is None or len(window) < self.min_samples:
+                delay = self.default_delay_s
+            else:
+                delay = window.percentiles()['p95_ms'] / 1000.0
+        return min(max(delay, self.min_delay_s), timeout)
+
+    def _take_budget(self) -> bool:
+        with self.lock:
+            if self.budget >= 1.0:
+                self.budget -= 1.0
+                return True
+            return False
+
+    def _timed(self, fn: Callable):
+        started = time.monotonic()
+        result = fn()
+        return result, (time.monotonic() - started) * 1000
+
+    def call(self, tool: str, fn: Callable, timeout: float = 10.0):
+        """Run fn(), hedging with a second fn() if the first is slow"""
+        started = time.monotonic()
+        with self.lock:
+            self._stats(tool)['calls'] += 1
+            self.budget = min(self.max_budget, self.budget + self.budget_ratio)
+
+        primary = self.executor.submit(self._timed, fn)
+        primary.add_done_callback(
+            lambda f: self._record_primary(tool, f))
+
+        done, _ = wait([primary], timeout=self.hedge_delay(tool, timeout))
+        if done:
+            result, _ = primary.result()
+            self._record_effective(tool, started)
+            return result
+
+        if not self._take_budget():
+            with self.lock:
+                self._stats(tool)['budget_denied'] += 1
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            done, _ = wait([primary], timeout=remaining)
+            if not done:
+                raise HedgeTimeout(tool, time.monotonic() - started, 1)
+            result, _ = primary.result()
+            self._record_effective(tool, started)
+            return result
+
+        with self.lock:
+            self._stats(tool)['hedges_sent'] += 1
+        hedge = self.executor.submit(self._timed, fn)
+
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        pending = {primary, hedge}
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, timeout=remaining,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+
+        # Abandon the loser; a hedge that never started is cancelled
+        hedge.cancel()
+
+        if winner is None:
+            if pending:
+                raise HedgeTimeout(tool, time.monotonic() - started, len(pending))
+            # Both attempts failed; surface the primary's error
+            result, _ = primary.result()
+            return result
+
+        if winner is hedge:
+            with self.lock:
+                self._stats(tool)['hedge_wins'] += 1
+        result, _ = winner.result()
+        self._record_effective(tool, started)
+        return result
+
+    def _record_primary(self, tool: str, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, latency_ms = future.result()
+        with self.lock:
+            self._window(self.primary_latency, tool).add(latency_ms)
+
+    def _record_effective(self, tool: str, started: float):
+        with self.lock:
+            self._window(self.effective_latency, tool).add(
+                (time.monotonic() - started) * 1000)
+
+    def report(self) -> dict:
+        """Per-tool tail latency without hedging (primary) and with it (effective)"""
+        with self.lock:
+            report = {}
+            for tool, stats in self.stats.items():
+                report[tool] = dict(stats)
+                report[tool]['extra_load'] = round(
+                    stats['hedges_sent'] / stats['calls'], 3) if stats['calls'] else 0.0
+                report[tool]['unhedged'] = self._window(
+                    self.primary_latency, tool).percentiles()
+                report[tool]['hedged'] = self._window(
+                    self.effective_latency, tool).percentiles()
+            return report
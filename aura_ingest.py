@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+AURA Alarm Ingestion Pipeline
+Feeds network alarms to the agent without anyone typing at a prompt.
+
+    source -> parse -> detect -> dedupe -> rate_limit -> correlate -> [admission] -> AgentWorkerPool
+
+Every stage is a generator, so the pipeline only pulls as fast as the
+slowest stage allows. The worker pool has a bounded queue: when all
+agents are busy and the queue is full, submit() blocks, which stalls the
+generators and ultimately the source. Nothing grows without bound.
+
+Sources yield None as a heartbeat when idle so the correlator can still
+close quiet windows. Each alarm is stamped with the time it entered the
+pipeline, and LagMetrics reports how far behind the network AURA is at
+each hop: ingest, dispatch to an agent, and completion.
+
+Records carrying a 'kpis' dict are KPI samples, not alarms. The
+FleetAnomalyDetector scores each one against its element's baseline;
+healthy samples only update the baseline and never reach the LLM, and
+anomalous ones become KPI_ANOMALY alarms for the correlator. Ordinary
+alarms pass straight through.
+
+With --admission, every incident passes an AdmissionController sized
+from the live Bedrock quotas before it reaches an agent. It is admitted,
+queued in arrival order (at most --max-pending), or shed when the queue
+is full or the expected wait exceeds --max-wait. Queued incidents wait
+on the controller's own thread, so intake, correlation windows and
+heartbeats keep flowing while the quota catches up. The agents' model
+calls also draw from a shared per-call budget, so a burst of incidents
+waits in line rather than piling up throttling retries.
+
+Usage:
+    python3 aura_ingest.py --file alarms.jsonl --follow
+    python3 aura_ingest.py --socket 9099 --workers 2
+    python3 aura_ingest.py --file alarms.jsonl --dry-run
+    python3 aura_ingest.py --file alarms.jsonl --admission --max-wait 60
+"""
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Iterable, Iterator, Optional
+
+from aura_anomaly import FleetAnomalyDetector
+from aura_circuit_breaker import percentile
+from aura_correlation import AlarmCorrelator
+from aura_quota import (AdmissionController, QuotaBudget, QuotaRefresher,
+                        install_call_budget, make_quota_source)
+from aura_topology import TopologyIndex, load_topology
+
+HEARTBEAT = None
+
+
+# --- Sources ---
+
+def tail_jsonl(path: str, follow: bool = True, poll_s: float = 0.5) -> Iterator[Optional[str]]:
+    """Lines of a JSONL file; with follow, keep tailing like `tail -f`"""
+    # Bytes, so a partial line is held until the writer finishes it and only
+    # complete lines are decoded (a character split across writes stays whole)
+    with open(path, 'rb') as f:
+        partial = b''
+        while True:
+            chunk = f.readline()
+            if chunk:
+                partial += chunk
+                if partial.endswith(b'\n'):
+                    line, partial = partial, b''
+                    yield line.decode('utf-8', errors='replace')
+                    continue
+            if not follow:
+                # A finished file's last line may lack its newline
+                if partial:
+                    yield partial.decode('utf-8', errors='replace')
+                return
+            time.sleep(poll_s)
+            yield HEARTBEAT
+
+
+def queue_source(q: "queue.Queue", poll_s: float = 0.5,
+                 stop: Optional[threading.Event] = None) -> Iterator:
+    """Items from a local queue (stand-in for SQS/Kafka); a None item ends the stream"""
+    while not (stop and stop.is_set()):
+        try:
+            item = q.get(timeout=poll_s)
+        except queue.Empty:
+            yield HEARTBEAT
+            continue
+        if item is None:
+            return
+        yield item
+
+
+def socket_source(port: int, host: str = '127.0.0.1', max_backlog: int = 10000,
+                  poll_s: float = 0.5) -> Iterator:
+    """
+    Newline-delimited JSON alarms from a local TCP socket.
+    Connection handlers block once max_backlog lines are waiting, so a
+    fast sender is slowed down instead of filling memory.
+    """
+    lines = queue.Queue(maxsize=max_backlog)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                lines.put(raw.decode('utf-8', errors='replace'))
+
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📡 Listening for alarms on {host}:{port}")
+    try:
+        yield from queue_source(lines, poll_s=poll_s)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- Stages ---
+
+def parse(items: Iterable) -> Iterator[Optional[dict]]:
+    """JSON lines or dicts -> alarm dicts stamped with their ingest time"""
+    for item in items:
+        if item is HEARTBEAT:
+            yield HEARTBEAT
+            continue
+        if isinstance(item, str):
+            item = item.strip()
+            if not item:
+                continue
+            try:
+                item = json.loads(item)
+            except json.JSONDecodeError:
+                print(f"⚠️  Skipping malformed alarm: {item[:80]}")
+                continue
+        if not isinstance(item, dict) or 'element_id' not in item:
+            continue
+        now = time.time()
+        item.setdefault('timestamp', now)
+        item['_ingested_at'] = now
+        yield item
+
+
+def detect(alarms: Iterable, detector: FleetAnomalyDetector, threshold: float = 1.0,
+           stats: Optional[dict] = None) -> Iterator[Optional[dict]]:
+    """KPI samples -> an alarm per anomalous sample; other alarms pass through"""
+    for alarm in alarms:
+        if alarm is HEARTBEAT or not isinstance(alarm.get('kpis'), dict):
+            yield alarm
+            continue
+        if stats is not None:
+            stats['kpi_samples'] = stats.get('kpi_samples', 0) + 1
+        found = detector.anomalies(detector.observe_normalized(alarm), threshold, limit=1)
+        if not found:
+            continue
+        anomaly = found[0]
+        if stats is not None:
+            stats['kpi_anomalies'] = stats.get('kpi_anomalies', 0) + 1
+        yield {
+            'element_id': alarm['element_id'],
+            'type': f"KPI_ANOMALY:{anomaly['metric']}",
+            'timestamp': alarm['timestamp'],
+            '_ingested_at': alarm['_ingested_at'],
+            'description': (f"{anomaly['metric']}={anomaly['value']:g} {anomaly['unit']} "
+                            f"(baseline {anomaly['baseline']:g}, score {anomaly['score']})"),
+            'anomaly': anomaly,
+        }
+
+
+def dedupe(alarms: Iterable, ttl_s: float = 300.0, max_keys: int = 100000,
+           stats: Optional[dict] = None) -> Iterator[Optional[dict]]:
+    """Drop repeats of the same alarm (alarm_id, or element + type) within ttl_s"""
+    seen: "OrderedDict[tuple, float]" = OrderedDict()
+    for alarm in alarms:
+        if alarm is HEARTBEAT:
+            yield HEARTBEAT
+            continue
+        now = alarm['_ingested_at']
+        while seen and (next(iter(seen.values())) < now - ttl_s or len(seen) > max_keys):
+            seen.popitem(last=False)
+        key = (alarm.get('alarm_id'),) if 'alarm_id' in alarm else (
+            alarm['element_id'], alarm.get('type'))
+        if key in seen:
+            if stats is not None:
+                stats['duplicates'] = stats.get('duplicates', 0) + 1
+            continue
+        seen[key] = now
+        yield alarm
+
+
+def rate_limit(alarms: Iterable, rate_per_s: float, burst: int = 100,
+               stats: Optional[dict] = None) -> Iterator[Optional[dict]]:
+    """Token bucket; blocks (backpressure) rather than dropping when exhausted"""
+    tokens = float(burst)
+    last = time.monotonic()
+    for alarm in alarms:
+        if alarm is HEARTBEAT:
+            yield HEARTBEAT
+            continue
+        now = time.monotonic()
+        tokens = min(burst, tokens + (now - last) * rate_per_s)
+        last = now
+        if tokens < 1.0:
+            wait = (1.0 - tokens) / rate_per_s
+            if stats is not None:
+                stats['throttled_s'] = stats.get('throttled_s', 0.0) + wait
+            time.sleep(wait)
+            tokens = 1.0
+            last = time.monotonic()
+        tokens -= 1.0
+        yield alarm
+
+
+def correlate(alarms: Iterable, correlator: AlarmCorrelator) -> Iterator[dict]:
+    """Alarms in, correlated incidents out; heartbeats close quiet windows"""
+    for alarm in alarms:
+        if alarm is HEARTBEAT:
+            incidents = correlator.flush()
+        else:
+            incidents = correlator.ingest(alarm)
+        yield from incidents
+    yield from correlator.flush(force=True)
+
+
+# --- Lag metrics ---
+
+class LagMetrics:
+    """How far behind the network each hop of the pipeline is running"""
+
+    def __init__(self, window: int = 1000):
+        self.lock = threading.Lock()
+        self.ingest = deque(maxlen=window)
+        self.dispatch = deque(maxlen=window)
+        self.end_to_end = deque(maxlen=window)
+        self.newest_event_ts = 0.0
+        self.incidents_completed = 0
+        self.incidents_failed = 0
+
+    def record(self, incident: dict, dispatched_at: float, completed_at: float, ok: bool):
+        alarms = incident.get('alarms', [])
+        event_ts = min((a.get('timestamp', completed_at) for a in alarms), default=completed_at)
+        ingested_ts = min((a.get('_ingested_at', completed_at) for a in alarms), default=completed_at)
+        with self.lock:
+            self.ingest.append(ingested_ts - event_ts)
+            self.dispatch.append(dispatched_at - event_ts)
+            self.end_to_end.append(completed_at - event_ts)
+            self.newest_event_ts = max(self.newest_event_ts, incident.get('last_seen') or event_ts)
+            if ok:
+                self.incidents_completed += 1
+            else:
+                self.incidents_failed += 1
+
+    def snapshot(self) -> dict:
+        def summary(samples):
+            ordered = sorted(samples)
+            return {
+                'p50_s': round(percentile(ordered, 50), 3),
+                'p95_s': round(percentile(ordered, 95), 3),
+                'max_s': round(ordered[-1], 3) if ordered else 0.0
+            }
+        with self.lock:
+            return {
+                'incidents_completed': self.incidents_completed,
+                'incidents_failed': self.incidents_failed,
+                'current_lag_s': round(time.time() - self.newest_event_ts, 3) if self.newest_event_ts else None,
+                'ingest_lag': summary(self.ingest),
+                'dispatch_lag': summary(self.dispatch),
+                'end_to_end_lag': summary(self.end_to_end)
+            }
+
+
+# --- Agent worker pool ---
+
+class AgentWorkerPool:
+    """
+    Fixed set of worker threads, each owning one agent.
+    submit() blocks when max_pending incidents are already waiting.
+    """
+
+    def __init__(self, handler_factory: Callable[[], Callable[[dict], str]],
+                 workers: int = 2, max_pending: int = 8,
+                 metrics: Optional[LagMetrics] = None):
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.metrics = metrics or LagMetrics()
+        self.results = []
+        self.results_lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._worker, args=(handler_factory(),),
+                             name=f"aura-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, incident: dict):
+        self.pending.put(incident)
+
+    def _worker(self, handle: Callable[[dict], str]):
+        while True:
+            incident = self.pending.get()
+            if incident is None:
+                self.pending.task_done()
+                return
+            dispatched_at = time.time()
+            try:
+                response = handle(incident)
+                ok = True
+            except Exception as e:
+                response = f"Error: {e}"
+                ok = False
+            completed_at = time.time()
+            self.metrics.record(incident, dispatched_at, completed_at, ok)
+            with self.results_lock:
+                self.results.append({
+                    'incident_id': incident['incident_id'],
+                    'root_element': incident['root_element'],
+                    'alarm_count': incident['alarm_count'],
+                    'response': response
+                })
+            self.pending.task_done()
+
+    def close(self):
+        """Wait for queued incidents, then stop the workers"""
+        for _ in self.threads:
+            self.pending.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+def agent_handler_factory() -> Callable[[dict], str]:
+    """One AURAAgent per worker; conversation is reset for each incident"""
+    from aura_with_gateway import AURAAgent
+    agent = AURAAgent()
+
+    def handle(incident: dict) -> str:
+        agent.reset()
+        agent.incident_id = incident['incident_id']
+        return agent.process_message(incident['prompt'])
+    return handle
+
+
+def dry_run_handler_factory() -> Callable[[dict], str]:
+    def handle(incident: dict) -> str:
+        print(f"🚨 {incident['incident_id']}: {incident['prompt']}")
+        return "dry-run"
+    return handle
+
+
+def run_pipeline(source: Iterable, pool: AgentWorkerPool,
+                 topology: Optional[TopologyIndex] = None,
+                 rate_per_s: float = 1000.0,
+                 window_s: float = 10.0,
+                 stats: Optional[dict] = None,
+                 admission: Optional[AdmissionController] = None,
+                 detector: Optional[FleetAnomalyDetector] = None) -> dict:
+    """Drive source -> incidents -> pool until the source ends"""
+    stats = stats if stats is not None else {}
+    if admission:
+        def shed(incident: dict, reason: str):
+            print(f"🚫 Shed {incident['incident_id']} ({incident['root_element']}): "
+                  f"over the Bedrock quota, {reason}")
+        admission.start(pool.submit, shed)
+    correlator = AlarmCorrelator(topology or TopologyIndex({}), window_s=window_s)
+    detected = detect(parse(source), detector or FleetAnomalyDetector(), stats=stats)
+    stages = correlate(
+        rate_limit(dedupe(detected, stats=stats), rate_per_s, stats=stats),
+        correlator
+    )
+    for incident in stages:
+        if admission:
+            admission.submit(incident)
+        else:
+            pool.submit(incident)
+    if admission:
+        admission.close()
+    pool.close()
+    stats.update(correlator.stats)
+    if admission:
+        stats['admission'] = admission.stats()
+        stats['incidents_shed'] = stats['admission']['shed']
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AURA alarm ingestion pipeline")
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument('--file', help='JSONL file of alarms')
+    source_group.add_argument('--socket', type=int, help='Local TCP port for JSONL alarms')
+    parser.add_argument('--follow', action='store_true', help='Keep tailing --file')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-pending', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=1000.0, help='Max alarms/sec admitted')
+    parser.add_argument('--window', type=float, default=10.0, help='Correlation window (s)')
+    parser.add_argument('--dry-run', action='store_true', help='Print incidents instead of calling the agent')
+    parser.add_argument('--admission', action='store_true',
+                        help='Admit, queue or shed incidents against the live Bedrock quotas')
+    parser.add_argument('--max-wait', type=float, default=120.0,
+                        help='Shed incidents expected to wait longer than this (s)')
+    parser.add_argument('--utilization', type=float, default=0.9,
+                        help='Fraction of the quota incidents may be admitted against')
+    args = parser.parse_args()
+
+    admission = None
+    if args.admission:
+        refresher = QuotaRefresher(make_quota_source(),
+                                   interval_s=float(os.environ.get('AURA_QUOTA_REFRESH_S', '300'))).start()
+        admission = AdmissionController(refresher.manage(QuotaBudget(1, 1), args.utilization),
+                                        max_queue=args.max_pending, max_wait_s=args.max_wait)
+        if not args.dry_run:
+            import aura_with_gateway
+            install_call_budget(aura_with_gateway, refresher.manage(QuotaBudget(1, 1)))
+        print(f"🎫 Admission control: {refresher.quotas['rpm']:g} RPM / "
+              f"{refresher.quotas['tpm']:g} TPM at {args.utilization:.0%}")
+
+    if args.file:
+        source = tail_jsonl(args.file, follow=args.follow)
+    else:
+        source = socket_source(args.socket)
+
+    metrics = LagMetrics()
+    pool = AgentWorkerPool(dry_run_handler_factory if args.dry_run else agent_handler_factory,
+                           workers=args.workers, max_pending=args.max_pending,
+                           metrics=metrics)
+
+    print("=" * 70)
+    print("AURA Alarm Ingestion Pipeline")
+    print("=" * 70)
+
+    try:
+        stats = run_pipeline(source, pool, topology=load_topology(),
+                             rate_per_s=args.rate, window_s=args.window,
+                             admission=admission)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+        stats = {}
+
+    print("\n" + "=" * 70)
+    print("Pipeline stats:", json.dumps(stats))
+    print("Lag:", json.dumps(metrics.snapshot(), indent=2))
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import boto3
 import json
 from typing import List, Dict, Callable, Any
 from dataclasses import dataclass
@@ -6,16 +5,19 @@ import re
 import time
 from botocore.exceptions import ClientError
 
+from aura_mock_bedrock import make_bedrock_runtime, pacing_delay
+
 # Initialize Bedrock client
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# (AURA_BEDROCK_MOCK selects the offline mock runtime)
+bedrock_runtime = make_bedrock_runtime(region_name='us-east-1')
 
 # Model configuration
 CLAUDE_MODEL = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
 
 # Rate limiting configuration
-RETRY_DELAY = 3
+RETRY_DELAY = pacing_delay(3, bedrock_runtime)
 MAX_RETRIES = 5
-INTER_CALL_DELAY = 3
+INTER_CALL_DELAY = pacing_delay(3, bedrock_runtime)
 
 # --- Tool Definitions ---
 
@@ -294,7 +296,7 @@ def interactive_mode():
             
             # Automatic delay to avoid rate limiting
             print("⏳ Waiting 5 seconds to avoid rate limits...")
-            time.sleep(5)
+            time.sleep(pacing_delay(5, bedrock_runtime))
             
         except KeyboardInterrupt:
             print("\n\n⚠️  Interrupted by user")
@@ -0,0 +1,262 @@
+"""
+AURA Normalized KPI Schema
+Maps vendor-specific adapter payloads onto one canonical KPI schema.
+
+Nokia, Ericsson and Cisco each name and scale their KPIs differently
+(radio_signal_dbm vs rsrp_dbm, rtt_ms vs latency_ms, bandwidth_gbps vs
+available_bandwidth_mbps, ...). Everything above the gateway should only
+ever see the canonical names and units defined here.
+
+Batches are held in a KpiBatch: one array.array('d') per metric, with
+NaN for metrics a vendor does not report. That is 8 bytes per value
+instead of a dict per sample, and every column can be handed straight
+to NumPy (np.frombuffer) for fleet-wide analytics.
+
+Only the standard library is used so the module can ship inside the
+router Lambda zip.
+"""
+
+import math
+from array import array
+
+# Canonical metric name -> unit
+SCHEMA = {
+    'rsrp_dbm': 'dBm',
+    'sinr_db': 'dB',
+    'packet_loss_percent': '%',
+    'dl_throughput_mbps': 'Mbit/s',
+    'ul_throughput_mbps': 'Mbit/s',
+    'active_users': 'count',
+    'cpu_percent': '%',
+    'memory_percent': '%',
+    'uptime_hours': 'h',
+    'latency_ms': 'ms',
+    'jitter_ms': 'ms',
+    'bandwidth_mbps': 'Mbit/s',
+}
+
+METRICS = tuple(SCHEMA)
+
+# Vendor field -> (canonical metric, scale factor)
+VENDOR_FIELD_MAP = {
+    'Nokia': {
+        'radio_signal_dbm': ('rsrp_dbm', 1),
+        'packet_loss_percent': ('packet_loss_percent', 1),
+        'throughput_mbps': ('dl_throughput_mbps', 1),
+        'connected_users': ('active_users', 1),
+        'latency_ms': ('latency_ms', 1),
+        'jitter_ms': ('jitter_ms', 1),
+    },
+    'Ericsson': {
+        'rsrp_dbm': ('rsrp_dbm', 1),
+        'sinr_db': ('sinr_db', 1),
+        'packet_loss_percent': ('packet_loss_percent', 1),
+        'dl_throughput_mbps': ('dl_throughput_mbps', 1),
+        'ul_throughput_mbps': ('ul_throughput_mbps', 1),
+        'active_ues': ('active_users', 1),
+        'rtt_ms': ('latency_ms', 1),
+        'bandwidth_gbps': ('bandwidth_mbps', 1000),
+    },
+    'Cisco': {
+        'cpu_percent': ('cpu_percent', 1),
+        'memory_percent': ('memory_percent', 1),
+        'uptime_hours': ('uptime_hours', 1),
+        'latency_ms': ('latency_ms', 1),
+        'loss_percent': ('packet_loss_percent', 1),
+        'jitter_ms': ('jitter_ms', 1),
+        'available_bandwidth_mbps': ('bandwidth_mbps', 1),
+    },
+}
+
+# Fields that identify the element a record describes, in priority order
+ID_FIELDS = ('cell_id', 'device_id', 'link_id', 'path_id', 'site_id')
+
+VENDORS = ('Nokia', 'Ericsson', 'Cisco')
+
+# Canonical health, stored as a small integer code in batches
+HEALTH_STATES = ('OK', 'DEGRADED', 'DOWN', 'UNKNOWN')
+VENDOR_STATUS_MAP = {
+    'HEALTHY': 'OK',
+    'REACHABLE': 'OK',
+    'UP': 'OK',
+    'SUCCESS': 'OK',
+    'DEGRADED': 'DEGRADED',
+    'DOWN': 'DOWN',
+    'UNREACHABLE': 'DOWN',
+}
+
+NAN = float('nan')
+
+
+def canonical_health(status) -> str:
+    """Map a vendor status string onto OK / DEGRADED / DOWN / UNKNOWN"""
+    return VENDOR_STATUS_MAP.get(str(status).upper(), 'UNKNOWN')
+
+
+def element_id_of(record: dict):
+    """The element identifier of a vendor record, whatever it is called"""
+    for field in ID_FIELDS:
+        if field in record:
+            return record[field]
+    return None
+
+
+def normalize_record(vendor: str, record: dict) -> dict:
+    """Normalize one vendor adapter record into the canonical schema"""
+    field_map = VENDOR_FIELD_MAP.get(vendor, {})
+    kpis = {}
+    for field, value in record.items():
+        mapping = field_map.get(field)
+        if mapping and isinstance(value, (int, float)):
+            metric, scale = mapping
+            kpis[metric] = value * scale
+    return {
+        'element_id': element_id_of(record),
+        'vendor': vendor,
+        'health': canonical_health(record.get('status')),
+        'timestamp': record.get('timestamp'),
+        'kpis': kpis,
+        'units': {metric: SCHEMA[metric] for metric in kpis}
+    }
+
+
+class KpiBatch:
+    """
+    Column-oriented batch of canonical KPI samples.
+    Row i is element_ids[i] with columns[metric][i] for every metric.
+    """
+
+    __slots__ = ('element_ids', 'vendor_codes', 'health_codes',
+                 'timestamps', 'columns')
+
+    def __init__(self):
+        self.element_ids = []
+        self.vendor_codes = array('b')
+        self.health_codes = array('b')
+        self.timestamps = array('d')
+        self.columns = {metric: array('d') for metric in METRICS}
+
+    def __len__(self):
+        return len(self.element_ids)
+
+    def append(self, vendor: str, normalized: dict):
+        """Append one record produced by normalize_record"""
+        self.element_ids.append(normalized['element_id'])
+        self.vendor_codes.append(VENDORS.index(vendor))
+        self.health_codes.append(HEALTH_STATES.index(normalized['health']))
+        self.timestamps.append(normalized.get('timestamp') or NAN)
+        kpis = normalized['kpis']
+        for metric, column in self.columns.items():
+            column.append(kpis.get(metric, NAN))
+
+    def extend(self, other: 'KpiBatch'):
+        """Concatenate another batch onto this one"""
+        self.element_ids.extend(other.element_ids)
+        self.vendor_codes.extend(other.vendor_codes)
+        self.health_codes.extend(other.health_codes)
+        self.timestamps.extend(other.timestamps)
+        for metric, column in self.columns.items():
+            column.extend(other.columns[metric])
+
+    def column(self, metric: str) -> array:
+        """One metric for every row; NaN where the vendor has no such KPI"""
+        return self.columns[metric]
+
+    def vendor(self, i: int) -> str:
+        return VENDORS[self.vendor_codes[i]]
+
+    def health(self, i: int) -> str:
+        return HEALTH_STATES[self.health_codes[i]]
+
+    def row(self, i: int) -> dict:
+        """Row i as a canonical record (NaN metrics omitted)"""
+        kpis = {}
+        for metric, column in self.columns.items():
+            if not math.isnan(column[i]):
+                kpis[metric] = column[i]
+        timestamp = self.timestamps[i]
+        return {
+            'element_id': self.element_ids[i],
+            'vendor': self.vendor(i),
+            'health': self.health(i),
+            'timestamp': None if math.isnan(timestamp) else int(timestamp),
+            'kpis': kpis
+        }
+
+    def nbytes(self) -> int:
+        """Bytes held in the numeric arrays"""
+        total = (self.vendor_codes.itemsize * len(self.vendor_codes) +
+                 self.health_codes.itemsize * len(self.health_codes) +
+                 self.timestamps.itemsize * len(self.timestamps))
+        for column in self.columns.values():
+            total += column.itemsize * len(column)
+        return total
+
+    def to_dict(self) -> dict:
+        """
+        JSON-friendly columnar form. Metrics that are NaN in every row are
+        dropped and remaining NaNs become null.
+        """
+        columns = {}
+        for metric, column in self.columns.items():
+            values = [None if math.isnan(v) else v for v in column]
+            if any(v is not None for v in values):
+                columns[metric] = values
+        return {
+            'count': len(self),
+            'element_id': list(self.element_ids),
+            'vendor': [VENDORS[c] for c in self.vendor_codes],
+            'health': [HEALTH_STATES[c] for c in self.health_codes],
+            'timestamp': [None if math.isnan(t) else int(t) for t in self.timestamps],
+            'columns': columns,
+            'units': {metric: SCHEMA[metric] for metric in columns}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'KpiBatch':
+        """Rebuild a batch from to_dict() output"""
+        batch = cls()
+        count = data.get('count', len(data.get('element_id', [])))
+        batch.element_ids = list(data.get('element_id', []))
+        batch.vendor_codes = array('b', (VENDORS.index(v) for v in data.get('vendor', [])))
+        batch.health_codes = array('b', (HEALTH_STATES.index(h) for h in data.get('health', [])))
+        batch.timestamps = array('d', (NAN if t is None else t
+                                       for t in data.get('timestamp', [])))
+        for metric in METRICS:
+            values = data.get('columns', {}).get(metric)
+            if values is None:
+                batch.columns[metric] = array('d', [NAN]) * count
+            else:
+                batch.columns[metric] = array('d', (NAN if v is None else v for v in values))
+        return batch
+
+
+def normalize_vendor_batch(vendor: str, batch: dict) -> KpiBatch:
+    """
+    Normalize a column-oriented adapter batch (bulk get_kpis) without
+    materializing per-row dicts: each vendor column is scaled and copied
+    into its canonical column in one pass.
+    """
+    vendor_columns = batch.get('columns', {})
+    count = batch.get('count', 0)
+    field_map = VENDOR_FIELD_MAP.get(vendor, {})
+
+    normalized = KpiBatch()
+    for field in ID_FIELDS:
+        if field in vendor_columns:
+            normalized.element_ids = list(vendor_columns[field])
+            break
+    normalized.vendor_codes = array('b', [VENDORS.index(vendor)]) * count
+    normalized.health_codes = array('b', (HEALTH_STATES.index(canonical_health(s))
+                                          for s in vendor_columns.get('status', ['UNKNOWN'] * count)))
+    normalized.timestamps = array('d', [batch.get('timestamp') or NAN]) * count
+
+    for metric in METRICS:
+        normalized.columns[metric] = array('d', [NAN]) * count
+    for field, values in vendor_columns.items():
+        mapping = field_map.get(field)
+        if mapping:
+            metric, scale = mapping
+            normalized.columns[metric] = array(
+                'd', values if scale == 1 else (v * scale for v in values))
+    return normalized
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+AURA Structured Logging
+Compact JSON log records for the Lambda handlers and the agent.
+
+Every record is one line of JSON:
+
+    {"ts":1718000000.123,"level":"INFO","svc":"router","event":"route",
+     "cid":"conv-3f2a9c1b7e4d","vendor":"Nokia","tool":"get_kpis"}
+
+`cid` is the correlation ID of the request being handled. It comes from
+the caller (an X-Correlation-Id header or a `correlation_id` field),
+falls back to the Lambda request ID, and is passed on to the adapters,
+so one incident can be followed from the agent through the router to
+the vendor adapter.
+
+Configuration is read once at cold start:
+
+    AURA_LOG_LEVEL     DEBUG | INFO | WARNING | ERROR | OFF
+                       (default INFO; the agent WARNING)
+    AURA_LOG_SAMPLE    per-level keep rates, e.g. "debug=0.01,info=0.1"
+                       (default: keep everything at or above the level)
+    AURA_LOG_SLOW_MS   a request at least this slow is always kept
+                       (default 1000; the agent 60000)
+    AURA_LOG_FILE      append records to this file instead of stdout
+                       (the agent writes to stderr, away from the conversation)
+
+Sampling is decided once per request, so a sampled request keeps all
+its records of that level. Records that are sampled out are held in a
+small buffer rather than dropped. If the request then logs a warning or
+error, fails or runs slow, the buffer is written out with it. Errors, warnings
+and slow requests are therefore always complete, while healthy fast
+requests cost only the records they were sampled for.
+
+Payloads (full events, adapter requests and responses) are DEBUG
+records. At any higher level payload() returns before serializing
+anything, so leaving it on the hot path costs one comparison.
+"""
+
+import contextvars
+import json
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Optional
+
+DEBUG, INFO, WARNING, ERROR, OFF = 10, 20, 30, 40, 100
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR, 'OFF': OFF}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+# Sampled-out records kept per request for an error or slow request to flush
+BUFFER_LIMIT = 100
+
+CORRELATION_HEADERS = ('X-Correlation-Id', 'X-Request-Id')
+
+# The request scope active on this thread / task
+_SCOPE = contextvars.ContextVar('aura_log_scope', default=None)
+
+_WRITE_LOCK = threading.Lock()
+
+
+def parse_level(setting) -> int:
+    if isinstance(setting, int):
+        return setting
+    return LEVELS[str(setting).upper()]
+
+
+def parse_sample_rates(setting: str) -> dict:
+    """"debug=0.01,info=0.1" -> {DEBUG: 0.01, INFO: 0.1}; WARNING and up are never sampled"""
+    rates = {}
+    for part in (setting or '').split(','):
+        if not part.strip():
+            continue
+        name, _, rate = part.partition('=')
+        level = parse_level(name.strip())
+        if level < WARNING:
+            rates[level] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def new_correlation_id() -> str:
+    # os.urandom rather than uuid, which costs milliseconds to import at cold start
+    return os.urandom(8).hex()
+
+
+def correlation_id_from(event: dict = None, context=None) -> str:
+    """The caller's correlation ID, else the Lambda request ID, else a new one"""
+    event = event or {}
+    if event.get('correlation_id'):
+        return str(event['correlation_id'])
+    headers = event.get('headers') or {}
+    for name in CORRELATION_HEADERS:
+        value = headers.get(name) or headers.get(name.lower())
+        if value:
+            return str(value)
+    if isinstance(event.get('body'), dict) and event['body'].get('correlation_id'):
+        return str(event['body']['correlation_id'])
+    request_id = getattr(context, 'aws_request_id', None)
+    return request_id or new_correlation_id()
+
+
+def current_correlation_id() -> Optional[str]:
+    """Correlation ID of the request being handled, to pass downstream"""
+    scope = _SCOPE.get()
+    return scope.correlation_id if scope else None
+
+
+def annotate(**fields):
+    """Add fields to the closing record of the current request"""
+    scope = _SCOPE.get()
+    if scope is not None:
+        scope.set(**fields)
+
+
+class RequestScope:
+    """Correlation ID, sampling decision and held-back records of one request"""
+
+    def __init__(self, logger: 'StructuredLogger', correlation_id: str, fields: dict):
+        self.logger = logger
+        self.correlation_id = correlation_id
+        self.fields = fields
+        self.started = time.monotonic()
+        self.draw = random.random()
+        self.buffer = []
+        self.dropped = 0
+        self.failed = False
+        self.lock = threading.Lock()
+
+    def sampled(self, level: int) -> bool:
+        return level >= WARNING or self.draw < self.logger.sample_rates.get(level, 1.0)
+
+    def set(self, **fields):
+        """Fields for the request's closing record (e.g. status)"""
+        self.fields.update(fields)
+        if isinstance(fields.get('status'), int) and fields['status'] >= 500:
+            self.failed = True
+
+    def hold(self, record: dict):
+        with self.lock:
+            if len(self.buffer) >= BUFFER_LIMIT:
+                self.buffer.pop(0)
+                self.dropped += 1
+            self.buffer.append(record)
+
+    def release(self) -> list:
+        with self.lock:
+            held, self.buffer = self.buffer, []
+            return held
+
+
+class StructuredLogger:
+    """Leveled, sampled JSON records for one service"""
+
+    def __init__(self, service: str, level=INFO, sample_rates: dict = None,
+                 slow_ms: float = 1000.0, stream=None):
+        self.service = service
+        self.level = parse_level(level)
+        self.sample_rates = sample_rates or {}
+        self.slow_ms = slow_ms
+        # None: whatever sys.stdout is at write time (Lambda's log stream)
+        self.stream = stream
+
+    def set_level(self, level):
+        self.level = parse_level(level)
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def _write(self, records: list):
+        lines = ''.join(json.dumps(r, separators=(',', ':'), default=str) + '\n' for r in records)
+        stream = self.stream or sys.stdout
+        with _WRITE_LOCK:
+            stream.write(lines)
+            stream.flush()
+
+    def _record(self, level: int, event: str, scope: Optional[RequestScope], fields: dict) -> dict:
+        record = {'ts': round(time.time(), 3), 'level': LEVEL_NAMES[level],
+                  'svc': self.service, 'event': event}
+        if scope is not None:
+            record['cid'] = scope.correlation_id
+        record.update(fields)
+        return record
+
+    def log(self, level: int, event: str, **fields):
+        if level < self.level:
+            return
+        scope = _SCOPE.get()
+        if scope is None:
+            if level >= WARNING or random.random() < self.sample_rates.get(level, 1.0):
+                self._write([self._record(level, event, None, fields)])
+            return
+        record = self._record(level, event, scope, fields)
+        if level >= WARNING:
+            # A problem explains the request; its held-back context goes with it
+            scope.failed = scope.failed or level >= ERROR
+            self._write(scope.release() + [record])
+        elif scope.sampled(level):
+            self._write([record])
+        else:
+            scope.hold(record)
+
+    def debug(self, event: str, **fields):
+        self.log(DEBUG, event, **fields)
+
+    def info(self, event: str, **fields):
+        self.log(INFO, event, **fields)
+
+    def warning(self, event: str, **fields):
+        self.log(WARNING, event, **fields)
+
+    def error(self, event: str, **fields):
+        self.log(ERROR, event, **fields)
+
+    def exception(self, event: str, **fields):
+        """ERROR record with the exception being handled and its traceback"""
+        error_type, error, _ = sys.exc_info()
+        if error_type is not None:
+            fields.setdefault('error', f"{error_type.__name__}: {error}")
+            fields.setdefault('traceback', traceback.format_exc())
+        self.log(ERROR, event, **fields)
+
+    def payload(self, event: str, payload, **fields):
+        """A full payload at DEBUG; nothing is serialized unless DEBUG is on"""
+        if DEBUG < self.level:
+            return
+        self.log(DEBUG, event, payload=payload, **fields)
+
+    @contextmanager
+    def request(self, correlation_id: str = None, **fields):
+        """
+        Scope one request: every record inside carries its correlation ID,
+        and a closing `request` record gives its duration and outcome.
+        """
+        scope = RequestScope(self, correlation_id or new_correlation_id(), fields)
+        token = _SCOPE.set(scope)
+        error = None
+        try:
+            yield scope
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _SCOPE.reset(token)
+            self._close(scope, error)
+
+    def _close(self, scope: RequestScope, error: Optional[Exception]):
+        if self.level >= OFF:
+            return
+        duration_ms = (time.monotonic() - scope.started) * 1000
+        slow = duration_ms >= self.slow_ms
+        fields = dict(scope.fields, duration_ms=round(duration_ms, 1))
+        if error is not None:
+            level = ERROR
+            fields['error'] = f"{type(error).__name__}: {error}"
+        elif slow or scope.failed:
+            level = WARNING
+        else:
+            level = INFO
+        if slow:
+            fields['slow'] = True
+        if scope.dropped:
+            fields['records_dropped'] = scope.dropped
+        held = scope.release() if level >= WARNING else []
+        if level < self.level or not (level >= WARNING or scope.sampled(level)):
+            return
+        self._write(held + [self._record(level, 'request', scope, fields)])
+
+
+_LOGGERS = {}
+
+
+def get_logger(service: str, default_level: str = 'INFO', default_slow_ms: float = 1000.0,
+               stream=None) -> StructuredLogger:
+    """The shared logger of a service, configured from AURA_LOG_* over the defaults"""
+    if service not in _LOGGERS:
+        if os.environ.get('AURA_LOG_FILE'):
+            stream = open(os.environ['AURA_LOG_FILE'], 'a', buffering=1)
+        _LOGGERS[service] = StructuredLogger(
+            service,
+            level=os.environ.get('AURA_LOG_LEVEL', default_level),
+            sample_rates=parse_sample_rates(os.environ.get('AURA_LOG_SAMPLE', '')),
+            slow_ms=float(os.environ.get('AURA_LOG_SLOW_MS', default_slow_ms)),
+            stream=stream
+        )
+    return _LOGGERS[service]
+
+
+def in_scope(function):
+    """Wrap a callable to run in the caller's request scope (for thread pools)"""
+    context = contextvars.copy_context()
+    # A Context can only be entered by one thread at a time; copy per call
+    return lambda *args, **kwargs: context.copy().run(function, *args, **kwargs)
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+AURA Agent Metrics
+Counters and latency histograms for the agent, exported as Prometheus
+text or as periodic JSON snapshots.
+
+Histograms use fixed buckets, so recording a value is a bisect and two
+additions under a lock. Nothing per call is kept, and memory does not
+grow with traffic. Quantiles in snapshots are estimated from the
+buckets, which is the same calculation Prometheus' histogram_quantile()
+does.
+
+What the agent records (see AgentMetrics):
+
+    aura_bedrock_call_seconds{outcome}          every invoke_model attempt
+    aura_bedrock_throttles_total                ThrottlingException answers
+    aura_bedrock_retries_total                  attempts following a failed one
+    aura_bedrock_tokens_total{direction}        input / output tokens
+    aura_tool_call_seconds{tool,vendor,outcome} every tool execution
+    aura_incident_iterations                    tool-calling rounds per message
+    aura_incident_seconds{outcome}              end-to-end time per message
+
+Export is chosen by the environment:
+
+    AURA_METRICS_PORT=9464           serve GET /metrics on localhost
+    AURA_METRICS_SNAPSHOT=m.json     rewrite this file every
+    AURA_METRICS_SNAPSHOT_S=15       ... seconds (and on exit)
+
+    curl -s localhost:9464/metrics | grep aura_tool_call
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from aura_mock_bedrock import _Body
+
+# Seconds; Bedrock calls take 0.5-20s, gateway tools 10ms-10s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+INCIDENT_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+ITERATION_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative on export, like Prometheus)"""
+
+    def __init__(self, buckets):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)   # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate by linear interpolation within the bucket holding rank q"""
+        with self.lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if seen + count >= rank and count:
+                if i == len(self.bounds):
+                    # +Inf bucket: the best bound is the largest finite one
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            count, total = self.count, self.sum
+        return {
+            'count': count,
+            'sum': round(total, 6),
+            'mean': round(total / count, 6) if count else None,
+            'p50': _round(self.quantile(0.50)),
+            'p95': _round(self.quantile(0.95)),
+            'p99': _round(self.quantile(0.99))
+        }
+
+
+def _round(value):
+    return round(value, 6) if value is not None else None
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+
+class Family:
+    """One metric name and its children, keyed by label values"""
+
+    def __init__(self, name: str, kind: str, help_text: str, labels: Tuple[str, ...],
+                 factory):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labels = labels
+        self.factory = factory
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def child(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labels)
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(key, self.factory())
+        return child
+
+    def items(self):
+        with self.lock:
+            return sorted(self.children.items())
+
+
+def _label_text(names, values, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """All metric families of the process"""
+
+    def __init__(self):
+        self.families = {}
+        self.lock = threading.Lock()
+
+    def _family(self, name, kind, help_text, labels, factory) -> Family:
+        with self.lock:
+            if name not in self.families:
+                self.families[name] = Family(name, kind, help_text, tuple(labels), factory)
+            return self.families[name]
+
+    def counter(self, name: str, help_text: str, labels=()) -> Family:
+        return self._family(name, 'counter', help_text, labels, Counter)
+
+    def histogram(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS) -> Family:
+        return self._family(name, 'histogram', help_text, labels, lambda: Histogram(buckets))
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format, version 0.0.4"""
+        lines = []
+        with self.lock:
+            families = list(self.families.values())
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in family.items():
+                if family.kind == 'counter':
+                    lines.append(f"{family.name}{_label_text(family.labels, values)} "
+                                 f"{_number(child.value)}")
+                    continue
+                with child.lock:
+                    counts, total, count = list(child.counts), child.sum, child.count
+                cumulative = 0
+                for bound, bucket_count in zip(child.bounds + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else _number(bound)
+                    le_label = f'le="{le}"'
+                    lines.append(f"{family.name}_bucket"
+                                 f"{_label_text(family.labels, values, le_label)} {cumulative}")
+                lines.append(f"{family.name}_sum{_label_text(family.labels, values)} {_number(total)}")
+                lines.append(f"{family.name}_count{_label_text(family.labels, values)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> dict:
+        """Every series as JSON: counter values, histogram count/sum/quantiles"""
+        result = {}
+        with self.lock:
+            families = list(self.families.values())
+        for family in families:
+            series = []
+            for values, child in family.items():
+                entry = {'labels': dict(zip(family.labels, values))}
+                if family.kind == 'counter':
+                    entry['value'] = child.value
+                else:
+                    entry.update(child.snapshot())
+                series.append(entry)
+            result[family.name] = series
+        return result
+
+
+def outcome_of(response: str) -> str:
+    """How the agent loop ended, from its final response"""
+    if response.startswith('Error') or response.startswith('AWS Error'):
+        return 'error'
+    if response.startswith('Maximum iterations'):
+        return 'max_iterations'
+    return 'completed'
+
+
+class AgentMetrics:
+    """The agent's metric families, with one method per thing it records"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.bedrock_seconds = registry.histogram(
+            'aura_bedrock_call_seconds', 'Bedrock invoke_model latency per attempt', ('outcome',))
+        self.throttles = registry.counter(
+            'aura_bedrock_throttles_total', 'Bedrock calls answered with ThrottlingException')
+        self.retries = registry.counter(
+            'aura_bedrock_retries_total', 'Bedrock attempts made after a failed attempt')
+        self.tokens = registry.counter(
+            'aura_bedrock_tokens_total', 'Tokens reported by Bedrock responses', ('direction',))
+        self.tool_seconds = registry.histogram(
+            'aura_tool_call_seconds', 'Agent tool execution latency', ('tool', 'vendor', 'outcome'))
+        self.incident_iterations = registry.histogram(
+            'aura_incident_iterations', 'Tool-calling iterations per processed message',
+            buckets=ITERATION_BUCKETS)
+        self.incident_seconds = registry.histogram(
+            'aura_incident_seconds', 'End-to-end time per processed message', ('outcome',),
+            buckets=INCIDENT_BUCKETS)
+        self.approvals = registry.counter(
+            'aura_approvals_requested_total', 'Responses asking for human approval')
+        self.remediations = registry.counter(
+            'aura_remediations_total', 'Successful remediation tool calls', ('tool',))
+        # Export unlabelled counters as 0 from the start, so rate() has a baseline
+        for family in (self.throttles, self.retries, self.approvals):
+            family.child()
+
+    def bedrock_call(self, seconds: float, outcome: str, retry: bool = False,
+                     input_tokens: int = 0, output_tokens: int = 0):
+        self.bedrock_seconds.child(outcome=outcome).observe(seconds)
+        if outcome == 'throttled':
+            self.throttles.child().inc()
+        if retry:
+            self.retries.child().inc()
+        if input_tokens:
+            self.tokens.child(direction='input').inc(input_tokens)
+        if output_tokens:
+            self.tokens.child(direction='output').inc(output_tokens)
+
+    def tool_call(self, tool: str, vendor: str, seconds: float, ok: bool):
+        self.tool_seconds.child(tool=tool, vendor=vendor or 'unknown',
+                                outcome='ok' if ok else 'error').observe(seconds)
+
+    def incident(self, iterations: int, seconds: float, outcome: str):
+        self.incident_iterations.child().observe(iterations)
+        self.incident_seconds.child(outcome=outcome).observe(seconds)
+
+    def summary(self) -> dict:
+        return self.registry.snapshot()
+
+
+class MetricsRuntime:
+    """
+    Wraps a bedrock-runtime client and records every invoke_model
+    attempt. An attempt made on a thread whose previous attempt failed
+    counts as a retry.
+    """
+
+    def __init__(self, client, metrics: AgentMetrics):
+        self.client = client
+        self.metrics = metrics
+        self.last_failed = threading.local()
+
+    def invoke_model(self, **kwargs) -> dict:
+        retry = getattr(self.last_failed, 'value', False)
+        started = time.perf_counter()
+        try:
+            response = self.client.invoke_model(**kwargs)
+        except ClientError as e:
+            throttled = e.response['Error']['Code'] == 'ThrottlingException'
+            self.metrics.bedrock_call(time.perf_counter() - started,
+                                      'throttled' if throttled else 'error', retry)
+            self.last_failed.value = True
+            raise
+        except Exception:
+            self.metrics.bedrock_call(time.perf_counter() - started, 'error', retry)
+            self.last_failed.value = True
+            raise
+        self.last_failed.value = False
+        # Token usage is in the body; read it and hand the agent a fresh stream
+        payload = response['body'].read()
+        response['body'] = _Body(payload)
+        usage = json.loads(payload).get('usage', {})
+        self.metrics.bedrock_call(time.perf_counter() - started, 'ok', retry,
+                                  usage.get('input_tokens', 0), usage.get('output_tokens', 0))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def install_agent_metrics(agent_module, metrics: AgentMetrics):
+    """Record the Bedrock calls of an agent module (aura_agent or compatible)"""
+    if not isinstance(agent_module.bedrock_runtime, MetricsRuntime):
+        agent_module.bedrock_runtime = MetricsRuntime(agent_module.bedrock_runtime, metrics)
+
+
+class MetricsServer:
+    """Local HTTP endpoint serving GET /metrics in Prometheus text format"""
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1'):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/metrics':
+                    body = registry.render_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(registry.snapshot()).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/metrics"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class SnapshotWriter:
+    """Rewrites a JSON snapshot of the registry every interval_s, and once at exit"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval_s: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval_s = interval_s
+        self.stopped = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+        atexit.register(self.write)
+
+    def write(self):
+        snapshot = {
+            'written_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'metrics': self.registry.snapshot()
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        # Readers never see a half-written file
+        os.replace(temp_path, self.path)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval_s):
+            self.write()
+
+    def stop(self):
+        self.stopped.set()
+        self.write()
+
+
+def start_exporters(registry: MetricsRegistry) -> list:
+    """The exporters selected by AURA_METRICS_PORT / AURA_METRICS_SNAPSHOT"""
+    exporters = []
+    if os.environ.get('AURA_METRICS_PORT'):
+        server = MetricsServer(registry, int(os.environ['AURA_METRICS_PORT']))
+        print(f"📊 Metrics at {server.url}")
+        exporters.append(server)
+    if os.environ.get('AURA_METRICS_SNAPSHOT'):
+        writer = SnapshotWriter(registry, os.environ['AURA_METRICS_SNAPSHOT'],
+                                float(os.environ.get('AURA_METRICS_SNAPSHOT_S', '15')))
+        print(f"📊 Metrics snapshots to {writer.path} every {writer.interval_s:g}s")
+        exporters.append(writer)
+    return exporters
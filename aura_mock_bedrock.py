@@ -0,0 +1,315 @@
+"""
+AURA Mock Bedrock Runtime
+Offline stand-in for boto3's bedrock-runtime client.
+
+Every agent script builds its client with make_bedrock_runtime(). With
+AURA_BEDROCK_MOCK unset that is the real client. Set it to "1" for the
+built-in scenario responder, or to a JSON config file:
+
+    {
+      "rules": [{"match": "power alarms", "reply": "TOOL_CALL: get_cell_kpis(LON-15)"}],
+      "recording": "bedrock_recording.jsonl",
+      "latency": {"median_ms": 900, "sigma": 0.35, "per_output_token_ms": 12},
+      "throttle": {"rate": 0.05, "first_n": 0, "rpm": 0},
+      "time_scale": 1.0,
+      "pacing_scale": 0.0,
+      "seed": 7
+    }
+
+Replies are chosen in order from:
+1. a recording, matched on the exact conversation;
+2. the first rule whose regex matches the last user message;
+3. a scripted responder that walks the usual investigate → diagnose →
+   approve → fail over sequence with TOOL_CALL turns.
+
+invoke_model() returns the same response shape as Bedrock, including
+token usage, after a simulated lognormal latency scaled by time_scale.
+It raises the same ClientError ThrottlingException at a random rate,
+for the first N calls, or above an RPM limit. pacing_delay() scales the
+agents' own rate-limit sleeps by pacing_scale, which is 0 by default, so
+the whole stack runs offline at full speed.
+
+AURA_BEDROCK_RECORD=path.jsonl wraps the real client and records every
+call for later replay. AURA_BEDROCK_ENDPOINTS replaces the single
+us-east-1 client with a multi-region pool (see aura_bedrock_pool.py).
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from typing import List, Optional
+
+from botocore.exceptions import ClientError
+
+SITE_PATTERN = re.compile(r'\b[A-Z]{3}-\d{2}\b')
+TOOL_RESULT_PATTERN = re.compile(r'Tool result from (\w+)\(([^)]*)\)')
+
+DEFAULT_LATENCY = {'median_ms': 900.0, 'sigma': 0.35, 'per_output_token_ms': 12.0}
+
+
+def conversation_key(body: dict) -> str:
+    """Stable hash of the messages sent to the model (system prompt excluded)"""
+    return hashlib.sha256(json.dumps(body.get('messages', []), sort_keys=True)
+                          .encode()).hexdigest()[:24]
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly four characters per token, as for English prose"""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def _text_of(content) -> str:
+    if isinstance(content, str):
+        return content
+    return ''.join(block.get('text', '') for block in content if isinstance(block, dict))
+
+
+def scripted_reply(messages: List[dict]) -> str:
+    """
+    A plausible next turn for the AURA tool loop: check each reported
+    site's KPIs and backhaul, diagnose, ask for approval, then fail over.
+    """
+    last = _text_of(messages[-1]['content'])
+    first = _text_of(messages[0]['content'])
+    history = ' '.join(_text_of(m['content']) for m in messages)
+    reported = list(dict.fromkeys(SITE_PATTERN.findall(first)))
+
+    checked_kpis = set(re.findall(r'Tool result from get_cell_kpis\(([^)]*)\)', history))
+    checked_links = {param.rsplit('-', 1)[0] for param in
+                     re.findall(r'Tool result from measure_link_latency\(([^)]*)\)', history)}
+
+    result = TOOL_RESULT_PATTERN.match(last)
+    if result:
+        tool, param = result.groups()
+        if tool == 'get_cell_kpis':
+            return (f"The RAN KPIs for {param} are in. Before concluding I need to rule out "
+                    f"the transport layer.\n\nTOOL_CALL: measure_link_latency({param}-FIBER)")
+        if tool == 'measure_link_latency':
+            for site in reported:
+                if site not in checked_kpis:
+                    return (f"Transport for {param} measured. Next site reported: {site}.\n\n"
+                            f"TOOL_CALL: get_cell_kpis({site})")
+            if '"DEGRADED"' in last or 'DEGRADED' in last:
+                site = param.rsplit('-', 1)[0]
+                return (f"ANALYSIS: The radio layer is healthy but {param} is DEGRADED with high "
+                        f"latency and packet loss. Root cause is the fiber backhaul at {site}.\n\n"
+                        f"PROPOSED PLAN: Fail over {site} to the NTN backup link. This is "
+                        f"service-impacting, so I need your approval before executing.")
+            return (f"ANALYSIS: KPIs and backhaul for {', '.join(sorted(checked_links)) or param} are "
+                    f"within normal ranges. No remediation is needed; I will keep monitoring.")
+        if tool == 'initiate_ntn_failover':
+            return (f"The failover for {param} completed. Traffic is now on the NTN backup link. "
+                    f"I recommend re-checking KPIs in 15 minutes to verify the improvement.")
+        return f"I have the result of {tool}({param}). Summarizing the findings above."
+
+    if re.search(r'\bapprov', last, re.IGNORECASE):
+        sites = reported or SITE_PATTERN.findall(history)
+        if sites:
+            return (f"Approval received. Executing the NTN failover for {sites[0]}.\n\n"
+                    f"TOOL_CALL: initiate_ntn_failover({sites[0]})")
+
+    sites = SITE_PATTERN.findall(last) or reported
+    if sites:
+        return (f"I'll start by checking the radio access network KPIs for {sites[0]}.\n\n"
+                f"TOOL_CALL: get_cell_kpis({sites[0]})")
+    return "Which site is affected? Please give me a site ID such as DUB-07."
+
+
+class _Body:
+    """Minimal stand-in for botocore's StreamingBody"""
+
+    def __init__(self, payload: bytes):
+        self._stream = io.BytesIO(payload)
+
+    def read(self, amt=None):
+        return self._stream.read() if amt is None else self._stream.read(amt)
+
+
+class MockBedrockRuntime:
+    """invoke_model() with scripted replies, simulated latency and throttling"""
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.rules = [(re.compile(rule['match'], re.IGNORECASE), rule['reply'])
+                      for rule in config.get('rules', [])]
+        self.recording = {}
+        if config.get('recording') and os.path.exists(config['recording']):
+            with open(config['recording'], 'r') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.recording[entry['key']] = entry
+        self.latency = dict(DEFAULT_LATENCY, **config.get('latency', {}))
+        throttle = config.get('throttle', {})
+        self.throttle_rate = throttle.get('rate', 0.0)
+        self.throttle_first_n = throttle.get('first_n', 0)
+        self.rpm_limit = throttle.get('rpm', 0)
+        self.time_scale = config.get('time_scale', 1.0)
+        self.pacing_scale = config.get('pacing_scale', 0.0)
+
+        self.random = random.Random(config.get('seed', 7))
+        self.lock = threading.Lock()
+        self.recent_calls = deque()
+        self.counters = {'calls': 0, 'throttled': 0, 'input_tokens': 0,
+                         'output_tokens': 0, 'simulated_latency_ms': 0.0,
+                         'replayed': 0, 'rule_matched': 0, 'scripted': 0}
+
+    def _throttle_check(self):
+        with self.lock:
+            self.counters['calls'] += 1
+            call_number = self.counters['calls']
+            now = time.monotonic()
+            while self.recent_calls and self.recent_calls[0] < now - 60:
+                self.recent_calls.popleft()
+            throttled = (call_number <= self.throttle_first_n or
+                         self.random.random() < self.throttle_rate or
+                         (self.rpm_limit and len(self.recent_calls) >= self.rpm_limit))
+            if throttled:
+                self.counters['throttled'] += 1
+            else:
+                self.recent_calls.append(now)
+        if throttled:
+            raise ClientError({
+                'Error': {'Code': 'ThrottlingException',
+                          'Message': 'Too many requests, please wait before trying again.'},
+                'ResponseMetadata': {'HTTPStatusCode': 429}
+            }, 'InvokeModel')
+
+    def _reply(self, body: dict):
+        """(text, recorded latency or None)"""
+        entry = self.recording.get(conversation_key(body))
+        if entry:
+            self.counters['replayed'] += 1
+            return entry['text'], entry.get('latency_ms')
+        last = _text_of(body['messages'][-1]['content'])
+        for pattern, reply in self.rules:
+            if pattern.search(last):
+                self.counters['rule_matched'] += 1
+                return reply, None
+        self.counters['scripted'] += 1
+        return scripted_reply(body['messages']), None
+
+    def _latency_ms(self, output_tokens: int) -> float:
+        with self.lock:
+            jitter = self.random.lognormvariate(0.0, self.latency['sigma'])
+        return self.latency['median_ms'] * jitter + output_tokens * self.latency['per_output_token_ms']
+
+    def invoke_model(self, modelId: str, body, **kwargs) -> dict:
+        request = json.loads(body)
+        self._throttle_check()
+
+        with self.lock:
+            text, recorded_ms = self._reply(request)
+        input_tokens = estimate_tokens(_text_of(request.get('system', '')) +
+                                       json.dumps(request.get('messages', [])))
+        output_tokens = estimate_tokens(text)
+        latency_ms = recorded_ms if recorded_ms is not None else self._latency_ms(output_tokens)
+
+        with self.lock:
+            self.counters['input_tokens'] += input_tokens
+            self.counters['output_tokens'] += output_tokens
+            self.counters['simulated_latency_ms'] += latency_ms
+        if self.time_scale:
+            time.sleep(latency_ms * self.time_scale / 1000)
+
+        payload = {
+            'id': f"msg_mock_{uuid.uuid4().hex[:20]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': modelId,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens}
+        }
+        return {
+            'body': _Body(json.dumps(payload).encode()),
+            'contentType': 'application/json',
+            'ResponseMetadata': {
+                'HTTPStatusCode': 200,
+                'HTTPHeaders': {
+                    'x-amzn-bedrock-invocation-latency': str(int(latency_ms)),
+                    'x-amzn-bedrock-input-token-count': str(input_tokens),
+                    'x-amzn-bedrock-output-token-count': str(output_tokens)
+                }
+            }
+        }
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters)
+
+
+class RecordingBedrockRuntime:
+    """Wraps a real client and appends every reply to a JSONL recording"""
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = path
+        self.lock = threading.Lock()
+
+    def invoke_model(self, modelId: str, body, **kwargs) -> dict:
+        started = time.monotonic()
+        response = self.client.invoke_model(modelId=modelId, body=body, **kwargs)
+        latency_ms = (time.monotonic() - started) * 1000
+        payload = response['body'].read()
+        parsed = json.loads(payload)
+        with self.lock, open(self.path, 'a') as f:
+            f.write(json.dumps({
+                'key': conversation_key(json.loads(body)),
+                'text': parsed['content'][0]['text'],
+                'usage': parsed.get('usage'),
+                'latency_ms': round(latency_ms, 1)
+            }) + '\n')
+        response['body'] = _Body(payload)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def load_mock_config(setting: str) -> dict:
+    """AURA_BEDROCK_MOCK value -> config dict ("1" means defaults)"""
+    if setting in ('1', 'true', 'yes'):
+        return {}
+    with open(setting, 'r') as f:
+        return json.load(f)
+
+
+def make_bedrock_runtime(region_name: str = 'us-east-1'):
+    """
+    The bedrock-runtime client selected by AURA_BEDROCK_MOCK,
+    AURA_BEDROCK_ENDPOINTS and AURA_BEDROCK_RECORD
+    """
+    setting = os.environ.get('AURA_BEDROCK_MOCK')
+    if setting and setting not in ('0', 'false', 'no'):
+        print("🧪 Using mock Bedrock runtime (offline)")
+        return MockBedrockRuntime(load_mock_config(setting))
+    if os.environ.get('AURA_BEDROCK_ENDPOINTS'):
+        from aura_bedrock_pool import load_endpoint_specs, make_pool
+        client = make_pool(load_endpoint_specs(os.environ['AURA_BEDROCK_ENDPOINTS']))
+        print(f"🌍 Bedrock client pool: {', '.join(e.name for e in client.endpoints)}")
+    else:
+        import boto3
+        client = boto3.client('bedrock-runtime', region_name=region_name)
+    if os.environ.get('AURA_BEDROCK_RECORD'):
+        return RecordingBedrockRuntime(client, os.environ['AURA_BEDROCK_RECORD'])
+    return client
+
+
+def pacing_delay(seconds: float, client) -> float:
+    """
+    A sleep that exists only to stay under real Bedrock rate limits,
+    scaled by the mock's pacing_scale (0 by default) when mocked.
+    Wrappers that delegate attribute lookups pass the scale through.
+    """
+    scale = getattr(client, 'pacing_scale', None)
+    return seconds if scale is None else seconds * scale
@@ -0,0 +1,381 @@
+"""
+AURA Long-Running Operations
+Operation records for gateway tools that outlive a request/response.
+
+A network change such as a failover can take longer than the agent's
+gateway timeout and the router Lambda's own timeout. Submitting one
+returns an operation ID at once. The change runs separately, and the
+caller either polls the ID or names a callback URL that receives the
+final record.
+
+    PENDING -> RUNNING -> SUCCEEDED | FAILED
+
+Records live in a MemoryOperationStore when the router runs in one
+long-lived process. Inside Lambda a submit and its poll can land on
+different containers, so the records go to DynamoDB
+(DynamoOperationStore) when AURA_OPERATIONS_TABLE is set.
+
+Only the standard library is needed, apart from botocore for the
+DynamoDB store; the module ships inside the router Lambda zip. AWS
+clients are created on first use by aws_client() and reused for the
+life of the container, so a cold start that never touches DynamoDB
+never pays for the client.
+"""
+
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+PENDING = 'PENDING'
+RUNNING = 'RUNNING'
+SUCCEEDED = 'SUCCEEDED'
+FAILED = 'FAILED'
+TERMINAL_STATES = (SUCCEEDED, FAILED)
+
+# Idempotency records
+IN_PROGRESS = 'IN_PROGRESS'
+COMPLETED = 'COMPLETED'
+
+_AWS_SESSION = None
+_AWS_CLIENTS = {}
+_AWS_CLIENT_LOCK = threading.Lock()
+
+
+def aws_client(service_name: str, config=None, name: str = None):
+    """
+    Process-wide botocore client for a service, created on first use.
+    botocore is used directly; importing boto3 also loads s3transfer,
+    which costs ~100ms of cold start and is never needed here. The
+    first caller's config is used for the life of the process; pass a
+    distinct `name` for a second client with a different config.
+    """
+    global _AWS_SESSION
+    key = name or service_name
+    client = _AWS_CLIENTS.get(key)
+    if client is None:
+        with _AWS_CLIENT_LOCK:
+            client = _AWS_CLIENTS.get(key)
+            if client is None:
+                import botocore.session
+                if _AWS_SESSION is None:
+                    _AWS_SESSION = botocore.session.get_session()
+                client = _AWS_SESSION.create_client(service_name, config=config)
+                _AWS_CLIENTS[key] = client
+    return client
+
+
+def new_operation(tool: str, target: str, vendor: str, payload: dict,
+                  callback_url: Optional[str] = None) -> dict:
+    """A fresh PENDING operation record"""
+    now = time.time()
+    return {
+        'operation_id': f"op-{uuid.uuid4().hex[:12]}",
+        'status': PENDING,
+        'tool': tool,
+        'target': target,
+        'vendor': vendor,
+        'payload': payload,
+        'callback_url': callback_url,
+        'submitted_at': now,
+        'updated_at': now
+    }
+
+
+class MemoryOperationStore:
+    """Thread-safe, TTL-bounded operation records for a single process"""
+
+    def __init__(self, ttl_s: float = 3600.0, max_operations: int = 10000):
+        self.ttl_s = ttl_s
+        self.max_operations = max_operations
+        self.lock = threading.Lock()
+        self.records: "OrderedDict[str, dict]" = OrderedDict()
+
+    def _expire(self, now: float):
+        while self.records:
+            oldest = next(iter(self.records.values()))
+            if len(self.records) <= self.max_operations and oldest['submitted_at'] >= now - self.ttl_s:
+                break
+            self.records.popitem(last=False)
+
+    def put(self, record: dict):
+        with self.lock:
+            self._expire(time.time())
+            self.records[record['operation_id']] = dict(record)
+
+    def put_if_absent(self, record: dict) -> bool:
+        """Insert unless a live record with the same ID exists"""
+        with self.lock:
+            self._expire(time.time())
+            if record['operation_id'] in self.records:
+                return False
+            self.records[record['operation_id']] = dict(record)
+            return True
+
+    def replace(self, record: dict, expected: dict) -> bool:
+        """Store record only if the live one still has the `expected` field values"""
+        with self.lock:
+            current = self.records.get(record['operation_id'])
+            if current is None or any(current.get(k) != v for k, v in expected.items()):
+                return False
+            self.records[record['operation_id']] = dict(record)
+            return True
+
+    def get(self, operation_id: str) -> Optional[dict]:
+        with self.lock:
+            record = self.records.get(operation_id)
+            if record and record['submitted_at'] < time.time() - self.ttl_s:
+                return None
+            return dict(record) if record else None
+
+    def delete(self, operation_id: str):
+        with self.lock:
+            self.records.pop(operation_id, None)
+
+    def update(self, operation_id: str, **fields) -> Optional[dict]:
+        with self.lock:
+            record = self.records.get(operation_id)
+            if record is None:
+                return None
+            record.update(fields, updated_at=time.time())
+            return dict(record)
+
+
+class DynamoOperationStore:
+    """Operation records in a DynamoDB table keyed by operation_id"""
+
+    def __init__(self, table_name: str, ttl_s: float = 3600.0, client=None):
+        self.table_name = table_name
+        self.ttl_s = ttl_s
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = aws_client('dynamodb')
+        return self._client
+
+    def _item(self, record: dict) -> dict:
+        return {
+            'operation_id': {'S': record['operation_id']},
+            'record': {'S': json.dumps(record)},
+            # Copied out of the record so writes can be conditional on them
+            'status': {'S': record['status']},
+            'updated_at': {'N': repr(record['updated_at'])},
+            # Read by the table's TTL setting
+            'expires_at': {'N': str(int(record['submitted_at'] + self.ttl_s))}
+        }
+
+    def put(self, record: dict):
+        self.client.put_item(TableName=self.table_name, Item=self._item(record))
+
+    def put_if_absent(self, record: dict) -> bool:
+        """Insert unless a live record with the same ID exists"""
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=self._item(record),
+                ConditionExpression='attribute_not_exists(operation_id) OR expires_at < :now',
+                ExpressionAttributeValues={':now': {'N': str(int(time.time()))}}
+            )
+            return True
+        except self.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def replace(self, record: dict, expected: dict) -> bool:
+        """Store record only if the live one still has the `expected` status / updated_at"""
+        types = {'status': 'S', 'updated_at': 'N'}
+        conditions, values = [], {}
+        for i, (field, value) in enumerate(expected.items()):
+            conditions.append(f"#f{i} = :v{i}")
+            values[f":v{i}"] = {types[field]: value if types[field] == 'S' else repr(value)}
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=self._item(record),
+                ConditionExpression=' AND '.join(conditions),
+                ExpressionAttributeNames={f"#f{i}": field for i, field in enumerate(expected)},
+                ExpressionAttributeValues=values
+            )
+            return True
+        except self.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def get(self, operation_id: str) -> Optional[dict]:
+        item = self.client.get_item(
+            TableName=self.table_name,
+            Key={'operation_id': {'S': operation_id}},
+            ConsistentRead=True
+        ).get('Item')
+        # TTL deletion is lazy, so expired items can still be returned
+        if not item or int(item['expires_at']['N']) < time.time():
+            return None
+        return json.loads(item['record']['S'])
+
+    def delete(self, operation_id: str):
+        self.client.delete_item(TableName=self.table_name,
+                                Key={'operation_id': {'S': operation_id}})
+
+    def update(self, operation_id: str, **fields) -> Optional[dict]:
+        # Only the runner that won start() (a conditional write) updates
+        # an operation afterwards, so read-modify-write is safe
+        record = self.get(operation_id)
+        if record is None:
+            return None
+        record.update(fields, updated_at=time.time())
+        self.put(record)
+        return record
+
+
+def start_operation(store, operation_id: str) -> Optional[dict]:
+    """
+    Move an operation from PENDING to RUNNING. Async invocations can be
+    delivered more than once; only the first delivery gets the record,
+    any other gets None and must not run it.
+    """
+    record = store.get(operation_id)
+    if record is None or record['status'] != PENDING:
+        return None
+    running = dict(record, status=RUNNING, updated_at=time.time())
+    return running if store.replace(running, {'status': PENDING}) else None
+
+
+class IdempotencyTable:
+    """
+    Request dedupe keyed by a caller-supplied idempotency key.
+    The first request claims the key; replays get the stored response.
+    A claim whose request never finished (e.g. the Lambda timed out) goes
+    stale after stale_claim_s and can be taken over; set it above the
+    longest the claimed write can still be running (the Lambda timeout).
+    """
+
+    def __init__(self, store, stale_claim_s: float = 60.0):
+        self.store = store
+        self.stale_claim_s = stale_claim_s
+
+    @staticmethod
+    def _record_id(key: str) -> str:
+        return f"idem-{key}"
+
+    def claim(self, key: str, tool: str, target: str):
+        """Returns (True, new record) for a first request, else (False, existing record)"""
+        now = time.time()
+        record = {
+            'operation_id': self._record_id(key),
+            'status': IN_PROGRESS,
+            'tool': tool,
+            'target': target,
+            'submitted_at': now,
+            'updated_at': now
+        }
+        if self.store.put_if_absent(record):
+            return True, record
+        existing = self.store.get(record['operation_id'])
+        if existing is None:
+            # Expired between the two reads
+            if self.store.put_if_absent(record):
+                return True, record
+        elif existing['status'] == IN_PROGRESS and existing['updated_at'] < now - self.stale_claim_s:
+            # Only one of several concurrent retries takes over a stale claim
+            if self.store.replace(record, {'status': IN_PROGRESS,
+                                           'updated_at': existing['updated_at']}):
+                return True, record
+        else:
+            return False, existing
+        return False, self.store.get(record['operation_id']) or record
+
+    def complete(self, key: str, response: dict):
+        self.store.update(self._record_id(key), status=COMPLETED, response=response)
+
+    def release(self, key: str):
+        """Forget a claim whose request failed, so a retry runs it again"""
+        self.store.delete(self._record_id(key))
+
+
+def public_view(record: dict) -> dict:
+    """An operation record as returned to callers (without the adapter payload)"""
+    view = {key: value for key, value in record.items() if key != 'payload'}
+    if record['status'] in TERMINAL_STATES:
+        view['duration_s'] = round(record['updated_at'] - record['submitted_at'], 2)
+    return view
+
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+
+def callback_allowed(url: str, allowed_hosts=(), allow_local: bool = True) -> bool:
+    """An http(s) URL on one of allowed_hosts, or a local host when allow_local"""
+    try:
+        parsed = urllib.parse.urlsplit(url)
+    except ValueError:
+        return False
+    host = (parsed.hostname or '').lower()
+    return (parsed.scheme in ('http', 'https') and
+            (host in allowed_hosts or (allow_local and host in LOCAL_HOSTS)))
+
+
+def notify_callback(url: str, record: dict, timeout: float = 5.0) -> Optional[str]:
+    """POST the final record to a callback URL; returns an error string on failure"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(public_view(record)).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+        return None
+    except Exception as e:
+        return str(e)
+
+
+class OperationCallbackServer:
+    """
+    Local HTTP endpoint that receives completion callbacks.
+    Completed records are kept by operation ID for the caller to read.
+    """
+
+    def __init__(self, port: int, host: str = '127.0.0.1', max_records: int = 1000):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.completed: "OrderedDict[str, dict]" = OrderedDict()
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    record = json.loads(self.rfile.read(length))
+                    operation_id = record['operation_id']
+                except (ValueError, KeyError):
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+                with server.lock:
+                    server.completed[operation_id] = record
+                    while len(server.completed) > max_records:
+                        server.completed.popitem(last=False)
+                print(f"\n📬 Operation {operation_id} finished: {record.get('status')}")
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/operations"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def get(self, operation_id: str) -> Optional[dict]:
+        with self.lock:
+            return self.completed.get(operation_id)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,444 @@
+"""
+AURA Bedrock Quota Budget
+Shared requests-per-minute / tokens-per-minute budget for concurrent agents.
+
+Several AURAAgents sharing one account quota each pace themselves with a
+fixed sleep. Run together, they either still exceed the quota, which
+leads to throttling and backoff, or leave it mostly unused. A
+QuotaBudget holds two token buckets, RPM and TPM, that refill
+continuously. Every model call reserves one request plus its estimated
+tokens before it is sent, so concurrent callers together run exactly as
+fast as the quota allows.
+
+As Bedrock does, a call is charged its input tokens plus max_tokens up
+front. The reservation is settled to the actual usage when the response
+arrives.
+
+One level up, an AdmissionController decides per incident before any
+agent starts work. It estimates what the whole incident will cost and,
+against the account's live service quotas, admits it now, queues it in
+arrival order, or sheds it when the expected wait is too long. The
+quotas are read from Service Quotas (the codes check_quotas.py prints)
+and refreshed periodically. StaticQuotaSource stands in for them
+offline and in tests.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from aura_mock_bedrock import _Body, estimate_tokens
+
+# Service Quotas codes for Bedrock (see check_quotas.py)
+QUOTA_CODES = {
+    'L-E7E0F8D4': 'rpm',         # InvokeModel requests per minute
+    'L-4B3D527C': 'stream_rpm',  # InvokeModelWithResponseStream requests per minute
+}
+
+# Used when a quota cannot be read (TPM quotas are per model, so the
+# code is configured with AURA_BEDROCK_TPM_QUOTA_CODE)
+DEFAULT_RPM = float(os.environ.get('AURA_BEDROCK_RPM', '50'))
+DEFAULT_TPM = float(os.environ.get('AURA_BEDROCK_TPM', '200000'))
+
+ADMIT = 'ADMIT'
+QUEUE = 'QUEUE'
+SHED = 'SHED'
+
+
+class QuotaBudget:
+    """RPM + TPM token buckets; callers are served first-come, first-served"""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.updated = time.monotonic()
+        self.cond = threading.Condition()
+        self.next_ticket = 0
+        self.serving = 0
+        self.abandoned = set()
+        self.waiting_requests = 0
+        self.waiting_tokens = 0
+        self.counters = {'requests': 0, 'tokens': 0, 'waits': 0, 'wait_s': 0.0}
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+
+    def _shortfall_s(self, tokens: int, requests: int = 1) -> float:
+        """Seconds until `requests` requests and `tokens` tokens are available"""
+        # A reservation larger than a whole bucket only waits for it to be full
+        need_requests = max(0.0, min(requests, self.rpm) - self.requests)
+        need_tokens = max(0.0, min(tokens, self.tpm) - self.tokens)
+        return max(need_requests * 60 / self.rpm, need_tokens * 60 / self.tpm)
+
+    def resize(self, rpm: float, tpm: float):
+        """Apply a new quota; current levels are kept within the new limits"""
+        with self.cond:
+            self._refill(time.monotonic())
+            self.requests = min(self.requests + max(0.0, rpm - self.rpm), rpm)
+            self.tokens = min(self.tokens + max(0.0, tpm - self.tpm), tpm)
+            self.rpm, self.tpm = rpm, tpm
+            self.cond.notify_all()
+
+    def wait_estimate(self, tokens: int, requests: int = 1) -> float:
+        """Seconds a new reservation would wait behind the current queue"""
+        with self.cond:
+            self._refill(time.monotonic())
+            need_requests = max(0.0, self.waiting_requests + requests - self.requests)
+            need_tokens = max(0.0, self.waiting_tokens + tokens - self.tokens)
+            return max(need_requests * 60 / self.rpm, need_tokens * 60 / self.tpm)
+
+    def _advance(self):
+        """Pass the head of the queue on, skipping callers that gave up"""
+        self.serving += 1
+        while self.serving in self.abandoned:
+            self.abandoned.discard(self.serving)
+            self.serving += 1
+        self.cond.notify_all()
+
+    def acquire(self, tokens: int, timeout: Optional[float] = None, requests: int = 1) -> bool:
+        """Reserve `requests` requests and `tokens` tokens, blocking in arrival order"""
+        started = time.monotonic()
+        with self.cond:
+            ticket = self.next_ticket
+            self.next_ticket += 1
+            self.waiting_requests += requests
+            self.waiting_tokens += tokens
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._shortfall_s(tokens, requests) if ticket == self.serving else None
+                    if wait is not None and wait <= 0:
+                        break
+                    if timeout is not None:
+                        remaining = started + timeout - now
+                        if remaining <= 0:
+                            if ticket == self.serving:
+                                self._advance()
+                            else:
+                                self.abandoned.add(ticket)
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self.cond.wait(wait)
+            finally:
+                self.waiting_requests -= requests
+                self.waiting_tokens -= tokens
+
+            self.requests -= requests
+            self.tokens -= tokens
+            self._advance()
+            waited = time.monotonic() - started
+            self.counters['requests'] += requests
+            self.counters['tokens'] += tokens
+            if waited > 0.001:
+                self.counters['waits'] += 1
+                self.counters['wait_s'] += waited
+            return True
+
+    def settle(self, reserved: int, actual: int):
+        """Return unused reserved tokens (or charge an overrun)"""
+        with self.cond:
+            self.tokens = min(self.tpm, self.tokens + reserved - actual)
+            self.counters['tokens'] += actual - reserved
+            self.cond.notify_all()
+
+    def stats(self) -> dict:
+        with self.cond:
+            stats = dict(self.counters, rpm=self.rpm, tpm=self.tpm)
+        stats['wait_s'] = round(stats['wait_s'], 3)
+        return stats
+
+
+def estimate_request_tokens(request: dict) -> int:
+    """Input tokens plus max_tokens, which Bedrock reserves up front"""
+    system = request.get('system', '')
+    if not isinstance(system, str):
+        system = json.dumps(system)
+    return (estimate_tokens(system + json.dumps(request.get('messages', []))) +
+            request.get('max_tokens', 0))
+
+
+class BudgetedRuntime:
+    """Wraps a bedrock-runtime client so every invoke_model draws from a QuotaBudget"""
+
+    def __init__(self, client, budget: QuotaBudget):
+        self.client = client
+        self.budget = budget
+
+    def invoke_model(self, **kwargs) -> dict:
+        reserved = estimate_request_tokens(json.loads(kwargs['body']))
+        self.budget.acquire(reserved)
+        try:
+            response = self.client.invoke_model(**kwargs)
+        except ClientError:
+            # A rejected call consumed the request but no tokens
+            self.budget.settle(reserved, 0)
+            raise
+        payload = response['body'].read()
+        response['body'] = _Body(payload)
+        usage = json.loads(payload).get('usage', {})
+        self.budget.settle(reserved, usage.get('input_tokens', 0) + usage.get('output_tokens', 0))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def install_call_budget(agent_module, budget: QuotaBudget):
+    """
+    Route an agent module's model calls through a budget. The budget
+    does the pacing, so the module's fixed inter-call sleep is dropped.
+    """
+    agent_module.bedrock_runtime = BudgetedRuntime(agent_module.bedrock_runtime, budget)
+    agent_module.INTER_CALL_DELAY = 0
+
+
+# --- Live quotas ---
+
+class ServiceQuotaSource:
+    """Bedrock quotas from the Service Quotas API"""
+
+    def __init__(self, region_name: str = 'us-east-1', client=None,
+                 tpm_quota_code: Optional[str] = None):
+        import boto3
+        self.client = client or boto3.client('service-quotas', region_name=region_name)
+        self.codes = dict(QUOTA_CODES)
+        tpm_quota_code = tpm_quota_code or os.environ.get('AURA_BEDROCK_TPM_QUOTA_CODE')
+        if tpm_quota_code:
+            self.codes[tpm_quota_code] = 'tpm'
+
+    def fetch(self) -> Dict[str, float]:
+        quotas = {}
+        for code, name in self.codes.items():
+            response = self.client.get_service_quota(ServiceCode='bedrock', QuotaCode=code)
+            quotas[name] = float(response['Quota']['Value'])
+        return quotas
+
+
+class StaticQuotaSource:
+    """Fixed quotas, for offline runs and tests"""
+
+    def __init__(self, rpm: float = DEFAULT_RPM, tpm: float = DEFAULT_TPM,
+                 stream_rpm: Optional[float] = None):
+        self.quotas = {'rpm': rpm, 'tpm': tpm, 'stream_rpm': stream_rpm if stream_rpm is not None else rpm}
+
+    @classmethod
+    def from_file(cls, path: str) -> "StaticQuotaSource":
+        with open(path, 'r') as f:
+            return cls(**json.load(f))
+
+    def fetch(self) -> Dict[str, float]:
+        return dict(self.quotas)
+
+
+def make_quota_source():
+    """
+    AURA_QUOTA_STUB=1 (defaults) or a JSON file of {rpm, tpm, stream_rpm}
+    selects the stub; otherwise Service Quotas is queried.
+    """
+    stub = os.environ.get('AURA_QUOTA_STUB')
+    if stub:
+        return StaticQuotaSource() if stub in ('1', 'true', 'yes') else StaticQuotaSource.from_file(stub)
+    return ServiceQuotaSource()
+
+
+class QuotaRefresher:
+    """
+    Loads quotas at start and re-reads them every interval_s, resizing
+    the budgets it manages. A failed read keeps the last known values.
+    """
+
+    def __init__(self, source, interval_s: float = 300.0):
+        self.source = source
+        self.interval_s = interval_s
+        self.budgets = []
+        self.quotas = {'rpm': DEFAULT_RPM, 'tpm': DEFAULT_TPM, 'stream_rpm': DEFAULT_RPM}
+        self.last_error = None
+        self.refreshed_at = None
+        self.stop_event = threading.Event()
+        self.refresh()
+
+    def manage(self, budget: QuotaBudget, utilization: float = 1.0) -> QuotaBudget:
+        """Keep a budget at `utilization` of the live quota"""
+        self.budgets.append((budget, utilization))
+        budget.resize(self.quotas['rpm'] * utilization, self.quotas['tpm'] * utilization)
+        return budget
+
+    def refresh(self) -> Dict[str, float]:
+        try:
+            fetched = self.source.fetch()
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"⚠️  Could not refresh Bedrock quotas, keeping {self.quotas}: {e}")
+            return self.quotas
+        self.quotas = dict(self.quotas, **fetched)
+        self.last_error = None
+        self.refreshed_at = time.time()
+        for budget, utilization in self.budgets:
+            budget.resize(self.quotas['rpm'] * utilization, self.quotas['tpm'] * utilization)
+        return self.quotas
+
+    def start(self) -> "QuotaRefresher":
+        def loop():
+            while not self.stop_event.wait(self.interval_s):
+                self.refresh()
+        threading.Thread(target=loop, name='aura-quota-refresh', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+
+# --- Incident admission ---
+
+class IncidentCostModel:
+    """
+    Expected model usage of one incident. The agent makes a few calls
+    for the first site and a couple more for every further site, capped
+    by its iteration limit. Every call resends the system prompt and the
+    growing conversation.
+    """
+
+    def __init__(self, system_tokens: int = 1500, turn_tokens: int = 250,
+                 output_tokens: int = 200, base_calls: int = 3,
+                 calls_per_extra_site: int = 2, max_calls: int = 6):
+        self.system_tokens = system_tokens
+        self.turn_tokens = turn_tokens
+        self.output_tokens = output_tokens
+        self.base_calls = base_calls
+        self.calls_per_extra_site = calls_per_extra_site
+        self.max_calls = max_calls
+
+    def estimate(self, incident: dict):
+        """(requests, tokens) the incident is expected to use"""
+        prompt = incident.get('prompt', '')
+        sites = max(1, len(incident.get('sites') or []))
+        calls = min(self.max_calls, self.base_calls + self.calls_per_extra_site * (sites - 1))
+        prompt_tokens = estimate_tokens(prompt)
+        tokens = sum(self.system_tokens + prompt_tokens + i * self.turn_tokens + self.output_tokens
+                     for i in range(calls))
+        return calls, tokens
+
+
+class AdmissionController:
+    """
+    Admit, queue or shed incidents so the agents stay within the quota.
+    Admission reserves an incident's estimated cost from a budget kept
+    below the live quota. An incident that does not fit waits, in arrival
+    order, in a queue of at most max_queue incidents served by the
+    controller's own thread, so whoever submits never blocks on the
+    quota. When the expected wait exceeds max_wait_s, the queue is full,
+    or a queued incident is still not admitted after max_wait_s, the
+    incident is shed.
+
+    Admitted incidents go to dispatch(incident); shed ones to
+    on_shed(incident, reason).
+    """
+
+    def __init__(self, budget: QuotaBudget, cost_model: Optional[IncidentCostModel] = None,
+                 max_queue: int = 16, max_wait_s: float = 120.0):
+        self.budget = budget
+        self.cost_model = cost_model or IncidentCostModel()
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.lock = threading.Lock()
+        self.pending: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        # Incidents waiting, including the one whose reservation is in progress
+        self.queued = 0
+        self.queued_requests = 0
+        self.queued_tokens = 0
+        self.counters = {'admitted': 0, 'queued': 0, 'shed': 0, 'queue_wait_s': 0.0,
+                         'queue_peak': 0}
+        self.dispatch: Callable[[dict], None] = lambda incident: None
+        self.on_shed: Callable[[dict, str], None] = lambda incident, reason: None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, dispatch: Callable[[dict], None],
+              on_shed: Optional[Callable[[dict, str], None]] = None) -> 'AdmissionController':
+        self.dispatch = dispatch
+        if on_shed:
+            self.on_shed = on_shed
+        self.thread = threading.Thread(target=self._serve, name='aura-admission', daemon=True)
+        self.thread.start()
+        return self
+
+    def submit(self, incident: dict) -> str:
+        """Admit, queue or shed an incident without waiting; returns ADMIT, QUEUE or SHED"""
+        requests, tokens = self.cost_model.estimate(incident)
+        incident['estimated_cost'] = {'requests': requests, 'tokens': tokens}
+        with self.lock:
+            # Nobody waiting and it fits now: skip the queue
+            admitted = self.queued == 0 and self.budget.acquire(tokens, timeout=0, requests=requests)
+            if admitted:
+                self.counters['admitted'] += 1
+            else:
+                wait_s = self.budget.wait_estimate(tokens + self.queued_tokens,
+                                                   requests + self.queued_requests)
+                if self.queued >= self.max_queue:
+                    reason = f"admission queue full ({self.max_queue})"
+                elif wait_s > self.max_wait_s:
+                    reason = f"expected wait {wait_s:.0f}s over {self.max_wait_s:g}s"
+                else:
+                    reason = None
+                    self.queued += 1
+                    self.queued_requests += requests
+                    self.queued_tokens += tokens
+                    self.counters['queued'] += 1
+                    self.counters['queue_peak'] = max(self.counters['queue_peak'], self.queued)
+                    self.pending.put_nowait((incident, time.monotonic()))
+                if reason:
+                    self.counters['shed'] += 1
+        if admitted:
+            self.dispatch(incident)
+            return ADMIT
+        if reason:
+            self.on_shed(incident, reason)
+            return SHED
+        return QUEUE
+
+    def _serve(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            incident, enqueued_at = item
+            cost = incident['estimated_cost']
+            with self.lock:
+                # The budget counts it as waiting from here on
+                self.queued_requests -= cost['requests']
+                self.queued_tokens -= cost['tokens']
+            remaining = self.max_wait_s - (time.monotonic() - enqueued_at)
+            admitted = remaining > 0 and self.budget.acquire(
+                cost['tokens'], timeout=remaining, requests=cost['requests'])
+            with self.lock:
+                self.queued -= 1
+                self.counters['queue_wait_s'] += time.monotonic() - enqueued_at
+                self.counters['admitted' if admitted else 'shed'] += 1
+            if admitted:
+                self.dispatch(incident)
+            else:
+                self.on_shed(incident, f"not admitted within {self.max_wait_s:g}s")
+
+    def close(self):
+        """Wait for queued incidents to be admitted or shed, then stop"""
+        if self.thread:
+            self.pending.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.counters, queue_depth=self.queued)
+        stats['queue_wait_s'] = round(stats['queue_wait_s'], 3)
+        stats['budget'] = self.budget.stats()
+        return stats
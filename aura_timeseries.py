@@ -0,0 +1,172 @@
+"""
+AURA Time-Series Store
+Fixed-memory ring buffers for KPI and latency samples.
+
+Every normalized sample that comes back through the gateway is recorded
+per element (cell, device or link). Each series is a preallocated NumPy
+ring buffer of `capacity` rows x len(METRICS) columns, so memory per
+series is fixed no matter how long AURA runs, and the number of series
+is capped with least-recently-updated eviction.
+
+Window queries (last N minutes, min/max/mean/percentiles) are a couple
+of vectorized NumPy reductions over at most `capacity` rows.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from aura_kpi_schema import METRICS, SCHEMA, KpiBatch
+
+METRIC_INDEX = {metric: i for i, metric in enumerate(METRICS)}
+
+
+class RingSeries:
+    """One element's samples: timestamps plus one row of metrics each"""
+
+    __slots__ = ('times', 'values', 'head', 'count')
+
+    def __init__(self, capacity: int):
+        self.times = np.full(capacity, np.nan)
+        self.values = np.full((capacity, len(METRICS)), np.nan)
+        self.head = 0
+        self.count = 0
+
+    def append(self, timestamp: float, row: np.ndarray):
+        self.times[self.head] = timestamp
+        self.values[self.head] = row
+        self.head = (self.head + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+
+    def ordered(self):
+        """Samples oldest-first as (times, values) views or copies"""
+        if self.count < len(self.times):
+            return self.times[:self.count], self.values[:self.count]
+        order = np.r_[self.head:len(self.times), 0:self.head]
+        return self.times[order], self.values[order]
+
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+
+class TimeSeriesStore:
+    """
+    Bounded in-memory store of canonical KPI samples keyed by element.
+    Each series costs capacity * (len(METRICS) + 1) * 8 bytes up front.
+    """
+
+    def __init__(self, capacity_per_series: int = 240, max_series: int = 1000):
+        self.capacity = capacity_per_series
+        self.max_series = max_series
+        self.series: "OrderedDict[str, RingSeries]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.samples_recorded = 0
+
+    def _series(self, element_id: str) -> RingSeries:
+        series = self.series.get(element_id)
+        if series is None:
+            if len(self.series) >= self.max_series:
+                self.series.popitem(last=False)
+            series = RingSeries(self.capacity)
+            self.series[element_id] = series
+        else:
+            self.series.move_to_end(element_id)
+        return series
+
+    def record(self, element_id: str, kpis: Dict[str, float],
+               timestamp: Optional[float] = None):
+        """Record one sample of canonical metrics for an element"""
+        if not element_id or not kpis:
+            return
+        row = np.full(len(METRICS), np.nan)
+        for metric, value in kpis.items():
+            index = METRIC_INDEX.get(metric)
+            if index is not None and isinstance(value, (int, float)):
+                row[index] = value
+        with self.lock:
+            self._series(element_id).append(timestamp or time.time(), row)
+            self.samples_recorded += 1
+
+    def record_normalized(self, normalized: dict):
+        """Record a record produced by aura_kpi_schema.normalize_record"""
+        self.record(normalized.get('element_id'), normalized.get('kpis', {}),
+                    normalized.get('timestamp'))
+
+    def record_batch(self, batch: KpiBatch):
+        """Record every row of a columnar KpiBatch"""
+        if not len(batch):
+            return
+        matrix = np.column_stack([np.frombuffer(batch.column(metric), dtype=np.float64)
+                                  for metric in METRICS])
+        times = np.frombuffer(batch.timestamps, dtype=np.float64)
+        now = time.time()
+        with self.lock:
+            for i, element_id in enumerate(batch.element_ids):
+                timestamp = times[i] if not np.isnan(times[i]) else now
+                self._series(element_id).append(timestamp, matrix[i])
+            self.samples_recorded += len(batch)
+
+    def window(self, element_id: str, minutes: Optional[float] = None,
+               last_n: Optional[int] = None, now: Optional[float] = None):
+        """
+        Samples for one element as (times, values), oldest first.
+        values has one column per metric in aura_kpi_schema.METRICS.
+        """
+        with self.lock:
+            series = self.series.get(element_id)
+            if series is None:
+                return np.empty(0), np.empty((0, len(METRICS)))
+            times, values = series.ordered()
+            times, values = times.copy(), values.copy()
+        if minutes is not None:
+            cutoff = (now or time.time()) - minutes * 60
+            keep = times >= cutoff
+            times, values = times[keep], values[keep]
+        if last_n is not None:
+            times, values = times[-last_n:], values[-last_n:]
+        return times, values
+
+    def summary(self, element_id: str, minutes: Optional[float] = 15,
+                metrics: Optional[List[str]] = None, now: Optional[float] = None) -> dict:
+        """Compact per-metric statistics over a time window"""
+        times, values = self.window(element_id, minutes=minutes, now=now)
+        result = {
+            'element_id': element_id,
+            'window_minutes': minutes,
+            'samples': int(len(times)),
+            'metrics': {}
+        }
+        if not len(times):
+            return result
+
+        result['first_timestamp'] = int(times[0])
+        result['last_timestamp'] = int(times[-1])
+        for metric in metrics or METRICS:
+            column = values[:, METRIC_INDEX[metric]]
+            column = column[~np.isnan(column)]
+            if not len(column):
+                continue
+            p50, p95 = np.percentile(column, [50, 95])
+            result['metrics'][metric] = {
+                'unit': SCHEMA[metric],
+                'last': round(float(column[-1]), 3),
+                'min': round(float(column.min()), 3),
+                'max': round(float(column.max()), 3),
+                'mean': round(float(column.mean()), 3),
+                'p50': round(float(p50), 3),
+                'p95': round(float(p95), 3),
+                'change': round(float(column[-1] - column[0]), 3)
+            }
+        return result
+
+    def series_ids(self) -> List[str]:
+        with self.lock:
+            return list(self.series)
+
+    def nbytes(self) -> int:
+        """Bytes held by all ring buffers"""
+        with self.lock:
+            return sum(series.nbytes() for series in self.series.values())
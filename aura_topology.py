@@ -0,0 +1,220 @@
+"""
+AURA Network Topology Index
+In-memory graph of sites, cells, backhaul links and shared upstream elements.
+
+The graph is loaded from topology.json:
+
+    sites     site -> vendor, region, cells, links
+    links     link -> type, role (primary/backup), backup link, upstream elements
+    upstream  aggregation/core element -> its own upstream elements
+
+At load time every element's transitive upstream set and the reverse
+"which sites depend on this element" index are precomputed, so blast
+radius, shared-fate and dependency queries are a few dict/set lookups.
+
+Only the standard library is used so the module can ship inside the
+router Lambda zip.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Set
+
+DEFAULT_TOPOLOGY_PATH = os.environ.get(
+    'AURA_TOPOLOGY_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'topology.json')
+)
+
+
+def site_from_name(element_id: str) -> str:
+    """Naming-convention fallback: "DUB-07-FIBER" -> "DUB-07" """
+    parts = element_id.split('-')
+    if len(parts) >= 2:
+        return f"{parts[0]}-{parts[1]}"
+    return element_id
+
+
+class TopologyIndex:
+    """Adjacency indexes over the site / cell / link / upstream graph"""
+
+    def __init__(self, data: dict):
+        self.sites: Dict[str, dict] = data.get('sites', {})
+        self.links: Dict[str, dict] = data.get('links', {})
+        self.upstream: Dict[str, dict] = data.get('upstream', {})
+
+        # element -> owning site, for cells and links
+        self.element_site: Dict[str, str] = {}
+        for site_id, site in self.sites.items():
+            self.element_site[site_id] = site_id
+            for element in site.get('cells', []) + site.get('links', []):
+                self.element_site[element] = site_id
+
+        # element -> every element above it, transitively
+        self.ancestors: Dict[str, frozenset] = {}
+        for element in list(self.links) + list(self.upstream):
+            self._ancestors_of(element, set())
+
+        # element -> sites and links that depend on it (including itself)
+        self.dependent_sites: Dict[str, Set[str]] = {}
+        self.dependent_links: Dict[str, Set[str]] = {}
+        for link_id in self.links:
+            site_id = self.element_site.get(link_id, site_from_name(link_id))
+            for element in (link_id,) + tuple(self.ancestors[link_id]):
+                self.dependent_sites.setdefault(element, set()).add(site_id)
+                self.dependent_links.setdefault(element, set()).add(link_id)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TOPOLOGY_PATH) -> 'TopologyIndex':
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def _ancestors_of(self, element: str, visiting: set) -> frozenset:
+        if element in self.ancestors:
+            return self.ancestors[element]
+        if element in visiting:
+            raise ValueError(f"Topology cycle through {element}")
+        visiting.add(element)
+        node = self.links.get(element) or self.upstream.get(element) or {}
+        found = set()
+        for parent in node.get('upstream', []):
+            found.add(parent)
+            found |= self._ancestors_of(parent, visiting)
+        visiting.discard(element)
+        self.ancestors[element] = frozenset(found)
+        return self.ancestors[element]
+
+    # --- Lookups ---
+
+    def site_of(self, element_id: str) -> str:
+        return self.element_site.get(element_id, site_from_name(element_id))
+
+    def vendor_of(self, element_id: str) -> Optional[str]:
+        site = self.sites.get(self.site_of(element_id))
+        return site.get('vendor') if site else None
+
+    def site_vendors(self) -> Dict[str, str]:
+        return {site_id: site['vendor'] for site_id, site in self.sites.items()
+                if 'vendor' in site}
+
+    def site_links(self, site_id: str) -> List[str]:
+        return list(self.sites.get(site_id, {}).get('links', []))
+
+    def primary_links(self, site_id: str) -> List[str]:
+        return [link for link in self.site_links(site_id)
+                if self.links.get(link, {}).get('role', 'primary') == 'primary']
+
+    def backup_links(self, site_id: str) -> List[str]:
+        """The backup path of each primary link at a site"""
+        return [self.links[link]['backup'] for link in self.primary_links(site_id)
+                if self.links.get(link, {}).get('backup')]
+
+    def sites_in_region(self, region: str) -> List[str]:
+        return [site_id for site_id, site in self.sites.items()
+                if site.get('region') == region or site_id.startswith(region)]
+
+    def contains(self, element_id: str) -> bool:
+        return (element_id in self.element_site or element_id in self.links
+                or element_id in self.upstream)
+
+    def alarm_candidates(self, element_id: str) -> frozenset:
+        """
+        Elements whose failure could explain an alarm raised on element_id:
+        the element itself plus everything upstream of it. A cell or site
+        alarm is explained by its site's primary links and their upstream.
+        """
+        if element_id in self.links or element_id in self.upstream:
+            return frozenset((element_id,)) | self.ancestors.get(element_id, frozenset())
+        site_id = self.site_of(element_id)
+        if site_id in self.sites:
+            found = {element_id, site_id}
+            for link_id in self.primary_links(site_id):
+                found.add(link_id)
+                found |= self.ancestors.get(link_id, frozenset())
+            return frozenset(found)
+        return frozenset((element_id,))
+
+    def dependent_site_count(self, element_id: str) -> int:
+        """How many sites an element can take down (1 for a site or cell)"""
+        return len(self.dependent_sites.get(element_id, ())) or 1
+
+    # --- Queries ---
+
+    def sites_depending_on(self, element_id: str) -> List[str]:
+        """Sites with at least one link that runs through element_id"""
+        return sorted(self.dependent_sites.get(element_id, ()))
+
+    def blast_radius(self, element_id: str) -> dict:
+        """
+        What happens if element_id fails: which sites lose their primary
+        path, which of those have a backup path that avoids it, and which
+        unaffected sites are left without their backup.
+        """
+        failed_links = self.dependent_links.get(element_id, set())
+        affected, protected, isolated, backup_lost = set(), set(), set(), set()
+        for link_id in failed_links:
+            link = self.links.get(link_id, {})
+            if link.get('role', 'primary') != 'primary':
+                backup_lost.add(self.site_of(link_id))
+                continue
+            site_id = self.site_of(link_id)
+            affected.add(site_id)
+            backup = link.get('backup')
+            if backup and backup not in failed_links:
+                protected.add(site_id)
+            else:
+                isolated.add(site_id)
+
+        isolated -= protected
+        return {
+            'element_id': element_id,
+            'known_element': self.contains(element_id),
+            'affected_sites': sorted(affected),
+            'protected_by_backup': sorted(protected),
+            'isolated_sites': sorted(isolated),
+            'backup_lost_sites': sorted(backup_lost - affected),
+            'affected_cells': sorted(cell for site_id in affected
+                                     for cell in self.sites.get(site_id, {}).get('cells', [])),
+            'failed_links': sorted(failed_links)
+        }
+
+    def shared_fate(self, a: str, b: str) -> List[str]:
+        """Upstream elements whose failure would hit both a and b (sites or links)"""
+        return sorted(self._upstream_of(a) & self._upstream_of(b))
+
+    def _upstream_of(self, element_id: str) -> Set[str]:
+        if element_id in self.sites:
+            found = set()
+            for link_id in self.primary_links(element_id):
+                found.add(link_id)
+                found |= self.ancestors.get(link_id, frozenset())
+            return found
+        return set(self.ancestors.get(element_id, frozenset()))
+
+    def site_dependencies(self, site_id: str) -> dict:
+        """Everything a site depends on, link by link"""
+        site = self.sites.get(site_id)
+        if site is None:
+            return {'site_id': site_id, 'error': 'Unknown site'}
+        links = {}
+        for link_id in site.get('links', []):
+            link = self.links.get(link_id, {})
+            links[link_id] = {
+                'type': link.get('type'),
+                'role': link.get('role'),
+                'backup': link.get('backup'),
+                'upstream': sorted(self.ancestors.get(link_id, frozenset()))
+            }
+        return {
+            'site_id': site_id,
+            'vendor': site.get('vendor'),
+            'region': site.get('region'),
+            'cells': site.get('cells', []),
+            'links': links
+        }
+
+
+def load_topology(path: str = DEFAULT_TOPOLOGY_PATH) -> Optional[TopologyIndex]:
+    """Load the topology file, or None if there isn't one"""
+    if not os.path.exists(path):
+        return None
+    return TopologyIndex.load(path)
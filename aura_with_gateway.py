@@ -4,20 +4,38 @@ AURA Agent with MCP Gateway Integration
 Connects to AWS Lambda-based vendor adapters via API Gateway
 """
 
-import boto3
 import json
 import requests
 from typing import List, Dict, Callable, Any
 from dataclasses import dataclass
+import hashlib
+import os
 import re
+import sys
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
-# Load gateway configuration
+from aura_anomaly import FleetAnomalyDetector
+from aura_failover import FailoverOrchestrator
+from aura_gateway_fixtures import gateway_post, load_gateway_endpoint
+from aura_hedging import HedgedCaller
+from aura_kpi_schema import VENDORS, KpiBatch, normalize_record
+from aura_logging import current_correlation_id, get_logger, in_scope
+from aura_metrics import outcome_of
+from aura_mock_bedrock import make_bedrock_runtime, pacing_delay
+from aura_operations import OperationCallbackServer
+from aura_timeseries import TimeSeriesStore
+from aura_topology import TopologyIndex, load_topology
+
+# Load gateway configuration (AURA_GATEWAY_CONFIG selects another file,
+# e.g. one written by local_gateway.py; AURA_GATEWAY_RECORD / _REPLAY
+# capture or serve gateway traffic through a fixture file)
+GATEWAY_CONFIG_FILE = os.environ.get('AURA_GATEWAY_CONFIG', 'gateway_config.json')
 try:
-    with open('gateway_config.json', 'r') as f:
-        GATEWAY_CONFIG = json.load(f)
-    GATEWAY_ENDPOINT = GATEWAY_CONFIG['endpoint']
+    GATEWAY_ENDPOINT = load_gateway_endpoint(GATEWAY_CONFIG_FILE)
     USE_GATEWAY = True
     print(f"✅ Gateway configuration loaded: {GATEWAY_ENDPOINT}")
 except FileNotFoundError:
@@ -26,15 +44,79 @@ except FileNotFoundError:
     GATEWAY_ENDPOINT = None
 
 # Initialize Bedrock client
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# (AURA_BEDROCK_MOCK selects the offline mock runtime)
+bedrock_runtime = make_bedrock_runtime(region_name='us-east-1')
 
 # Model configuration
 CLAUDE_MODEL = 'us.anthropic.claude-sonnet-4-20250514-v1:0'
 
 # Rate limiting configuration
-RETRY_DELAY = 3
+RETRY_DELAY = pacing_delay(3, bedrock_runtime)
 MAX_RETRIES = 5
-INTER_CALL_DELAY = 3
+INTER_CALL_DELAY = pacing_delay(3, bedrock_runtime)
+
+# Gateway client configuration
+GATEWAY_TIMEOUT = 10
+
+# Tools that change the network carry an idempotency key built from the
+# incident, site and action, so a retried or repeated call is answered
+# with the original result instead of running the change twice. That
+# makes it safe to retry them on timeouts and connection errors.
+WRITE_TOOLS = {'initiate_ntn_failover'}
+GATEWAY_WRITE_RETRIES = int(os.environ.get('AURA_GATEWAY_WRITE_RETRIES', '2'))
+
+# Incident the current thread's agent is working on
+INCIDENT_CONTEXT = threading.local()
+
+# Structured JSON logs of model and tool calls, correlated with the
+# gateway's by incident ID. Only warnings and errors by default, on
+# stderr so the conversation stays readable; AURA_LOG_LEVEL=INFO for all
+log = get_logger('agent', default_level='WARNING', default_slow_ms=60000, stream=sys.stderr)
+
+# Hedging is opt-in and only ever applied to tools that do not change
+# network state; a duplicated failover is never acceptable
+HEDGING_ENABLED = os.environ.get('AURA_GATEWAY_HEDGING', '0') == '1'
+HEDGED_TOOLS = {'get_cell_kpis', 'measure_link_latency', 'get_gateway_health'}
+hedger = HedgedCaller(
+    budget_ratio=float(os.environ.get('AURA_HEDGE_BUDGET', '0.05'))
+) if HEDGING_ENABLED else None
+
+# Every normalized sample returned by the gateway is kept here so the
+# agent can look at trends without re-querying the network
+KPI_HISTORY = TimeSeriesStore()
+
+# Baselines for scan_sites; every scan both scores and updates them
+FLEET_DETECTOR = FleetAnomalyDetector()
+
+# Site / link / upstream graph shared with the gateway router
+TOPOLOGY = load_topology()
+# Element -> site by topology where known, else by naming convention
+SITE_INDEX = TOPOLOGY or TopologyIndex({})
+
+# Backhaul links probed for each site during a scan
+if TOPOLOGY:
+    SITE_LINKS = {site_id: TOPOLOGY.site_links(site_id) for site_id in TOPOLOGY.sites}
+else:
+    SITE_LINKS = {
+        'DUB-07': ['DUB-07-FIBER', 'DUB-07-NTN'],
+        'LON-15': ['LON-15-FIBER'],
+        'PAR-03': ['PAR-03-MPLS'],
+    }
+
+SCAN_MAX_WORKERS = 8
+SCAN_MAX_FINDINGS = 10
+
+# Bulk failover: plans wait here, keyed by batch ID, until approved
+FAILOVER_CONCURRENCY = int(os.environ.get('AURA_FAILOVER_CONCURRENCY', '4'))
+FAILOVER_STAGGER_S = float(os.environ.get('AURA_FAILOVER_STAGGER_S', '2'))
+PENDING_FAILOVERS = {}
+
+# Async operations: failovers return an operation ID at once and run in
+# the background. With a callback port the gateway reports completion
+# to a local endpoint, so status checks need no gateway round trip.
+ASYNC_OPERATIONS = os.environ.get('AURA_ASYNC_OPERATIONS', '0') == '1'
+CALLBACK_PORT = os.environ.get('AURA_CALLBACK_PORT')
+operation_callbacks = OperationCallbackServer(int(CALLBACK_PORT)) if CALLBACK_PORT else None
 
 # --- Tool Definitions with Gateway Integration ---
 
@@ -46,22 +128,87 @@ class Tool:
     function: Callable
     parameters: Dict[str, str]
 
-def call_gateway(tool: str, target: str) -> dict:
-    """Call the MCP Gateway API"""
+def _gateway_headers() -> dict:
+    headers = {'Content-Type': 'application/json'}
+    correlation_id = current_correlation_id()
+    if correlation_id:
+        # The router and adapters log under the same ID
+        headers['X-Correlation-Id'] = correlation_id
+    return headers
+
+def _post_gateway(tool: str, target: str, **extra):
+    """Send one request to the MCP Gateway API"""
+    return gateway_post(
+        GATEWAY_ENDPOINT,
+        json={
+            "tool": tool,
+            "target": target,
+            **extra
+        },
+        headers=_gateway_headers(),
+        timeout=GATEWAY_TIMEOUT
+    )
+
+def idempotency_key(incident_id: str, site_id: str, action: str) -> str:
+    """Stable key for one action on one site within one incident"""
+    return hashlib.sha256(f"{incident_id}|{site_id}|{action}".encode()).hexdigest()[:32]
+
+def _write_extra(tool: str, target: str, incident_id: str = None) -> dict:
+    """Request fields that make a write tool call idempotent"""
+    if tool not in WRITE_TOOLS:
+        return {}
+    # Outside an incident each call is its own operation; retries of this
+    # call still share the key
+    incident_id = (incident_id or getattr(INCIDENT_CONTEXT, 'incident_id', None)
+                   or f'adhoc-{uuid.uuid4()}')
+    return {"idempotency_key": idempotency_key(incident_id, SITE_INDEX.site_of(target), tool)}
+
+def _post_gateway_write(tool: str, target: str, **extra):
+    """Post a write tool, retrying transport failures under its idempotency key"""
+    for attempt in range(GATEWAY_WRITE_RETRIES + 1):
+        try:
+            response = _post_gateway(tool, target, **extra)
+        except requests.exceptions.RequestException:
+            if attempt == GATEWAY_WRITE_RETRIES:
+                raise
+            continue
+        # 409: the first attempt is still running at the gateway
+        if response.status_code == 409 and attempt < GATEWAY_WRITE_RETRIES:
+            time.sleep(response.json().get('retry_after_s', 1))
+            continue
+        return response
+
+def call_gateway(tool: str, target: str, incident_id: str = None) -> dict:
+    """Call the MCP Gateway API, hedging read-only tools when enabled"""
     try:
-        response = requests.post(
-            GATEWAY_ENDPOINT,
-            json={
-                "tool": tool,
-                "target": target
-            },
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        if tool in WRITE_TOOLS:
+            response = _post_gateway_write(tool, target, **_write_extra(tool, target, incident_id))
+        elif hedger and tool in HEDGED_TOOLS:
+            response = hedger.call(
+                tool, in_scope(lambda: _post_gateway(tool, target)), timeout=GATEWAY_TIMEOUT)
+        else:
+            response = _post_gateway(tool, target)
         
         if response.status_code == 200:
             data = response.json()
-            return data.get('data', {})
+            result = data.get('data', {})
+            if data.get('normalized') and not data.get('degraded'):
+                KPI_HISTORY.record_normalized(data['normalized'])
+            if data.get('degraded'):
+                # Vendor breaker is open; this is the last known good answer
+                result = dict(result)
+                result['degraded'] = True
+                result['cached_age_s'] = data.get('cached_age_s')
+            return result
+        elif response.status_code == 503:
+            data = response.json()
+            return {
+                "error": data.get('error', 'Vendor adapter unavailable'),
+                "circuit_open": data.get('circuit_open', False),
+                "vendor": data.get('vendor'),
+                "retry_after_s": data.get('retry_after_s'),
+                "advice": "Do not retry this vendor until retry_after_s has passed. Investigate other sites or report the outage."
+            }
         else:
             return {
                 "error": f"Gateway returned status {response.status_code}",
@@ -73,6 +220,57 @@ def call_gateway(tool: str, target: str) -> dict:
             "details": str(e)
         }
 
+def submit_gateway_operation(tool: str, target: str, incident_id: str = None) -> dict:
+    """Submit a long-running tool asynchronously; returns its operation ID"""
+    extra = {"async": True, **_write_extra(tool, target, incident_id)}
+    if operation_callbacks:
+        extra["callback_url"] = operation_callbacks.url
+    try:
+        response = _post_gateway_write(tool, target, **extra)
+        data = response.json()
+        if response.status_code == 202:
+            return {
+                "operation_id": data['operation_id'],
+                "status": data['status'],
+                "vendor": data.get('vendor'),
+                "site_id": data.get('site_id')
+            }
+        if response.status_code == 200:
+            # Gateway ran it synchronously
+            return data.get('data', {})
+        return {
+            "error": data.get('error', f"Gateway returned status {response.status_code}"),
+            "circuit_open": data.get('circuit_open', False),
+            "retry_after_s": data.get('retry_after_s')
+        }
+    except Exception as e:
+        return {
+            "error": "Gateway request failed",
+            "details": str(e)
+        }
+
+def call_gateway_batch(tool: str, targets: List[str]) -> dict:
+    """Call the MCP Gateway with a list of targets in one request"""
+    try:
+        response = gateway_post(
+            GATEWAY_ENDPOINT,
+            json={
+                "tool": tool,
+                "targets": targets
+            },
+            headers=_gateway_headers(),
+            timeout=GATEWAY_TIMEOUT
+        )
+        data = response.json()
+        if response.status_code != 200:
+            return {"error": data.get('error', f"Gateway returned status {response.status_code}")}
+        return data
+    except Exception as e:
+        return {
+            "error": "Gateway request failed",
+            "details": str(e)
+        }
+
 def get_cell_kpis(cell_id: str) -> dict:
     """
     Retrieves Key Performance Indicators (KPIs) for a specific network cell.
@@ -119,7 +317,14 @@ def initiate_ntn_failover(site_id: str) -> dict:
     """
     print(f"⚠️  EXECUTING NTN FAILOVER for {site_id}...")
     
-    if USE_GATEWAY:
+    if USE_GATEWAY and ASYNC_OPERATIONS:
+        print(f"   → Submitting to MCP Gateway as an async operation...")
+        result = submit_gateway_operation("initiate_ntn_failover", site_id)
+        if 'operation_id' in result:
+            result['note'] = (f"Failover is running in the background. Investigate other sites, "
+                              f"then check it with get_operation_status({result['operation_id']}).")
+        return result
+    elif USE_GATEWAY:
         print(f"   → Calling MCP Gateway...")
         result = call_gateway("initiate_ntn_failover", site_id)
         return result
@@ -128,6 +333,237 @@ def initiate_ntn_failover(site_id: str) -> dict:
         time.sleep(1)
         return {"status": "SUCCESS", "new_active_link": "DUB-07-NTN"}
 
+def get_operation_status(operation_id: str) -> dict:
+    """
+    Returns the state of an async operation (PENDING, RUNNING, SUCCEEDED,
+    FAILED) and, once finished, its result.
+    """
+    operation_id = operation_id.strip()
+    print(f"⏱️  Checking operation {operation_id}...")
+    
+    if operation_callbacks:
+        completed = operation_callbacks.get(operation_id)
+        if completed:
+            return completed
+    if not USE_GATEWAY:
+        return {"error": "Gateway not configured"}
+    return call_gateway("get_operation_status", operation_id)
+
+def check_gateway_health(vendor: str) -> dict:
+    """
+    Returns circuit breaker state, error rate and latency percentiles per vendor adapter.
+    Pass a vendor name (Nokia, Ericsson, Cisco) or 'all'.
+    """
+    print(f"🩺 Checking gateway health for {vendor}...")
+    
+    if not USE_GATEWAY:
+        return {"status": "UNKNOWN", "error": "Gateway not configured"}
+    
+    health = call_gateway("get_gateway_health", vendor)
+    if vendor.lower() != 'all' and vendor in health:
+        return {vendor: health[vendor]}
+    return health
+
+def get_kpi_history(query: str) -> dict:
+    """
+    Returns min/max/mean/p50/p95 and change for every KPI recorded for an
+    element over a recent window. No network call is made.
+    Accepts 'ELEMENT_ID' or 'ELEMENT_ID, minutes' (default 15 minutes).
+    """
+    parts = [part.strip() for part in query.split(',')]
+    element_id = parts[0]
+    minutes = float(parts[1]) if len(parts) > 1 and parts[1] else 15
+    
+    print(f"📈 Reading {minutes:g} min of history for {element_id}...")
+    
+    summary = KPI_HISTORY.summary(element_id, minutes=minutes)
+    if not summary['samples']:
+        summary['note'] = "No samples recorded yet. Query the element with get_cell_kpis or measure_link_latency first."
+    return summary
+
+def _resolve_sites(query: str) -> List[str]:
+    """Expand 'DUB-07, LON-15' or a region prefix such as 'DUB' into site IDs"""
+    sites = []
+    for item in (part.strip().upper() for part in query.split(',')):
+        if not item:
+            continue
+        if item in ('ALL', '*'):
+            sites.extend(SITE_LINKS)
+        elif '-' in item:
+            sites.append(SITE_INDEX.site_of(item))
+        else:
+            sites.extend(site for site in SITE_LINKS if site.startswith(item))
+    return list(dict.fromkeys(sites))
+
+def scan_sites(query: str) -> dict:
+    """
+    Sweeps KPIs and backhaul latency for many sites at once and returns only
+    what looks wrong, ranked by severity. Result size is bounded regardless
+    of how many sites are scanned.
+    """
+    sites = _resolve_sites(query)
+    print(f"🛰️  Scanning {len(sites)} sites: {', '.join(sites)}...")
+    
+    if not sites:
+        return {"error": f"No known sites match '{query}'", "known_sites": list(SITE_LINKS)}
+    if not USE_GATEWAY:
+        return {"error": "Gateway not configured"}
+    
+    links = [link for site in sites for link in SITE_LINKS.get(site, [f'{site}-FIBER'])]
+    
+    # One bulk KPI request plus one latency request per link, all in flight together
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as pool:
+        kpi_future = pool.submit(in_scope(call_gateway_batch), "get_cell_kpis", sites)
+        latency_futures = {
+            link: pool.submit(in_scope(call_gateway), "measure_link_latency", link) for link in links
+        }
+        kpi_response = kpi_future.result()
+        latency_results = {link: future.result() for link, future in latency_futures.items()}
+    
+    batch = KpiBatch.from_dict(kpi_response.get('normalized', {}))
+    KPI_HISTORY.record_batch(batch)
+    errors = dict(kpi_response.get('errors', {}))
+    if 'error' in kpi_response:
+        errors['get_cell_kpis'] = kpi_response['error']
+    for vendor, vendor_batch in kpi_response.get('batches', {}).items():
+        if 'error' in vendor_batch:
+            for target in vendor_batch.get('targets', []):
+                errors[target] = vendor_batch['error']
+    
+    # Adapter payloads carry their vendor, so they can be normalized here;
+    # call_gateway has already recorded them into KPI_HISTORY
+    for link, result in latency_results.items():
+        if 'error' in result:
+            errors[link] = result['error']
+            continue
+        if result.get('vendor') in VENDORS:
+            batch.append(result['vendor'], normalize_record(result['vendor'], result))
+    
+    findings = []
+    if len(batch):
+        scored = FLEET_DETECTOR.observe_batch(batch)
+        anomalies = {a['element_id']: a for a in FLEET_DETECTOR.anomalies(scored)}
+        for i, element_id in enumerate(batch.element_ids):
+            health = batch.health(i)
+            anomaly = anomalies.get(element_id)
+            if anomaly is None and health == 'OK':
+                continue
+            finding = {
+                'site_id': SITE_INDEX.site_of(element_id),
+                'element_id': element_id,
+                'vendor': batch.vendor(i),
+                'health': health,
+                'severity': round((anomaly['score'] if anomaly else 0.0) +
+                                  (2.0 if health == 'DOWN' else 1.0 if health == 'DEGRADED' else 0.0), 2)
+            }
+            if anomaly:
+                finding.update({
+                    'metric': anomaly['metric'],
+                    'value': anomaly['value'],
+                    'unit': anomaly['unit'],
+                    'baseline': anomaly['baseline']
+                })
+            findings.append(finding)
+    
+    findings.sort(key=lambda finding: -finding['severity'])
+    flagged_sites = {finding['site_id'] for finding in findings}
+    # Errors are keyed by cell / link; a site with any failed measurement isn't healthy
+    if 'get_cell_kpis' in errors:
+        flagged_sites.update(sites)
+    flagged_sites.update(SITE_INDEX.site_of(key) for key in errors)
+    
+    return {
+        "sites_scanned": len(sites),
+        "elements_scanned": len(batch),
+        "healthy_sites": [site for site in sites if site not in flagged_sites],
+        "findings": findings[:SCAN_MAX_FINDINGS],
+        "findings_truncated": max(0, len(findings) - SCAN_MAX_FINDINGS),
+        "errors": dict(list(errors.items())[:SCAN_MAX_FINDINGS])
+    }
+
+def get_blast_radius(element_id: str) -> dict:
+    """
+    Returns the sites that lose their primary path if an element (link,
+    aggregation node, core router) fails, split into those protected by a
+    backup path and those left isolated. Answered from the local topology.
+    """
+    print(f"🕸️  Computing blast radius of {element_id}...")
+    
+    if not TOPOLOGY:
+        return {"error": "No topology loaded"}
+    return TOPOLOGY.blast_radius(element_id)
+
+def get_site_dependencies(query: str) -> dict:
+    """
+    Returns a site's cells, links, backup paths and upstream elements.
+    Pass two comma-separated site or link IDs to get their shared-fate
+    upstream elements instead.
+    """
+    parts = [part.strip() for part in query.split(',') if part.strip()]
+    print(f"🕸️  Looking up dependencies for {', '.join(parts)}...")
+    
+    if not TOPOLOGY:
+        return {"error": "No topology loaded"}
+    if len(parts) >= 2:
+        return {
+            "elements": parts[:2],
+            "shared_upstream": TOPOLOGY.shared_fate(parts[0], parts[1])
+        }
+    return TOPOLOGY.site_dependencies(TOPOLOGY.site_of(parts[0]))
+
+def _failover_orchestrator() -> FailoverOrchestrator:
+    return FailoverOrchestrator(in_scope(call_gateway), TOPOLOGY,
+                                submit=in_scope(submit_gateway_operation),
+                                concurrency=FAILOVER_CONCURRENCY,
+                                vendor_stagger_s=FAILOVER_STAGGER_S)
+
+def plan_bulk_failover(query: str) -> dict:
+    """
+    Plans an NTN failover for many sites (IDs or a region prefix) and
+    returns a batch ID for approval. Nothing is changed on the network.
+    """
+    sites = _resolve_sites(query)
+    print(f"🗺️  Planning bulk failover for {len(sites)} sites...")
+    
+    if not sites:
+        return {"error": f"No known sites match '{query}'", "known_sites": list(SITE_LINKS)}
+    
+    plan = _failover_orchestrator().plan(sites)
+    PENDING_FAILOVERS[plan['batch_id']] = plan
+    plan['next_step'] = f"Ask for human approval, then call execute_bulk_failover({plan['batch_id']})"
+    return plan
+
+def execute_bulk_failover(batch_id: str) -> dict:
+    """
+    Executes an approved bulk failover plan: concurrency-limited, staggered
+    per vendor, each site verified on its backup link.
+    This is a SERVICE-IMPACTING change.
+    """
+    if not USE_GATEWAY:
+        # Nothing can run; leave the approved plan pending
+        return {"error": "Gateway not configured"}
+    
+    plan = PENDING_FAILOVERS.pop(batch_id.strip(), None)
+    if plan is None:
+        return {"error": f"No pending failover plan '{batch_id}'. Call plan_bulk_failover first."}
+    
+    print(f"⚠️  EXECUTING BULK FAILOVER {batch_id} for {len(plan['sites'])} sites...")
+    
+    # Worker threads don't see this thread's incident; pass it explicitly
+    incident_id = getattr(INCIDENT_CONTEXT, 'incident_id', None) or batch_id
+    orchestrator = _failover_orchestrator()
+    orchestrator.call = in_scope(
+        lambda tool, target: call_gateway(tool, target, incident_id=incident_id))
+    orchestrator.submit = in_scope(
+        lambda tool, target: submit_gateway_operation(tool, target, incident_id=incident_id))
+    return orchestrator.execute(plan)
+
+def get_hedging_report() -> dict:
+    """Per-tool p50/p95/p99 with and without hedging"""
+    if not hedger:
+        return {"hedging": "disabled"}
+    return hedger.report()
+
 # --- Tool Registry ---
 
 TOOLS = [
@@ -148,6 +584,54 @@ TOOLS = [
         description="Initiates a traffic failover to the Non-Terrestrial Network (NTN) backup via MCP Gateway. This is a SERVICE-IMPACTING change and requires human approval.",
         function=initiate_ntn_failover,
         parameters={"site_id": "The site ID to failover (e.g., 'DUB-07')"}
+    ),
+    Tool(
+        name="get_operation_status",
+        description="Returns the status (PENDING, RUNNING, SUCCEEDED, FAILED) and result of an async operation such as a failover submitted by initiate_ntn_failover. Investigate other sites while it runs instead of checking repeatedly.",
+        function=get_operation_status,
+        parameters={"operation_id": "The operation_id returned when the change was submitted (e.g., 'op-1a2b3c4d5e6f')"}
+    ),
+    Tool(
+        name="check_gateway_health",
+        description="Returns the circuit breaker state (CLOSED, OPEN, HALF_OPEN), error rate and latency percentiles for each vendor adapter. Use this when a tool reports circuit_open or degraded data.",
+        function=check_gateway_health,
+        parameters={"vendor": "Vendor name ('Nokia', 'Ericsson', 'Cisco') or 'all'"}
+    ),
+    Tool(
+        name="get_kpi_history",
+        description="Returns recent trend statistics (last, min, max, mean, p50, p95, change) for a cell or link from AURA's local sample history. Cheap: no network call. Use it to see trends instead of re-querying.",
+        function=get_kpi_history,
+        parameters={"query": "Element ID, optionally with a window in minutes (e.g., 'DUB-07-FIBER' or 'DUB-07-FIBER, 30')"}
+    ),
+    Tool(
+        name="scan_sites",
+        description="Checks KPIs and backhaul latency for several sites in parallel in one call and returns only the anomalies, ranked by severity. Use this first when more than one site is reported.",
+        function=scan_sites,
+        parameters={"sites": "Comma-separated site IDs or a region prefix (e.g., 'DUB-07, LON-15, PAR-03', 'DUB' or 'ALL')"}
+    ),
+    Tool(
+        name="get_blast_radius",
+        description="Returns which sites and cells are affected if a link or upstream element fails, and which of them are protected by a backup path. Use this to find a common root cause across sites.",
+        function=get_blast_radius,
+        parameters={"element_id": "Link or upstream element ID (e.g., 'DUB-07-FIBER', 'EU-CORE-1')"}
+    ),
+    Tool(
+        name="get_site_dependencies",
+        description="Returns a site's cells, backhaul links, backup paths and upstream elements. With two comma-separated IDs, returns the upstream elements they share (shared fate).",
+        function=get_site_dependencies,
+        parameters={"query": "A site ID (e.g., 'DUB-07') or two IDs (e.g., 'DUB-07, LON-15')"}
+    ),
+    Tool(
+        name="plan_bulk_failover",
+        description="Plans an NTN/backup-path failover for many sites at once and returns a batch_id with each site's vendor and backup link. Makes no network change. Use this instead of repeated initiate_ntn_failover calls when several sites need failing over.",
+        function=plan_bulk_failover,
+        parameters={"sites": "Comma-separated site IDs or a region prefix (e.g., 'DUB-07, LON-15' or 'DUB')"}
+    ),
+    Tool(
+        name="execute_bulk_failover",
+        description="Executes a planned bulk failover and verifies every site on its backup link, returning one outcome per site. This is a SERVICE-IMPACTING change and requires human approval of the whole batch.",
+        function=execute_bulk_failover,
+        parameters={"batch_id": "The batch_id returned by plan_bulk_failover (e.g., 'FO-1a2b3c4d')"}
     )
 ]
 
@@ -163,6 +647,8 @@ class AURAAgent:
     def __init__(self, model_id: str = CLAUDE_MODEL):
         self.model_id = model_id
         self.conversation_history: List[Dict] = []
+        # One conversation is one incident; scopes idempotency keys of write tools
+        self.incident_id = f"conv-{uuid.uuid4().hex[:12]}"
         self.system_prompt = """You are AURA, an autonomous network operations agent for multi-vendor telecommunications networks. Your goal is to diagnose and resolve network faults across Nokia, Ericsson, and Cisco infrastructure.
 
 Your workflow:
@@ -177,6 +663,14 @@ Available tools (all route through MCP Gateway to vendor-specific adapters):
 - get_cell_kpis: Check cell site health (supports DUB-07 [Nokia], LON-15 [Ericsson], PAR-03 [Cisco])
 - measure_link_latency: Measure backhaul link performance
 - initiate_ntn_failover: Execute failover (REQUIRES APPROVAL)
+- check_gateway_health: Circuit breaker state per vendor adapter
+- get_kpi_history: Trend statistics from previously collected samples (no network call)
+- scan_sites: Triage several sites in one call; returns only anomalies ranked by severity
+- get_blast_radius / get_site_dependencies: Topology lookups (no network call)
+- get_operation_status: Progress of a failover that returned an operation_id
+- plan_bulk_failover / execute_bulk_failover: Fail over many sites in one approved batch (execute REQUIRES APPROVAL)
+
+If a tool result contains "circuit_open": true, that vendor's adapter is down. Do not call it again until retry_after_s has passed; continue with other sites and report the outage. Results marked "degraded": true are cached and may be stale.
 
 When you need to use a tool, respond with:
 TOOL_CALL: tool_name(parameter_value)
@@ -208,11 +702,17 @@ Always explain your reasoning before and after tool calls."""
         """Execute a tool by name"""
         for tool in TOOLS:
             if tool.name == tool_name:
+                started = time.monotonic()
                 try:
                     result = tool.function(param)
-                    return {"success": True, "result": result}
                 except Exception as e:
+                    log.warning('tool.failed', tool=tool_name, param=param, error=str(e),
+                                ms=round((time.monotonic() - started) * 1000, 1))
                     return {"success": False, "error": str(e)}
+                log.info('tool.call', tool=tool_name, param=param,
+                         ms=round((time.monotonic() - started) * 1000, 1))
+                return {"success": True, "result": result}
+        log.warning('tool.unknown', tool=tool_name)
         return {"success": False, "error": f"Tool '{tool_name}' not found"}
     
     def _call_claude_with_retry(self, messages: List[Dict]) -> str:
@@ -226,12 +726,18 @@ Always explain your reasoning before and after tool calls."""
                     "messages": messages
                 }
                 
+                started = time.monotonic()
                 response = bedrock_runtime.invoke_model(
                     modelId=self.model_id,
                     body=json.dumps(request_body)
                 )
                 
                 response_body = json.loads(response['body'].read())
+                usage = response_body.get('usage', {})
+                log.info('llm.call', attempt=attempt + 1,
+                         ms=round((time.monotonic() - started) * 1000, 1),
+                         input_tokens=usage.get('input_tokens'),
+                         output_tokens=usage.get('output_tokens'))
                 time.sleep(INTER_CALL_DELAY)
                 
                 return response_body['content'][0]['text']
@@ -243,19 +749,33 @@ Always explain your reasoning before and after tool calls."""
                     if attempt < MAX_RETRIES - 1:
                         wait_time = RETRY_DELAY * (2 ** attempt)
                         print(f"⏳ Rate limited. Waiting {wait_time}s before retry {attempt + 1}/{MAX_RETRIES}...")
+                        log.info('llm.throttled', attempt=attempt + 1, wait_s=wait_time)
                         time.sleep(wait_time)
                     else:
+                        log.error('llm.throttled', attempt=attempt + 1, retries_exhausted=True)
                         return f"Error: Rate limit exceeded after {MAX_RETRIES} retries. Please wait a moment and try again."
                 else:
+                    log.error('llm.error', code=error_code, error=str(e))
                     return f"AWS Error ({error_code}): {str(e)}"
                     
             except Exception as e:
+                log.exception('llm.error')
                 return f"Error calling Claude: {str(e)}"
         
         return "Error: Maximum retries exceeded"
     
     def process_message(self, user_message: str, max_iterations: int = 5) -> str:
         """Process a user message with tool calling loop"""
+        # One scope per message; the incident ID is the correlation ID
+        with log.request(self.incident_id) as scope:
+            response = self._reasoning_loop(user_message, max_iterations)
+            outcome = outcome_of(response)
+            scope.set(outcome=outcome)
+            scope.failed = outcome == 'error'
+            return response
+    
+    def _reasoning_loop(self, user_message: str, max_iterations: int) -> str:
+        INCIDENT_CONTEXT.incident_id = self.incident_id
         self.conversation_history.append({
             "role": "user",
             "content": user_message
@@ -304,6 +824,7 @@ Always explain your reasoning before and after tool calls."""
     def reset(self):
         """Reset conversation history"""
         self.conversation_history = []
+        self.incident_id = f"conv-{uuid.uuid4().hex[:12]}"
 
 
 # --- Interactive Mode ---
@@ -326,6 +847,7 @@ def interactive_mode():
     print("\nCommands:")
     print("  - Type your message to interact with AURA")
     print("  - Type 'reset' to clear conversation history")
+    print("  - Type 'latency' to show gateway tail latency (hedging report)")
     print("  - Type 'quit' to exit")
     print("=" * 70)
     
@@ -358,6 +880,10 @@ def interactive_mode():
             print("🔄 Conversation history cleared.")
             continue
         
+        if user_input.lower() == 'latency':
+            print(json.dumps(get_hedging_report(), indent=2))
+            continue
+        
         # Check if user entered a scenario number
         if user_input in scenarios:
             user_input = scenarios[user_input]
@@ -371,7 +897,7 @@ def interactive_mode():
             
             # Automatic delay to avoid rate limiting
             print("⏳ Waiting 5 seconds to avoid rate limits...")
-            time.sleep(5)
+            time.sleep(pacing_delay(5, bedrock_runtime))
             
         except KeyboardInterrupt:
             print("\n\n⚠️  Interrupted by user")
@@ -1,7 +1,13 @@
 import logging
 from datetime import datetime
 import json
+import time
+
+import aura_agent
 from aura_agent import AURAAgent
+from aura_metrics import (AgentMetrics, MetricsRegistry, install_agent_metrics,
+                          outcome_of, start_exporters)
+from aura_topology import load_topology
 
 # Set up logging
 logging.basicConfig(
@@ -13,6 +19,27 @@ logging.basicConfig(
     ]
 )
 
+# Latency histograms are process-wide and shared by every agent instance;
+# AURA_METRICS_PORT serves them as Prometheus text, AURA_METRICS_SNAPSHOT
+# writes them to a JSON file (see aura_metrics.py)
+METRICS_REGISTRY = MetricsRegistry()
+AGENT_METRICS = AgentMetrics(METRICS_REGISTRY)
+install_agent_metrics(aura_agent, AGENT_METRICS)
+METRICS_EXPORTERS = start_exporters(METRICS_REGISTRY)
+
+# Vendor label for tool latency when the tool result doesn't name one
+TOPOLOGY = load_topology()
+
+REMEDIATION_TOOLS = {"initiate_ntn_failover"}
+
+def vendor_of(param: str, result: dict) -> str:
+    data = result.get("result")
+    if isinstance(data, dict) and data.get("vendor"):
+        return data["vendor"]
+    if TOPOLOGY:
+        return TOPOLOGY.vendor_of(param) or "unknown"
+    return "unknown"
+
 class AURAAgentWithLogging(AURAAgent):
     """Enhanced AURA agent with logging and metrics"""
     
@@ -25,18 +52,25 @@ class AURAAgentWithLogging(AURAAgent):
             "remediations_executed": 0,
             "start_time": datetime.now()
         }
+        self.iterations = 0
     
     def process_message(self, user_message: str, max_iterations: int = 5) -> str:
         """Process message with logging"""
         self.metrics["total_interactions"] += 1
+        self.iterations = 0
+        started = time.perf_counter()
         
         logging.info(f"Processing user message: {user_message[:100]}...")
         
         response = super().process_message(user_message, max_iterations)
         
+        AGENT_METRICS.incident(self.iterations, time.perf_counter() - started,
+                               outcome_of(response))
+        
         # Track if approval was requested
         if "APPROVAL" in response or "approve" in response.lower():
             self.metrics["approvals_requested"] += 1
+            AGENT_METRICS.approvals.child().inc()
         
         logging.info(f"Response generated: {len(response)} characters")
         
@@ -45,19 +79,24 @@ class AURAAgentWithLogging(AURAAgent):
     def _execute_tool(self, tool_name: str, param: str) -> dict:
         """Execute tool with logging"""
         self.metrics["tool_calls"] += 1
+        self.iterations += 1
         logging.info(f"Executing tool: {tool_name}({param})")
         
+        started = time.perf_counter()
         result = super()._execute_tool(tool_name, param)
+        AGENT_METRICS.tool_call(tool_name, vendor_of(param, result),
+                                time.perf_counter() - started, result.get("success", False))
         
-        if tool_name == "initiate_ntn_failover" and result.get("success"):
+        if tool_name in REMEDIATION_TOOLS and result.get("success"):
             self.metrics["remediations_executed"] += 1
+            AGENT_METRICS.remediations.child(tool=tool_name).inc()
         
         logging.info(f"Tool result: {result}")
         
         return result
     
     def get_metrics(self) -> dict:
-        """Get current metrics"""
+        """Get current metrics, with the process-wide latency histograms"""
         runtime = (datetime.now() - self.metrics["start_time"]).total_seconds()
         self.metrics["runtime_seconds"] = runtime
-        return self.metrics
\ No newline at end of file
+        return dict(self.metrics, histograms=AGENT_METRICS.summary())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-target vs bulk KPI retrieval in the vendor adapters
+Invokes the adapter handlers locally and compares per-cell latency
+"""
+
+import argparse
+import io
+import json
+import time
+from contextlib import redirect_stdout
+
+import lambda_nokia_adapter
+import lambda_ericsson_adapter
+import lambda_cisco_adapter
+
+ADAPTERS = [
+    ('Nokia', lambda_nokia_adapter, 'DUB-07'),
+    ('Ericsson', lambda_ericsson_adapter, 'LON-15'),
+    ('Cisco', lambda_cisco_adapter, 'PAR-03'),
+]
+
+def invoke(handler, event) -> dict:
+    """Call an adapter handler with its per-request logging silenced"""
+    with redirect_stdout(io.StringIO()):
+        return handler(event, None)
+
+def benchmark_single(handler, targets: list) -> float:
+    """One adapter invocation per cell; returns total seconds"""
+    started = time.perf_counter()
+    for target in targets:
+        invoke(handler, {'tool': 'get_kpis', 'target': target})
+    return time.perf_counter() - started
+
+def benchmark_bulk(handler, targets: list, batch_size: int) -> float:
+    """One adapter invocation per batch; returns total seconds"""
+    started = time.perf_counter()
+    for i in range(0, len(targets), batch_size):
+        response = invoke(handler, {
+            'tool': 'get_kpis',
+            'targets': targets[i:i + batch_size]
+        })
+        batch = json.loads(response['body'])
+        assert batch['count'] == len(targets[i:i + batch_size])
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cells', type=int, default=500,
+                        help='Cells in the swept cluster')
+    parser.add_argument('--single-sample', type=int, default=20,
+                        help='Cells timed in single-target mode (each costs ~0.2s)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("AURA Adapter Benchmark - Single vs Bulk KPI Retrieval")
+    print("=" * 70)
+    print(f"Cells: {args.cells} | Batch size: {args.batch_size} | "
+          f"Single-mode sample: {args.single_sample}\n")
+
+    results = {}
+    for vendor, adapter, site in ADAPTERS:
+        targets = [f'{site}-C{i:03d}' for i in range(args.cells)]
+        sample = targets[:args.single_sample]
+
+        single_s = benchmark_single(adapter.lambda_handler, sample)
+        bulk_s = benchmark_bulk(adapter.lambda_handler, targets, args.batch_size)
+
+        single_per_cell_ms = single_s / len(sample) * 1000
+        bulk_per_cell_ms = bulk_s / len(targets) * 1000
+        results[vendor] = {
+            'cells': len(targets),
+            'single_per_cell_ms': round(single_per_cell_ms, 3),
+            'bulk_per_cell_ms': round(bulk_per_cell_ms, 3),
+            'single_sweep_estimate_s': round(single_per_cell_ms * len(targets) / 1000, 2),
+            'bulk_sweep_s': round(bulk_s, 3),
+            'speedup': round(single_per_cell_ms / bulk_per_cell_ms, 1)
+        }
+
+        print(f"{vendor:<10} single: {single_per_cell_ms:8.2f} ms/cell   "
+              f"bulk: {bulk_per_cell_ms:6.2f} ms/cell   "
+              f"speedup: {results[vendor]['speedup']}x")
+
+    print("\n" + "=" * 70)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
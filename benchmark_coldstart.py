@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Lambda cold start of the router and vendor adapters
+Builds each handler zip from the same file lists as deploy_mcp_gateway.sh,
+unpacks it into an empty directory and starts a fresh interpreter per
+sample, so every measurement is a true cold start. No bytecode cache is
+written, just as in a freshly deployed zip. Per handler it reports:
+
+    import_ms        loading the handler module (Lambda's init phase)
+    first_invoke_ms  first request, including lazily created clients
+    cold_start_ms    import_ms + first_invoke_ms
+    warm_p50_ms      median of the following warm requests
+
+A handler fails when cold_start_ms exceeds its budget. The network is
+never used: the router's Lambda client is created for real, but its
+invoke is answered with a canned adapter response. The adapters'
+simulated vendor API delay is switched off, so only handler cost is
+measured.
+
+Usage:
+    python3 benchmark_coldstart.py --samples 5 --output coldstart.json
+    python3 benchmark_coldstart.py --from-zips     # measure the committed zips
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+# Same contents as deploy_mcp_gateway.sh
+PACKAGES = {
+    'AURA-Nokia-Adapter': {
+        'zip': 'nokia_adapter.zip',
+        'files': ['lambda_nokia_adapter.py', 'aura_logging.py'],
+        'module': 'lambda_nokia_adapter',
+        'event': {'tool': 'get_kpis', 'target': 'DUB-07', 'params': {}},
+        'budget_ms': 50
+    },
+    'AURA-Ericsson-Adapter': {
+        'zip': 'ericsson_adapter.zip',
+        'files': ['lambda_ericsson_adapter.py', 'aura_logging.py'],
+        'module': 'lambda_ericsson_adapter',
+        'event': {'tool': 'get_kpis', 'target': 'LON-15', 'params': {}},
+        'budget_ms': 50
+    },
+    'AURA-Cisco-Adapter': {
+        'zip': 'cisco_adapter.zip',
+        'files': ['lambda_cisco_adapter.py', 'aura_logging.py'],
+        'module': 'lambda_cisco_adapter',
+        'event': {'tool': 'get_kpis', 'target': 'PAR-03', 'params': {}},
+        'budget_ms': 50
+    },
+    'AURA-Gateway-Router': {
+        'zip': 'gateway_router.zip',
+        'files': ['lambda_gateway_router.py', 'aura_circuit_breaker.py', 'aura_kpi_schema.py',
+                  'aura_logging.py', 'aura_operations.py', 'aura_topology.py', 'topology.json'],
+        'module': 'lambda_gateway_router',
+        'event': {'httpMethod': 'POST', 'path': '/prod/tools', 'headers': {},
+                  'body': json.dumps({'tool': 'get_cell_kpis', 'target': 'DUB-07'})},
+        'budget_ms': 300
+    },
+}
+
+# Runs inside the unpacked zip, in a fresh interpreter
+PROBE = r'''
+import io, json, sys, time
+started = time.perf_counter()
+import importlib
+module = importlib.import_module(sys.argv[1])
+import_ms = (time.perf_counter() - started) * 1000
+event = json.loads(sys.argv[2])
+warm = int(sys.argv[3])
+
+class Context:
+    function_name = sys.argv[1]
+    aws_request_id = 'coldstart'
+    def get_remaining_time_in_millis(self):
+        return 30000
+
+canned = json.dumps({'statusCode': 200, 'body': json.dumps(
+    {'vendor': 'Nokia', 'cell_id': 'DUB-07', 'status': 'HEALTHY'})}).encode()
+
+def invoke(**kwargs):
+    return {'StatusCode': 200, 'Payload': io.BytesIO(canned)}
+
+started = time.perf_counter()
+client_ms = 0.0
+if hasattr(module, 'adapter_client'):
+    # Real client construction, canned network answer
+    module.adapter_client().invoke = invoke
+    client_ms = (time.perf_counter() - started) * 1000
+response = module.lambda_handler(event, Context())
+first_invoke_ms = (time.perf_counter() - started) * 1000
+
+samples = []
+for _ in range(warm):
+    t = time.perf_counter()
+    module.lambda_handler(event, Context())
+    samples.append((time.perf_counter() - t) * 1000)
+
+print(json.dumps({'import_ms': import_ms, 'client_ms': client_ms,
+                  'first_invoke_ms': first_invoke_ms, 'warm_ms': samples,
+                  'status': response.get('statusCode')}))
+'''
+
+
+def build_zip(package: dict, workdir: str, from_zips: bool) -> str:
+    if from_zips:
+        return package['zip']
+    path = os.path.join(workdir, package['zip'])
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for filename in package['files']:
+            zf.write(filename)
+    return path
+
+
+def sample(zip_path: str, package: dict, warm: int) -> dict:
+    """One cold start of a handler in a fresh interpreter"""
+    with tempfile.TemporaryDirectory() as unpacked:
+        with zipfile.ZipFile(zip_path) as zf:
+            zf.extractall(unpacked)
+        env = {
+            'PATH': os.environ.get('PATH', ''),
+            'PYTHONDONTWRITEBYTECODE': '1',
+            'AWS_DEFAULT_REGION': 'us-east-1',
+            'AWS_REGION': 'us-east-1',
+            'AURA_ADAPTER_API_DELAY_S': '0'
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE, package['module'], json.dumps(package['event']), str(warm)],
+            cwd=unpacked, env=env, capture_output=True, text=True, timeout=120
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"{package['module']} failed to start:\n{result.stderr[-2000:]}")
+    # Handlers log to stdout; the probe's report is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(name: str, package: dict, zip_path: str, samples: int, warm: int) -> dict:
+    runs = [sample(zip_path, package, warm) for _ in range(samples)]
+    import_ms = statistics.median(r['import_ms'] for r in runs)
+    first_ms = statistics.median(r['first_invoke_ms'] for r in runs)
+    warm_ms = sorted(ms for r in runs for ms in r['warm_ms'])
+    cold_ms = import_ms + first_ms
+    return {
+        'zip_kb': round(os.path.getsize(zip_path) / 1024, 1),
+        'import_ms': round(import_ms, 1),
+        'client_ms': round(statistics.median(r['client_ms'] for r in runs), 1),
+        'first_invoke_ms': round(first_ms, 1),
+        'cold_start_ms': round(cold_ms, 1),
+        'warm_p50_ms': round(statistics.median(warm_ms), 3) if warm_ms else None,
+        'status': runs[-1]['status'],
+        'budget_ms': package['budget_ms'],
+        'within_budget': cold_ms <= package['budget_ms']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Lambda handler cold starts")
+    parser.add_argument('--samples', type=int, default=5, help='Cold starts per handler (median reported)')
+    parser.add_argument('--warm', type=int, default=20, help='Warm invocations after each cold start')
+    parser.add_argument('--from-zips', action='store_true', help='Use the zips on disk instead of building them')
+    parser.add_argument('--handler', action='append', choices=list(PACKAGES), help='Only these handlers')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("AURA Lambda Cold Start Benchmark")
+    print("=" * 70)
+    print(f"{'HANDLER':<24} {'ZIP':>7} {'IMPORT':>9} {'1ST CALL':>9} {'COLD':>9} {'WARM P50':>9} {'BUDGET':>8}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.handler or PACKAGES:
+            package = PACKAGES[name]
+            zip_path = build_zip(package, workdir, args.from_zips)
+            r = results[name] = measure(name, package, zip_path, args.samples, args.warm)
+            mark = '✅' if r['within_budget'] else '❌'
+            print(f"{name:<24} {r['zip_kb']:>5.1f}KB {r['import_ms']:>7.1f}ms {r['first_invoke_ms']:>7.1f}ms "
+                  f"{r['cold_start_ms']:>7.1f}ms {r['warm_p50_ms']:>7.3f}ms {r['budget_ms']:>6}ms {mark}")
+
+    print("=" * 70)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    sys.exit(0 if all(r['within_budget'] for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the AURA agent loop over the test_scenarios.py scenarios
+Runs each scenario with a fresh AURAAgent and records, per scenario:
+
+    wall_s          end-to-end time of process_message()
+    llm_round_trips successful invoke_model calls (plus attempts/throttles)
+    llm_s           time inside invoke_model
+    tool_calls      tool executions, with time per tool
+    input/output    tokens reported by the model response
+    sleep_s         the agent's own rate-limit and backoff sleeps
+    work_s          wall_s - sleep_s
+
+--runtime mock uses the offline MockBedrockRuntime (AURA_BEDROCK_MOCK),
+--runtime real the account's Bedrock. Results are written as JSON tagged
+with the git commit, and --baseline prints the change against an
+earlier file so runs can be compared across commits.
+
+Usage:
+    python3 benchmark_scenarios.py --runtime mock --repeat 3
+    python3 benchmark_scenarios.py --runtime real --scenario "Fiber Failure"
+    python3 benchmark_scenarios.py --baseline scenario_benchmark_mock_3a53f1b.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from aura_metrics import outcome_of
+from aura_mock_bedrock import _Body
+
+# Metrics of the scenario running on the current thread
+CURRENT = threading.local()
+
+COUNTERS = ('llm_attempts', 'llm_round_trips', 'throttles', 'llm_s', 'tool_calls',
+            'tool_s', 'sleep_s', 'input_tokens', 'output_tokens')
+
+
+class ScenarioMeter:
+    """Counters for one scenario run; updated from the wrappers below"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.tools = {}
+        self.endpoints = {}
+        self.in_tool = False
+        self.started = None
+        self.wall_s = 0.0
+
+    def __enter__(self):
+        CURRENT.meter = self
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_s = time.perf_counter() - self.started
+        CURRENT.meter = None
+
+    def add(self, name: str, value):
+        self.counters[name] += value
+
+    def result(self) -> dict:
+        result = {name: round(value, 3) if isinstance(value, float) else value
+                  for name, value in self.counters.items()}
+        result['wall_s'] = round(self.wall_s, 3)
+        result['work_s'] = round(self.wall_s - self.counters['sleep_s'], 3)
+        result['tools'] = {tool: {'calls': calls, 'seconds': round(seconds, 3)}
+                           for tool, (calls, seconds) in sorted(self.tools.items())}
+        if self.endpoints:
+            result['endpoints'] = dict(sorted(self.endpoints.items()))
+        return result
+
+
+def current_meter():
+    return getattr(CURRENT, 'meter', None)
+
+
+class MeteredRuntime:
+    """Wraps a bedrock-runtime client and charges each call to the current meter"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def invoke_model(self, **kwargs) -> dict:
+        meter = current_meter()
+        started = time.perf_counter()
+        try:
+            response = self.client.invoke_model(**kwargs)
+        except ClientError as e:
+            if meter:
+                meter.add('llm_attempts', 1)
+                meter.add('llm_s', time.perf_counter() - started)
+                if e.response['Error']['Code'] == 'ThrottlingException':
+                    meter.add('throttles', 1)
+            raise
+        payload = response['body'].read()
+        response['body'] = _Body(payload)
+        if meter:
+            usage = json.loads(payload).get('usage', {})
+            meter.add('llm_attempts', 1)
+            meter.add('llm_round_trips', 1)
+            meter.add('llm_s', time.perf_counter() - started)
+            meter.add('input_tokens', usage.get('input_tokens', 0))
+            meter.add('output_tokens', usage.get('output_tokens', 0))
+            if 'servedBy' in response:
+                # Which region / profile answered, when running on a client pool
+                name = response['servedBy']['endpoint']
+                meter.endpoints[name] = meter.endpoints.get(name, 0) + 1
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class MeteredTime:
+    """
+    Stand-in for the agent module's `time`: sleeps outside a tool are
+    rate-limit pacing or backoff and are charged as sleep_s. Sleeps
+    inside a tool simulate the network call and count as tool time.
+    """
+
+    def __init__(self, module):
+        self.module = module
+
+    def sleep(self, seconds: float):
+        meter = current_meter()
+        started = time.perf_counter()
+        self.module.sleep(seconds)
+        if meter and not meter.in_tool:
+            meter.add('sleep_s', time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self.module, name)
+
+
+def metered_tool(name: str, function):
+    def wrapper(param):
+        meter = current_meter()
+        if meter is None:
+            return function(param)
+        meter.in_tool = True
+        started = time.perf_counter()
+        try:
+            return function(param)
+        finally:
+            elapsed = time.perf_counter() - started
+            meter.in_tool = False
+            meter.add('tool_calls', 1)
+            meter.add('tool_s', elapsed)
+            calls, seconds = meter.tools.get(name, (0, 0.0))
+            meter.tools[name] = (calls + 1, seconds + elapsed)
+    return wrapper
+
+
+def instrument(agent_module):
+    """Install the meters into an agent module (aura_agent or compatible)"""
+    if not isinstance(agent_module.bedrock_runtime, MeteredRuntime):
+        agent_module.bedrock_runtime = MeteredRuntime(agent_module.bedrock_runtime)
+        agent_module.time = MeteredTime(agent_module.time)
+        for tool in agent_module.TOOLS:
+            tool.function = metered_tool(tool.name, tool.function)
+
+
+def run_scenario(agent_module, name: str, prompt: str) -> dict:
+    agent = agent_module.AURAAgent()
+    with ScenarioMeter(name) as meter:
+        response = agent.process_message(prompt)
+    result = meter.result()
+    result['outcome'] = outcome_of(response)
+    result['response'] = response
+    return result
+
+
+def summarize(runs: list) -> dict:
+    """Median of every numeric metric across repeats"""
+    return {key: round(statistics.median(run[key] for run in runs), 3)
+            for key, value in runs[0].items() if isinstance(value, (int, float))}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_comparison(results: dict, baseline: dict):
+    metrics = ('wall_s', 'work_s', 'sleep_s', 'llm_round_trips', 'tool_calls', 'input_tokens')
+    print(f"\n{'SCENARIO':<18} " + ' '.join(f"{m:>18}" for m in metrics))
+    for name, entry in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        cells = []
+        for metric in metrics:
+            before, after = previous['median'].get(metric, 0), entry['median'][metric]
+            change = f"{(after - before) / before:+.0%}" if before else 'new'
+            cells.append(f"{after:>10g} ({change:>5})")
+        print(f"{name:<18} " + ' '.join(f"{c:>18}" for c in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AURA agent loop over the test scenarios")
+    parser.add_argument('--runtime', choices=['mock', 'real'], default='mock',
+                        help='Offline mock runtime or the real Bedrock endpoint')
+    parser.add_argument('--mock-config', help='JSON config for the mock runtime')
+    parser.add_argument('--scenario', action='append', help='Run only this scenario (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per scenario (median is reported)')
+    parser.add_argument('--verbose', action='store_true', help="Keep the agent's own output")
+    parser.add_argument('--output', help='Results file (default scenario_benchmark_<runtime>_<commit>.json)')
+    parser.add_argument('--baseline', help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    # The agent module picks its runtime at import time
+    if args.runtime == 'mock':
+        os.environ['AURA_BEDROCK_MOCK'] = args.mock_config or '1'
+    else:
+        os.environ.pop('AURA_BEDROCK_MOCK', None)
+    import aura_agent
+    from aura_mock_bedrock import pacing_delay
+    from test_scenarios import SCENARIOS
+
+    selected = args.scenario or list(SCENARIOS)
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    runtime = aura_agent.bedrock_runtime
+    instrument(aura_agent)
+    if not args.verbose:
+        aura_agent.print = lambda *a, **k: None
+
+    commit = git_commit()
+    print("=" * 70)
+    print("AURA Agent Benchmark - Test Scenarios")
+    print("=" * 70)
+    print(f"Runtime: {args.runtime} | Commit: {commit} | Repeats: {args.repeat}\n")
+
+    results = {
+        'commit': commit,
+        'runtime': args.runtime,
+        'model': aura_agent.CLAUDE_MODEL,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'scenarios': {}
+    }
+    suite_started = time.perf_counter()
+    for i, name in enumerate(selected):
+        runs = []
+        for _ in range(args.repeat):
+            runs.append(run_scenario(aura_agent, name, SCENARIOS[name]))
+        median = summarize(runs)
+        results['scenarios'][name] = {'median': median, 'runs': runs}
+        print(f"{name:<16} wall {median['wall_s']:7.2f}s  sleep {median['sleep_s']:6.2f}s  "
+              f"LLM {median['llm_round_trips']:3g}x  tools {median['tool_calls']:3g}  "
+              f"tokens {median['input_tokens']:g}/{median['output_tokens']:g}  "
+              f"[{runs[-1]['outcome']}]")
+        if i < len(selected) - 1:
+            # Same pause between scenarios as test_scenarios.py
+            time.sleep(pacing_delay(10, runtime))
+    results['suite_wall_s'] = round(time.perf_counter() - suite_started, 3)
+    if hasattr(runtime, 'stats'):
+        results['mock_stats'] = runtime.stats()
+
+    output = args.output or f"scenario_benchmark_{args.runtime}_{commit}.json"
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSuite wall time: {results['suite_wall_s']:.2f}s")
+    print(f"💾 Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
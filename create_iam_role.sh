@@ -28,7 +28,7 @@ aws iam attach-role-policy \
     --role-name AURA-Lambda-Execution-Role \
     --policy-arn arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole
 
-# Create policy for Lambda to invoke other Lambdas
+# Create policy for Lambda to invoke other Lambdas and track async operations
 cat > lambda-invoke-policy.json << EOF
 {
   "Version": "2012-10-17",
@@ -39,6 +39,15 @@ cat > lambda-invoke-policy.json << EOF
         "lambda:InvokeFunction"
       ],
       "Resource": "*"
+    },
+    {
+      "Effect": "Allow",
+      "Action": [
+        "dynamodb:GetItem",
+        "dynamodb:PutItem",
+        "dynamodb:DeleteItem"
+      ],
+      "Resource": "arn:aws:dynamodb:*:*:table/AURA-Operations"
     }
   ]
 }
@@ -19,12 +19,18 @@ ROLE_ARN="arn:aws:iam::${ACCOUNT_ID}:role/AURA-Lambda-Execution-Role"
 echo "🔐 Using IAM Role: $ROLE_ARN"
 echo ""
 
+# Async failovers run inside the router for up to OPERATION_TIMEOUT_S,
+# waiting on the adapter; both need a Lambda timeout above it
+OPERATION_TIMEOUT_S=840
+LONG_TIMEOUT=900
+
 # Function to create or update Lambda
 deploy_lambda() {
     local FUNCTION_NAME=$1
     local HANDLER=$2
     local ZIP_FILE=$3
     local DESCRIPTION=$4
+    local TIMEOUT=${5:-30}
     
     echo "📦 Deploying Lambda: $FUNCTION_NAME"
     
@@ -39,7 +45,7 @@ deploy_lambda() {
         aws lambda update-function-configuration \
             --function-name $FUNCTION_NAME \
             --handler $HANDLER \
-            --timeout 30 \
+            --timeout $TIMEOUT \
             --memory-size 256 \
             --region $REGION > /dev/null
     else
@@ -49,7 +55,7 @@ deploy_lambda() {
             --runtime python3.11 \
             --role $ROLE_ARN \
             --handler $HANDLER \
-            --timeout 30 \
+            --timeout $TIMEOUT \
             --memory-size 256 \
             --description "$DESCRIPTION" \
             --zip-file fileb://$ZIP_FILE \
@@ -61,42 +67,86 @@ deploy_lambda() {
 
 # Package and deploy Nokia Adapter
 echo "1️⃣  Nokia Adapter"
-zip -q nokia_adapter.zip lambda_nokia_adapter.py
+zip -q nokia_adapter.zip lambda_nokia_adapter.py aura_logging.py
 deploy_lambda \
     "AURA-Nokia-Adapter" \
     "lambda_nokia_adapter.lambda_handler" \
     "nokia_adapter.zip" \
-    "AURA Nokia RAN Adapter for vendor-specific API calls"
+    "AURA Nokia RAN Adapter for vendor-specific API calls" \
+    $LONG_TIMEOUT
 
 # Package and deploy Ericsson Adapter
 echo ""
 echo "2️⃣  Ericsson Adapter"
-zip -q ericsson_adapter.zip lambda_ericsson_adapter.py
+zip -q ericsson_adapter.zip lambda_ericsson_adapter.py aura_logging.py
 deploy_lambda \
     "AURA-Ericsson-Adapter" \
     "lambda_ericsson_adapter.lambda_handler" \
     "ericsson_adapter.zip" \
-    "AURA Ericsson RAN Adapter for vendor-specific API calls"
+    "AURA Ericsson RAN Adapter for vendor-specific API calls" \
+    $LONG_TIMEOUT
 
 # Package and deploy Cisco Adapter
 echo ""
 echo "3️⃣  Cisco Adapter"
-zip -q cisco_adapter.zip lambda_cisco_adapter.py
+zip -q cisco_adapter.zip lambda_cisco_adapter.py aura_logging.py
 deploy_lambda \
     "AURA-Cisco-Adapter" \
     "lambda_cisco_adapter.lambda_handler" \
     "cisco_adapter.zip" \
-    "AURA Cisco Transport Adapter for vendor-specific API calls"
+    "AURA Cisco Transport Adapter for vendor-specific API calls" \
+    $LONG_TIMEOUT
 
 # Package and deploy Gateway Router
 echo ""
 echo "4️⃣  Gateway Router"
-zip -q gateway_router.zip lambda_gateway_router.py
+zip -q gateway_router.zip lambda_gateway_router.py aura_circuit_breaker.py aura_kpi_schema.py aura_logging.py aura_operations.py aura_topology.py topology.json
 deploy_lambda \
     "AURA-Gateway-Router" \
     "lambda_gateway_router.lambda_handler" \
     "gateway_router.zip" \
-    "AURA MCP Gateway Router - Routes requests to vendor adapters"
+    "AURA MCP Gateway Router - Routes requests to vendor adapters" \
+    $LONG_TIMEOUT
+
+# Async operations (submit now, poll later) need records shared across
+# router containers
+echo ""
+echo "5️⃣  Operations Table"
+OPERATIONS_TABLE="AURA-Operations"
+if aws dynamodb describe-table --table-name $OPERATIONS_TABLE --region $REGION > /dev/null 2>&1; then
+    echo "   ✓ $OPERATIONS_TABLE exists"
+else
+    aws dynamodb create-table \
+        --table-name $OPERATIONS_TABLE \
+        --attribute-definitions AttributeName=operation_id,AttributeType=S \
+        --key-schema AttributeName=operation_id,KeyType=HASH \
+        --billing-mode PAY_PER_REQUEST \
+        --region $REGION > /dev/null
+    aws dynamodb wait table-exists --table-name $OPERATIONS_TABLE --region $REGION
+    aws dynamodb update-time-to-live \
+        --table-name $OPERATIONS_TABLE \
+        --time-to-live-specification "Enabled=true, AttributeName=expires_at" \
+        --region $REGION > /dev/null
+    echo "   ✅ $OPERATIONS_TABLE created"
+fi
+
+# Merge into the router's existing environment rather than replacing it
+aws lambda wait function-updated --function-name AURA-Gateway-Router --region $REGION
+ROUTER_ENV=$(aws lambda get-function-configuration \
+    --function-name AURA-Gateway-Router \
+    --query 'Environment.Variables' \
+    --output json \
+    --region $REGION | python3 -c '
+import json, sys
+variables = json.load(sys.stdin) or {}
+variables.update(arg.split("=", 1) for arg in sys.argv[1:])
+print(json.dumps({"Variables": variables}))
+' AURA_OPERATIONS_TABLE=$OPERATIONS_TABLE AURA_OPERATION_TIMEOUT_S=$OPERATION_TIMEOUT_S \
+  AURA_LAMBDA_TIMEOUT_S=$LONG_TIMEOUT)
+aws lambda update-function-configuration \
+    --function-name AURA-Gateway-Router \
+    --environment "$ROUTER_ENV" \
+    --region $REGION > /dev/null
 
 echo ""
 echo "============================================"
@@ -107,5 +157,6 @@ echo "   - AURA-Nokia-Adapter"
 echo "   - AURA-Ericsson-Adapter"
 echo "   - AURA-Cisco-Adapter"
 echo "   - AURA-Gateway-Router"
+echo "   - AURA-Operations (DynamoDB)"
 echo ""
 echo "🌐 Next: Creating API Gateway..."
\ No newline at end of file
@@ -1,33 +1,101 @@
 import json
+import os
 import time
 
+from aura_logging import correlation_id_from, get_logger
+
+# Stand-in for the vendor API round trip on single-target calls, read
+# once at cold start (0 disables it, e.g. when measuring handler cost)
+API_DELAY_S = float(os.environ.get('AURA_ADAPTER_API_DELAY_S', '0.2'))
+
+# Structured JSON logs; level and sampling from AURA_LOG_* (see aura_logging.py)
+log = get_logger('cisco-adapter')
+
+# Simulated cost of one DNA Center bulk device query: a fixed round trip
+# plus a small per-device cost, so a batch amortises the round trip
+BULK_QUERY_S = 0.2
+BULK_PER_CELL_S = 0.001
+
+def device_kpis(target: str) -> dict:
+    """KPI record for one Cisco device, or None if the device is unknown"""
+    if 'PAR-03' not in target:
+        return None
+    return {
+        'device_id': target,
+        'status': 'REACHABLE',
+        'cpu_percent': 45,
+        'memory_percent': 62,
+        'uptime_hours': 720
+    }
+
+def bulk_kpis(targets: list) -> dict:
+    """
+    Fetch KPIs for many devices with one DNA Center query.
+    Returns a column-oriented batch: one list per KPI, aligned by index.
+    """
+    log.info('api.bulk_kpis', devices=len(targets))
+    
+    time.sleep(BULK_QUERY_S + BULK_PER_CELL_S * len(targets))
+    
+    timestamp = int(time.time())
+    columns = {}
+    errors = {}
+    for target in targets:
+        row = device_kpis(target)
+        if row is None:
+            errors[target] = 'Device not found in Cisco network'
+            continue
+        for key, value in row.items():
+            columns.setdefault(key, []).append(value)
+    
+    return {
+        'vendor': 'Cisco',
+        'api_version': 'DNA-Center-2.3',
+        'count': len(columns.get('device_id', [])),
+        'timestamp': timestamp,
+        'columns': columns,
+        'errors': errors
+    }
+
 def lambda_handler(event, context):
     """
     Cisco Transport Adapter
     Simulates Cisco transport network API calls
     """
-    
-    print(f"Cisco Adapter invoked with event: {json.dumps(event)}")
+    with log.request(correlation_id_from(event, context), tool=event.get('tool'),
+                     target=event.get('target')) as scope:
+        log.payload('event', event)
+        response = handle_request(event)
+        scope.set(status=response['statusCode'])
+        return response
+
+def handle_request(event):
+    """Run one Cisco API call"""
     
     tool = event.get('tool')
     target = event.get('target')
+    targets = event.get('targets')
+    
+    if tool == 'get_kpis' and targets:
+        return {
+            'statusCode': 200,
+            'body': json.dumps(bulk_kpis(targets))
+        }
     
-    time.sleep(0.2)
+    if API_DELAY_S:
+        time.sleep(API_DELAY_S)
     
     response_data = {}
     
     if tool == 'get_kpis':
-        print(f"Cisco DNA Center API: Getting device KPIs for {target}")
+        log.info('api.get_kpis', target=target)
         
-        if 'PAR-03' in target:
+        row = device_kpis(target)
+        if row:
             response_data = {
                 'vendor': 'Cisco',
                 'api_version': 'DNA-Center-2.3',
-                'device_id': target,
-                'status': 'REACHABLE',
-                'cpu_percent': 45,
-                'memory_percent': 62,
-                'uptime_hours': 720,
+                **row,
                 'timestamp': int(time.time())
             }
         else:
@@ -37,7 +105,7 @@ def lambda_handler(event, context):
             }
     
     elif tool == 'measure_latency':
-        print(f"Cisco SD-WAN API: Measuring path latency for {target}")
+        log.info('api.measure_latency', target=target)
         
         response_data = {
             'vendor': 'Cisco',
@@ -51,7 +119,7 @@ def lambda_handler(event, context):
         }
     
     elif tool == 'initiate_failover':
-        print(f"Cisco SD-WAN Orchestration: Initiating path failover for {target}")
+        log.info('api.initiate_failover', target=target)
         
         response_data = {
             'vendor': 'Cisco',
@@ -64,6 +132,7 @@ def lambda_handler(event, context):
         }
     
     else:
+        log.warning('unknown_tool', tool=tool)
         return {
             'statusCode': 400,
             'body': json.dumps({
@@ -1,36 +1,104 @@
 import json
+import os
 import time
 
+from aura_logging import correlation_id_from, get_logger
+
+# Stand-in for the vendor API round trip on single-target calls, read
+# once at cold start (0 disables it, e.g. when measuring handler cost)
+API_DELAY_S = float(os.environ.get('AURA_ADAPTER_API_DELAY_S', '0.2'))
+
+# Structured JSON logs; level and sampling from AURA_LOG_* (see aura_logging.py)
+log = get_logger('ericsson-adapter')
+
+# Simulated cost of one ENM bulk PM query: a fixed round trip plus a
+# small per-cell cost, so a batch amortises the round trip across cells
+BULK_QUERY_S = 0.2
+BULK_PER_CELL_S = 0.001
+
+def cell_kpis(target: str) -> dict:
+    """KPI record for one Ericsson cell, or None if the cell is unknown"""
+    if 'LON-15' not in target:
+        return None
+    return {
+        'cell_id': target,
+        'status': 'HEALTHY',
+        'rsrp_dbm': -72,
+        'sinr_db': 18,
+        'packet_loss_percent': 0.05,
+        'dl_throughput_mbps': 920,
+        'ul_throughput_mbps': 380,
+        'active_ues': 312
+    }
+
+def bulk_kpis(targets: list) -> dict:
+    """
+    Fetch KPIs for many cells with one ENM query.
+    Returns a column-oriented batch: one list per KPI, aligned by index.
+    """
+    log.info('api.bulk_kpis', cells=len(targets))
+    
+    time.sleep(BULK_QUERY_S + BULK_PER_CELL_S * len(targets))
+    
+    timestamp = int(time.time())
+    columns = {}
+    errors = {}
+    for target in targets:
+        row = cell_kpis(target)
+        if row is None:
+            errors[target] = 'Cell ID not found in Ericsson network'
+            continue
+        for key, value in row.items():
+            columns.setdefault(key, []).append(value)
+    
+    return {
+        'vendor': 'Ericsson',
+        'api_version': 'ENM-22.1',
+        'count': len(columns.get('cell_id', [])),
+        'timestamp': timestamp,
+        'columns': columns,
+        'errors': errors
+    }
+
 def lambda_handler(event, context):
     """
     Ericsson RAN Adapter
     Simulates Ericsson proprietary API calls
     """
-    
-    print(f"Ericsson Adapter invoked with event: {json.dumps(event)}")
+    with log.request(correlation_id_from(event, context), tool=event.get('tool'),
+                     target=event.get('target')) as scope:
+        log.payload('event', event)
+        response = handle_request(event)
+        scope.set(status=response['statusCode'])
+        return response
+
+def handle_request(event):
+    """Run one Ericsson API call"""
     
     tool = event.get('tool')
     target = event.get('target')
+    targets = event.get('targets')
+    
+    if tool == 'get_kpis' and targets:
+        return {
+            'statusCode': 200,
+            'body': json.dumps(bulk_kpis(targets))
+        }
     
-    time.sleep(0.2)
+    if API_DELAY_S:
+        time.sleep(API_DELAY_S)
     
     response_data = {}
     
     if tool == 'get_kpis':
-        print(f"Ericsson ENM API: Getting KPIs for {target}")
+        log.info('api.get_kpis', target=target)
         
-        if 'LON-15' in target:
+        row = cell_kpis(target)
+        if row:
             response_data = {
                 'vendor': 'Ericsson',
                 'api_version': 'ENM-22.1',
-                'cell_id': target,
-                'status': 'HEALTHY',
-                'rsrp_dbm': -72,
-                'sinr_db': 18,
-                'packet_loss_percent': 0.05,
-                'dl_throughput_mbps': 920,
-                'ul_throughput_mbps': 380,
-                'active_ues': 312,
+                **row,
                 'timestamp': int(time.time())
             }
         else:
@@ -40,7 +108,7 @@ def lambda_handler(event, context):
             }
     
     elif tool == 'measure_latency':
-        print(f"Ericsson Transport API: Measuring latency for {target}")
+        log.info('api.measure_latency', target=target)
         
         response_data = {
             'vendor': 'Ericsson',
@@ -53,7 +121,7 @@ def lambda_handler(event, context):
         }
     
     elif tool == 'initiate_failover':
-        print(f"Ericsson Orchestration: Initiating failover for {target}")
+        log.info('api.initiate_failover', target=target)
         
         response_data = {
             'vendor': 'Ericsson',
@@ -65,6 +133,7 @@ def lambda_handler(event, context):
         }
     
     else:
+        log.warning('unknown_tool', tool=tool)
         return {
             'statusCode': 400,
             'body': json.dumps({
@@ -1,8 +1,63 @@
 import json
-import boto3
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-lambda_client = boto3.client('lambda')
+from aura_circuit_breaker import CircuitBreaker, OPEN
+from aura_kpi_schema import KpiBatch, normalize_record, normalize_vendor_batch
+from aura_logging import (annotate, correlation_id_from, current_correlation_id,
+                          get_logger, in_scope)
+from aura_operations import (COMPLETED, FAILED, SUCCEEDED,
+                             DynamoOperationStore, IdempotencyTable,
+                             MemoryOperationStore, aws_client, callback_allowed,
+                             new_operation, notify_callback, public_view,
+                             start_operation)
+from aura_topology import load_topology
+
+# Bound the adapter call well below the 30s Lambda timeout so a hung
+# adapter trips its breaker instead of holding the router invocation
+ADAPTER_TIMEOUT_S = float(os.environ.get('AURA_ADAPTER_TIMEOUT_S', '8'))
+
+# Structured JSON logs; level and sampling from AURA_LOG_* (see aura_logging.py).
+# Full request / adapter payloads are DEBUG records, off on the hot path
+log = get_logger('router')
+
+# Created on first use and kept for the life of the container: module
+# import stays cheap, and requests answered from the topology, the
+# cache or an open breaker never load botocore at all
+lambda_client = None
+
+def adapter_client():
+    """The Lambda client used to invoke adapters"""
+    global lambda_client
+    if lambda_client is None:
+        from botocore.config import Config
+        lambda_client = aws_client('lambda', config=Config(
+            read_timeout=ADAPTER_TIMEOUT_S,
+            connect_timeout=2,
+            retries={'max_attempts': 0}
+        ))
+    return lambda_client
+
+# Async operations wait for the adapter far longer than a request can;
+# keep this below the router's Lambda timeout (deploy_mcp_gateway.sh)
+OPERATION_TIMEOUT_S = float(os.environ.get('AURA_OPERATION_TIMEOUT_S', '840'))
+
+operation_lambda_client = None
+
+def operation_client():
+    """The Lambda client used to run async operations to completion"""
+    global operation_lambda_client
+    if operation_lambda_client is None:
+        from botocore.config import Config
+        operation_lambda_client = aws_client('lambda', name='lambda-operations', config=Config(
+            read_timeout=OPERATION_TIMEOUT_S,
+            connect_timeout=2,
+            retries={'max_attempts': 0}
+        ))
+    return operation_lambda_client
 
 # Vendor mapping database
 # In production, this would be DynamoDB or a configuration service
@@ -12,6 +67,12 @@ SITE_VENDOR_MAP = {
     'PAR-03': 'Cisco'
 }
 
+# Topology file shipped in the zip extends the vendor map and replaces the
+# naming convention for element -> site resolution
+TOPOLOGY = load_topology()
+if TOPOLOGY:
+    SITE_VENDOR_MAP.update(TOPOLOGY.site_vendors())
+
 VENDOR_LAMBDA_MAP = {
     'Nokia': 'AURA-Nokia-Adapter',
     'Ericsson': 'AURA-Ericsson-Adapter',
@@ -24,6 +85,77 @@ TOOL_MAPPING = {
     'initiate_ntn_failover': 'initiate_failover'
 }
 
+# Tools that never change network state; only these may be answered
+# from the last-known-good cache while a vendor's breaker is open
+READ_ONLY_TOOLS = {'get_kpis', 'measure_latency'}
+
+# Tools answered by the router itself from the topology index
+TOPOLOGY_TOOLS = {'get_blast_radius', 'get_site_dependencies'}
+
+# Tools that accept a 'targets' list and return a column-oriented batch
+BATCH_TOOLS = {'get_kpis'}
+MAX_BATCH_TARGETS = 1000
+
+CACHE_MAX_AGE_S = float(os.environ.get('AURA_CACHE_MAX_AGE_S', '300'))
+CACHE_MAX_ENTRIES = int(os.environ.get('AURA_CACHE_MAX_ENTRIES', '1000'))
+
+# One breaker per vendor adapter, kept across warm invocations
+CIRCUIT_BREAKERS = {
+    vendor: CircuitBreaker(
+        vendor,
+        slow_call_ms=float(os.environ.get('AURA_SLOW_CALL_MS', '5000')),
+        open_seconds=float(os.environ.get('AURA_BREAKER_OPEN_S', '30'))
+    )
+    for vendor in VENDOR_LAMBDA_MAP
+}
+
+# Last successful adapter body per (vendor_tool, target), oldest write
+# first. Targets come from callers, so it is bounded by age and size
+RESPONSE_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+RESPONSE_CACHE_LOCK = threading.Lock()
+
+def cache_response(vendor_tool: str, target: str, adapter_body: dict):
+    now = time.time()
+    with RESPONSE_CACHE_LOCK:
+        RESPONSE_CACHE[(vendor_tool, target)] = (adapter_body, now)
+        RESPONSE_CACHE.move_to_end((vendor_tool, target))
+        while RESPONSE_CACHE and (len(RESPONSE_CACHE) > CACHE_MAX_ENTRIES or
+                                  next(iter(RESPONSE_CACHE.values()))[1] < now - CACHE_MAX_AGE_S):
+            RESPONSE_CACHE.popitem(last=False)
+
+# Network changes that may be submitted with "async": true and polled
+# with get_operation_status instead of holding the request open
+ASYNC_TOOLS = {'initiate_failover'}
+
+# Inside Lambda, submit and poll may hit different containers, so
+# records must be shared; a single local process can keep them in memory
+OPERATIONS_TABLE = os.environ.get('AURA_OPERATIONS_TABLE')
+OPERATIONS = (DynamoOperationStore(OPERATIONS_TABLE) if OPERATIONS_TABLE
+              else MemoryOperationStore())
+OPERATION_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# The router POSTs finished operations to the caller's callback_url; only
+# these hosts (comma-separated AURA_CALLBACK_HOSTS) are accepted. Local
+# hosts are too when running outside Lambda: inside it, 127.0.0.1 is the
+# Lambda Runtime API and no caller's callback server is reachable there
+CALLBACK_HOSTS = tuple(host.strip().lower() for host in
+                       os.environ.get('AURA_CALLBACK_HOSTS', '').split(',') if host.strip())
+CALLBACK_ALLOW_LOCAL = not os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+
+# Tools that change the network. A request carrying an idempotency key
+# runs at most once per key; replays within the TTL get the original
+# response, so callers can retry freely
+WRITE_TOOLS = {'initiate_failover'}
+IDEMPOTENCY_TTL_S = float(os.environ.get('AURA_IDEMPOTENCY_TTL_S', '3600'))
+# An adapter may keep running a write for its whole Lambda timeout after
+# the router gave up on it; a claim is only taken over once that has passed
+LAMBDA_TIMEOUT_S = float(os.environ.get('AURA_LAMBDA_TIMEOUT_S', '900'))
+IDEMPOTENCY = IdempotencyTable(
+    DynamoOperationStore(OPERATIONS_TABLE, ttl_s=IDEMPOTENCY_TTL_S) if OPERATIONS_TABLE
+    else MemoryOperationStore(ttl_s=IDEMPOTENCY_TTL_S),
+    stale_claim_s=LAMBDA_TIMEOUT_S + 60
+)
+
 def extract_site_id(target: str) -> str:
     """Extract site ID from target string"""
     # Examples: "DUB-07", "DUB-07-FIBER", "LON-15-NTN"
@@ -32,14 +164,445 @@ def extract_site_id(target: str) -> str:
         return f"{parts[0]}-{parts[1]}"
     return target
 
+def resolve_site(target: str) -> str:
+    """Site owning a cell or link, from the topology when available"""
+    if TOPOLOGY:
+        return TOPOLOGY.site_of(target)
+    return extract_site_id(target)
+
+def topology_query(tool: str, target: str) -> dict:
+    """Answer a topology tool locally without touching any adapter"""
+    if not TOPOLOGY:
+        return json_response(501, {'error': 'No topology loaded'})
+    if tool == 'get_blast_radius':
+        data = TOPOLOGY.blast_radius(target)
+    else:
+        data = TOPOLOGY.site_dependencies(resolve_site(target))
+    return json_response(200, {
+        'success': True,
+        'tool': tool,
+        'target': target,
+        'data': data
+    })
+
+def json_response(status_code: int, body: dict, headers: dict = None) -> dict:
+    """Build an API Gateway proxy response"""
+    all_headers = {'Content-Type': 'application/json'}
+    if headers:
+        all_headers.update(headers)
+    return {
+        'statusCode': status_code,
+        'headers': all_headers,
+        'body': json.dumps(body)
+    }
+
+def gateway_health() -> dict:
+    """Breaker state and latency percentiles for every vendor adapter"""
+    return {
+        vendor: breaker.snapshot()
+        for vendor, breaker in CIRCUIT_BREAKERS.items()
+    }
+
+# Whether a failed adapter call may have reached the adapter, reported in
+# the X-AURA-Adapter-Invoked header of a 503. Only a call that certainly
+# never ran may be retried under its idempotency key
+NOT_INVOKED = 'false'
+MAYBE_INVOKED = 'unknown'
+
+def adapter_invocation_state(error: Exception) -> str:
+    """NOT_INVOKED if the invoke failed before the adapter could start"""
+    from botocore.exceptions import ClientError, ConnectTimeoutError, EndpointConnectionError
+    # Rejected by the Lambda service, or no connection was ever made
+    if isinstance(error, (ClientError, ConnectTimeoutError, EndpointConnectionError)):
+        return NOT_INVOKED
+    # A read timeout or anything else: the adapter may still be running
+    return MAYBE_INVOKED
+
+def degraded_response(vendor: str, site_id: str, tool: str, vendor_tool: str,
+                      target: str, breaker: CircuitBreaker, reason: str,
+                      invoked: str = NOT_INVOKED) -> dict:
+    """Answer from cache when possible, otherwise fail fast"""
+    cached = RESPONSE_CACHE.get((vendor_tool, target))
+    if vendor_tool in READ_ONLY_TOOLS and cached:
+        adapter_body, cached_at = cached
+        age = time.time() - cached_at
+        if age <= CACHE_MAX_AGE_S:
+            return json_response(200, {
+                'success': True,
+                'degraded': True,
+                'cached_age_s': round(age, 1),
+                'reason': reason,
+                'vendor': vendor,
+                'site_id': site_id,
+                'tool': tool,
+                'breaker': breaker.snapshot(),
+                'data': adapter_body,
+                'normalized': normalize_record(vendor, adapter_body)
+            }, {'X-AURA-Vendor': vendor, 'X-AURA-Breaker': breaker.state})
+
+    return json_response(503, {
+        'error': f'{vendor} adapter unavailable: {reason}',
+        'circuit_open': breaker.state == OPEN,
+        'vendor': vendor,
+        'site_id': site_id,
+        'tool': tool,
+        'retry_after_s': round(breaker.retry_after_seconds(), 1),
+        'breaker': breaker.snapshot()
+    }, {'X-AURA-Vendor': vendor, 'X-AURA-Breaker': breaker.state,
+        'X-AURA-Adapter-Invoked': invoked})
+
+def invoke_adapter(vendor: str, adapter_payload: dict, client=None):
+    """
+    Invoke a vendor adapter and record the outcome on its breaker.
+    Returns (adapter response payload, latency in ms).
+    """
+    breaker = CIRCUIT_BREAKERS[vendor]
+    correlation_id = current_correlation_id()
+    if correlation_id:
+        adapter_payload = dict(adapter_payload, correlation_id=correlation_id)
+    started = time.monotonic()
+    try:
+        response = (client or adapter_client()).invoke(
+            FunctionName=VENDOR_LAMBDA_MAP[vendor],
+            InvocationType='RequestResponse',
+            Payload=json.dumps(adapter_payload)
+        )
+        response_payload = json.loads(response['Payload'].read())
+    except Exception:
+        breaker.record_failure((time.monotonic() - started) * 1000)
+        raise
+    
+    latency_ms = (time.monotonic() - started) * 1000
+    
+    # Unhandled adapter exceptions and 5xx count against the breaker;
+    # 4xx are caller errors and say nothing about adapter health
+    status = response_payload.get('statusCode', 500)
+    if response.get('FunctionError') or status >= 500:
+        breaker.record_failure(latency_ms)
+    else:
+        breaker.record_success(latency_ms)
+    
+    return response_payload, latency_ms
+
+def fetch_vendor_batch(vendor: str, vendor_tool: str, targets: list, params: dict) -> dict:
+    """One bulk adapter call covering every target owned by a vendor"""
+    breaker = CIRCUIT_BREAKERS[vendor]
+    
+    if not breaker.allow_request():
+        return {
+            'error': f'{vendor} adapter unavailable: circuit open',
+            'circuit_open': True,
+            'retry_after_s': round(breaker.retry_after_seconds(), 1),
+            'targets': targets
+        }
+    
+    log.info('route.batch', vendor=vendor, targets=len(targets))
+    
+    try:
+        response_payload, latency_ms = invoke_adapter(vendor, {
+            'tool': vendor_tool,
+            'targets': targets,
+            'params': params
+        })
+    except Exception as e:
+        return {
+            'error': f'{vendor} adapter unavailable: invocation failed: {str(e)}',
+            'circuit_open': breaker.state == OPEN,
+            'targets': targets
+        }
+    
+    if response_payload.get('statusCode') != 200:
+        return {
+            'error': response_payload.get('body', 'Adapter error'),
+            'targets': targets
+        }
+    
+    batch = json.loads(response_payload['body'])
+    batch['latency_ms'] = round(latency_ms, 1)
+    return batch
+
+def route_batch(tool: str, targets: list, params: dict) -> dict:
+    """
+    Fan a multi-target request out as one bulk call per vendor.
+    Vendor calls run in parallel; each batch stays column-oriented.
+    """
+    vendor_tool = TOOL_MAPPING.get(tool, tool)
+    
+    if vendor_tool not in BATCH_TOOLS:
+        return json_response(400, {
+            'error': f'Tool does not support batch targets: {tool}'
+        })
+    
+    if len(targets) > MAX_BATCH_TARGETS:
+        return json_response(400, {
+            'error': f'Too many targets: {len(targets)} (max {MAX_BATCH_TARGETS})'
+        })
+    
+    groups = {}
+    errors = {}
+    for target in targets:
+        site_id = resolve_site(target)
+        vendor = SITE_VENDOR_MAP.get(site_id)
+        if vendor:
+            groups.setdefault(vendor, []).append(target)
+        else:
+            errors[target] = f'Unknown site: {site_id}'
+    
+    with ThreadPoolExecutor(max_workers=max(1, len(groups))) as pool:
+        futures = {
+            vendor: pool.submit(in_scope(fetch_vendor_batch), vendor, vendor_tool,
+                                vendor_targets, params)
+            for vendor, vendor_targets in groups.items()
+        }
+        batches = {vendor: future.result() for vendor, future in futures.items()}
+    
+    normalized = KpiBatch()
+    for vendor, batch in batches.items():
+        if 'columns' in batch:
+            normalized.extend(normalize_vendor_batch(vendor, batch))
+    
+    return json_response(200, {
+        'success': True,
+        'tool': tool,
+        'count': len(normalized),
+        'batches': batches,
+        'normalized': normalized.to_dict(),
+        'errors': errors
+    })
+
+def run_operation(operation_id: str, correlation_id: str = None):
+    """Execute a submitted operation and record its outcome"""
+    with log.request(correlation_id, operation_id=operation_id) as scope:
+        record = _run_operation(operation_id)
+        if record is not None:
+            scope.set(status=record['status'])
+            if record['status'] == FAILED:
+                log.warning('operation.failed', operation_id=operation_id,
+                            error=record.get('error'))
+
+def _run_operation(operation_id: str):
+    record = start_operation(OPERATIONS, operation_id)
+    if record is None:
+        # Unknown, expired, or already started by another delivery
+        log.warning('operation.not_started', operation_id=operation_id)
+        return None
+    
+    log.info('operation.run', operation_id=operation_id, tool=record['tool'],
+             target=record['target'])
+    
+    breaker = CIRCUIT_BREAKERS[record['vendor']]
+    if not breaker.allow_request():
+        log.warning('circuit.fail_fast', vendor=record['vendor'], state=breaker.state)
+        record = OPERATIONS.update(operation_id, status=FAILED, error='circuit open',
+                                   retry_after_s=round(breaker.retry_after_seconds(), 1))
+    else:
+        try:
+            response_payload, latency_ms = invoke_adapter(record['vendor'], record['payload'],
+                                                          operation_client())
+            if response_payload.get('statusCode') == 200:
+                record = OPERATIONS.update(operation_id, status=SUCCEEDED,
+                                           latency_ms=round(latency_ms, 1),
+                                           result=json.loads(response_payload['body']))
+            else:
+                record = OPERATIONS.update(operation_id, status=FAILED,
+                                           error=response_payload.get('body', 'Adapter error'))
+        except Exception as e:
+            record = OPERATIONS.update(operation_id, status=FAILED,
+                                       error=f'invocation failed: {str(e)}')
+    
+    if record.get('callback_url'):
+        callback_error = notify_callback(record['callback_url'], record)
+        if callback_error:
+            log.warning('operation.callback_failed', operation_id=operation_id,
+                        error=callback_error)
+            OPERATIONS.update(operation_id, callback_error=callback_error)
+    return record
+
+def submit_operation(tool: str, target: str, vendor: str, site_id: str,
+                     adapter_payload: dict, callback_url: str, context) -> dict:
+    """Record an operation, start it in the background and return 202 at once"""
+    if callback_url and not callback_allowed(callback_url, CALLBACK_HOSTS, CALLBACK_ALLOW_LOCAL):
+        return json_response(400, {
+            'error': 'callback_url must be http(s) on an allowed host',
+            'callback_url': callback_url
+        })
+    
+    record = new_operation(tool, target, vendor, adapter_payload, callback_url)
+    OPERATIONS.put(record)
+    
+    if OPERATIONS_TABLE and context is not None:
+        # A fresh asynchronous invocation of this router runs the operation
+        # with its own timeout, so this request can return immediately
+        adapter_client().invoke(
+            FunctionName=context.function_name,
+            InvocationType='Event',
+            Payload=json.dumps({'aura_operation': record['operation_id'],
+                                'correlation_id': current_correlation_id()})
+        )
+    else:
+        OPERATION_EXECUTOR.submit(run_operation, record['operation_id'],
+                                  current_correlation_id())
+    
+    return json_response(202, {
+        'success': True,
+        'async': True,
+        'vendor': vendor,
+        'site_id': site_id,
+        'tool': tool,
+        'operation_id': record['operation_id'],
+        'status': record['status'],
+        'poll': {'tool': 'get_operation_status', 'target': record['operation_id']}
+    }, {'X-AURA-Vendor': vendor, 'Location': record['operation_id']})
+
+def operation_status(operation_id: str) -> dict:
+    record = OPERATIONS.get(operation_id)
+    if record is None:
+        return json_response(404, {'error': f'Unknown operation: {operation_id}'})
+    return json_response(200, {
+        'success': True,
+        'tool': 'get_operation_status',
+        'target': operation_id,
+        'data': public_view(record)
+    })
+
+def route_to_adapter(tool: str, vendor_tool: str, target: str, params: dict,
+                     body: dict, vendor: str, site_id: str, context) -> dict:
+    """Send a single-target request to its vendor adapter"""
+    adapter_function = VENDOR_LAMBDA_MAP[vendor]
+    
+    # Prepare payload for vendor adapter
+    adapter_payload = {
+        'tool': vendor_tool,
+        'target': target,
+        'params': params
+    }
+    
+    # Submitting never calls the adapter; the operation runner takes its
+    # own breaker slot, so a half-open probe is only spent on a real call
+    if body.get('async') and vendor_tool in ASYNC_TOOLS:
+        return submit_operation(tool, target, vendor, site_id, adapter_payload,
+                                body.get('callback_url'), context)
+    
+    breaker = CIRCUIT_BREAKERS[vendor]
+    
+    if not breaker.allow_request():
+        log.warning('circuit.fail_fast', vendor=vendor, state=breaker.state)
+        return degraded_response(vendor, site_id, tool, vendor_tool,
+                                 target, breaker, 'circuit open')
+    
+    log.info('route.adapter', vendor=vendor, function=adapter_function, tool=vendor_tool)
+    log.payload('adapter.request', adapter_payload, vendor=vendor)
+    
+    # Invoke the vendor-specific adapter
+    try:
+        response_payload, latency_ms = invoke_adapter(vendor, adapter_payload)
+    except Exception as e:
+        log.error('adapter.invoke_failed', vendor=vendor, error=str(e))
+        return degraded_response(vendor, site_id, tool, vendor_tool,
+                                 target, breaker, f'invocation failed: {str(e)}',
+                                 adapter_invocation_state(e))
+    
+    log.payload('adapter.response', response_payload, vendor=vendor,
+                latency_ms=round(latency_ms, 1))
+    
+    # Check if adapter returned an error
+    if response_payload.get('statusCode') != 200:
+        return {
+            'statusCode': response_payload.get('statusCode', 500),
+            'headers': {'Content-Type': 'application/json'},
+            'body': response_payload.get('body', json.dumps({'error': 'Adapter error'}))
+        }
+    
+    # Parse the adapter's body
+    adapter_body = json.loads(response_payload['body'])
+    
+    if vendor_tool in READ_ONLY_TOOLS:
+        cache_response(vendor_tool, target, adapter_body)
+    
+    # Return successful response with vendor info
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'X-AURA-Vendor': vendor,
+            'X-AURA-Adapter': adapter_function,
+            'X-AURA-Breaker': breaker.state
+        },
+        'body': json.dumps({
+            'success': True,
+            'vendor': vendor,
+            'site_id': site_id,
+            'tool': tool,
+            'latency_ms': round(latency_ms, 1),
+            'data': adapter_body,
+            'normalized': normalize_record(vendor, adapter_body)
+        })
+    }
+
+def route_idempotent(key: str, tool: str, target: str, route) -> dict:
+    """
+    Run route() at most once per idempotency key.
+    Replays get the original response. Only a failure that never reached
+    the adapter (open breaker, invoke rejected or never connected) releases
+    the key so a retry runs again. When the adapter may have run, e.g. a
+    read timeout, the claim stays IN_PROGRESS: retries get 409 until it
+    goes stale, instead of running the change a second time.
+    """
+    claimed, record = IDEMPOTENCY.claim(key, tool, target)
+    if not claimed:
+        if (record['tool'], record['target']) != (tool, target):
+            return json_response(422, {
+                'error': 'Idempotency key already used for a different request',
+                'idempotency_key': key
+            })
+        if record['status'] != COMPLETED:
+            return json_response(409, {
+                'error': 'A request with this idempotency key is still in progress',
+                'idempotency_key': key,
+                'retry_after_s': 1
+            })
+        log.info('idempotent.replay', idempotency_key=key)
+        response = dict(record['response'])
+        response['headers'] = dict(response.get('headers', {}), **{'Idempotent-Replay': 'true'})
+        return response
+    
+    try:
+        response = route()
+    except Exception:
+        log.warning('idempotent.outcome_unknown', idempotency_key=key)
+        raise
+    
+    if response['statusCode'] < 500:
+        IDEMPOTENCY.complete(key, response)
+    elif (response.get('headers') or {}).get('X-AURA-Adapter-Invoked') == NOT_INVOKED:
+        IDEMPOTENCY.release(key)
+    else:
+        log.warning('idempotent.outcome_unknown', idempotency_key=key,
+                    status=response['statusCode'])
+    return response
+
 def lambda_handler(event, context):
     """
     AURA MCP Gateway Router
     Routes standardized tool requests to vendor-specific adapters
     """
+    correlation_id = correlation_id_from(event, context)
+    
+    if 'aura_operation' in event:
+        run_operation(event['aura_operation'], correlation_id)
+        return {'statusCode': 200}
     
-    print(f"Gateway Router received event: {json.dumps(event)}")
+    with log.request(correlation_id) as scope:
+        log.payload('event', event)
+        response = route_request(event, context)
+        scope.set(status=response['statusCode'])
     
+    # Echo the correlation ID so callers can find this request in the logs
+    headers = dict(response.get('headers') or {}, **{'X-Correlation-Id': correlation_id})
+    return dict(response, headers=headers)
+
+def route_request(event, context):
+    """Parse one API Gateway request and route it"""
     try:
         # Parse request body
         if isinstance(event.get('body'), str):
@@ -50,6 +613,24 @@ def lambda_handler(event, context):
         tool = body.get('tool')
         target = body.get('target')
         params = body.get('params', {})
+        annotate(tool=tool, target=target)
+        
+        if tool == 'get_gateway_health':
+            return json_response(200, {
+                'success': True,
+                'tool': tool,
+                'data': gateway_health()
+            })
+        
+        targets = body.get('targets')
+        if tool and isinstance(targets, list) and targets:
+            return route_batch(tool, targets, params)
+        
+        if tool in TOPOLOGY_TOOLS and target:
+            return topology_query(tool, target)
+        
+        if tool == 'get_operation_status' and target:
+            return operation_status(target)
         
         if not tool or not target:
             return {
@@ -61,7 +642,7 @@ def lambda_handler(event, context):
             }
         
         # Determine vendor from target site
-        site_id = extract_site_id(target)
+        site_id = resolve_site(target)
         vendor = SITE_VENDOR_MAP.get(site_id)
         
         if not vendor:
@@ -89,60 +670,20 @@ def lambda_handler(event, context):
         # Map tool name to vendor-specific tool name
         vendor_tool = TOOL_MAPPING.get(tool, tool)
         
-        # Prepare payload for vendor adapter
-        adapter_payload = {
-            'tool': vendor_tool,
-            'target': target,
-            'params': params
-        }
-        
-        print(f"Routing to {vendor} adapter: {adapter_function}")
-        print(f"Adapter payload: {json.dumps(adapter_payload)}")
-        
-        # Invoke the vendor-specific adapter
-        response = lambda_client.invoke(
-            FunctionName=adapter_function,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(adapter_payload)
-        )
-        
-        # Parse adapter response
-        response_payload = json.loads(response['Payload'].read())
-        
-        print(f"Adapter response: {json.dumps(response_payload)}")
-        
-        # Check if adapter returned an error
-        if response_payload.get('statusCode') != 200:
-            return {
-                'statusCode': response_payload.get('statusCode', 500),
-                'headers': {'Content-Type': 'application/json'},
-                'body': response_payload.get('body', json.dumps({'error': 'Adapter error'}))
-            }
+        def route():
+            return route_to_adapter(tool, vendor_tool, target, params, body,
+                                    vendor, site_id, context)
         
-        # Parse the adapter's body
-        adapter_body = json.loads(response_payload['body'])
+        headers = event.get('headers') or {}
+        idempotency_key = (body.get('idempotency_key') or headers.get('Idempotency-Key')
+                           or headers.get('idempotency-key'))
+        if idempotency_key and vendor_tool in WRITE_TOOLS:
+            return route_idempotent(idempotency_key, tool, target, route)
         
-        # Return successful response with vendor info
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'X-AURA-Vendor': vendor,
-                'X-AURA-Adapter': adapter_function
-            },
-            'body': json.dumps({
-                'success': True,
-                'vendor': vendor,
-                'site_id': site_id,
-                'tool': tool,
-                'data': adapter_body
-            })
-        }
+        return route()
         
     except Exception as e:
-        print(f"Error in gateway router: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception('router.error')
         
         return {
             'statusCode': 500,
@@ -1,35 +1,103 @@
 import json
+import os
 import time
 
+from aura_logging import correlation_id_from, get_logger
+
+# Stand-in for the vendor API round trip on single-target calls, read
+# once at cold start (0 disables it, e.g. when measuring handler cost)
+API_DELAY_S = float(os.environ.get('AURA_ADAPTER_API_DELAY_S', '0.2'))
+
+# Structured JSON logs; level and sampling from AURA_LOG_* (see aura_logging.py)
+log = get_logger('nokia-adapter')
+
+# Simulated cost of one Nokia bulk PM query: a fixed round trip plus a
+# small per-cell cost, so a batch amortises the round trip across cells
+BULK_QUERY_S = 0.2
+BULK_PER_CELL_S = 0.001
+
+def cell_kpis(target: str) -> dict:
+    """KPI record for one Nokia cell, or None if the cell is unknown"""
+    if 'DUB-07' not in target:
+        return None
+    return {
+        'cell_id': target,
+        'status': 'HEALTHY',
+        'radio_signal_dbm': -75,
+        'packet_loss_percent': 0.1,
+        'throughput_mbps': 850,
+        'connected_users': 245
+    }
+
+def bulk_kpis(targets: list) -> dict:
+    """
+    Fetch KPIs for many cells with one backend query.
+    Returns a column-oriented batch: one list per KPI, aligned by index.
+    """
+    log.info('api.bulk_kpis', cells=len(targets))
+    
+    time.sleep(BULK_QUERY_S + BULK_PER_CELL_S * len(targets))
+    
+    timestamp = int(time.time())
+    columns = {}
+    errors = {}
+    for target in targets:
+        row = cell_kpis(target)
+        if row is None:
+            errors[target] = 'Cell ID not found in Nokia network'
+            continue
+        for key, value in row.items():
+            columns.setdefault(key, []).append(value)
+    
+    return {
+        'vendor': 'Nokia',
+        'api_version': '5G-SA-R16',
+        'count': len(columns.get('cell_id', [])),
+        'timestamp': timestamp,
+        'columns': columns,
+        'errors': errors
+    }
+
 def lambda_handler(event, context):
     """
     Nokia RAN Adapter
     Simulates Nokia proprietary API calls for RAN management
     """
-    
-    print(f"Nokia Adapter invoked with event: {json.dumps(event)}")
+    with log.request(correlation_id_from(event, context), tool=event.get('tool'),
+                     target=event.get('target')) as scope:
+        log.payload('event', event)
+        response = handle_request(event)
+        scope.set(status=response['statusCode'])
+        return response
+
+def handle_request(event):
+    """Run one Nokia API call"""
     
     tool = event.get('tool')
     target = event.get('target')
+    targets = event.get('targets')
+    
+    if tool == 'get_kpis' and targets:
+        return {
+            'statusCode': 200,
+            'body': json.dumps(bulk_kpis(targets))
+        }
     
     # Simulate Nokia API processing time
-    time.sleep(0.2)
+    if API_DELAY_S:
+        time.sleep(API_DELAY_S)
     
     response_data = {}
     
     if tool == 'get_kpis':
-        print(f"Nokia API: Getting KPIs for {target}")
+        log.info('api.get_kpis', target=target)
         
-        if 'DUB-07' in target:
+        row = cell_kpis(target)
+        if row:
             response_data = {
                 'vendor': 'Nokia',
                 'api_version': '5G-SA-R16',
-                'cell_id': target,
-                'status': 'HEALTHY',
-                'radio_signal_dbm': -75,
-                'packet_loss_percent': 0.1,
-                'throughput_mbps': 850,
-                'connected_users': 245,
+                **row,
                 'timestamp': int(time.time())
             }
         else:
@@ -39,7 +107,7 @@ def lambda_handler(event, context):
             }
     
     elif tool == 'measure_latency':
-        print(f"Nokia Transport API: Measuring latency for {target}")
+        log.info('api.measure_latency', target=target)
         
         if 'DUB-07-FIBER' in target:
             response_data = {
@@ -73,7 +141,7 @@ def lambda_handler(event, context):
             }
     
     elif tool == 'initiate_failover':
-        print(f"Nokia Orchestration API: Initiating failover for {target}")
+        log.info('api.initiate_failover', target=target)
         
         response_data = {
             'vendor': 'Nokia',
@@ -88,6 +156,7 @@ def lambda_handler(event, context):
         }
     
     else:
+        log.warning('unknown_tool', tool=tool)
         return {
             'statusCode': 400,
             'body': json.dumps({
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+AURA MCP Gateway - Load Test
+Replays a weighted mix of tool calls against the gateway concurrently.
+
+Two modes:
+    --rps N          open loop: requests are scheduled at a fixed rate and
+                     latency is measured from the scheduled send time, so
+                     queueing behind a slow gateway shows up in the tail
+                     instead of silently lowering the offered load
+    --concurrency N  closed loop: N workers send back-to-back
+
+The default mix is read-only. Failovers change the network, so they are
+only sent with --include-writes (or a --mix file that lists them), each
+under a fresh idempotency key.
+
+Reports p50/p95/p99, error rate and throughput per vendor and tool, and
+writes them as JSON. With --baseline, a previous result file is used as
+a regression check and the exit status is non-zero if p95 or the error
+rate got worse than --tolerance allows.
+
+Usage:
+    python3 load_test_gateway.py --local --rps 50 --duration 30 --output run.json
+    python3 load_test_gateway.py --concurrency 16 --baseline run.json
+    python3 load_test_gateway.py --local --rps 50 --include-writes
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from aura_circuit_breaker import percentile
+
+# (weight, vendor, tool, target); read-only
+DEFAULT_MIX = [
+    (30, 'Nokia', 'get_cell_kpis', 'DUB-07'),
+    (15, 'Nokia', 'measure_link_latency', 'DUB-07-FIBER'),
+    (10, 'Nokia', 'measure_link_latency', 'DUB-07-NTN'),
+    (15, 'Ericsson', 'get_cell_kpis', 'LON-15'),
+    (10, 'Ericsson', 'measure_link_latency', 'LON-15-FIBER'),
+    (10, 'Cisco', 'get_cell_kpis', 'PAR-03'),
+    (7, 'Cisco', 'measure_link_latency', 'PAR-03-MPLS'),
+]
+
+# Added with --include-writes
+WRITE_MIX = [
+    (1, 'Nokia', 'initiate_ntn_failover', 'DUB-07'),
+    (1, 'Ericsson', 'initiate_ntn_failover', 'LON-15'),
+    (1, 'Cisco', 'initiate_ntn_failover', 'PAR-03'),
+]
+
+
+def load_mix(path: str) -> list:
+    """A mix file is a JSON list of {weight, vendor, tool, target}"""
+    with open(path, 'r') as f:
+        return [(m['weight'], m['vendor'], m['tool'], m['target']) for m in json.load(f)]
+
+
+class Recorder:
+    """Thread-safe latency / status collection keyed by (vendor, tool)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, vendor: str, tool: str, latency_ms: float, status):
+        with self.lock:
+            entry = self.samples.setdefault((vendor, tool), {'latencies': [], 'statuses': {}})
+            entry['latencies'].append(latency_ms)
+            entry['statuses'][str(status)] = entry['statuses'].get(str(status), 0) + 1
+
+    def report(self, elapsed_s: float) -> dict:
+        def summarize(latencies, statuses):
+            ordered = sorted(latencies)
+            ok = sum(n for status, n in statuses.items() if status.startswith('2'))
+            total = len(ordered)
+            return {
+                'requests': total,
+                'errors': total - ok,
+                'error_rate': round((total - ok) / total, 4) if total else 0.0,
+                'throughput_rps': round(total / elapsed_s, 2) if elapsed_s else 0.0,
+                'p50_ms': round(percentile(ordered, 50), 1),
+                'p95_ms': round(percentile(ordered, 95), 1),
+                'p99_ms': round(percentile(ordered, 99), 1),
+                'max_ms': round(ordered[-1], 1) if ordered else 0.0,
+                'statuses': statuses
+            }
+
+        with self.lock:
+            groups = {
+                'by_vendor_tool': {},
+                'by_vendor': {},
+                'by_tool': {}
+            }
+            merged = {'by_vendor': {}, 'by_tool': {}}
+            all_latencies, all_statuses = [], {}
+            for (vendor, tool), entry in sorted(self.samples.items()):
+                groups['by_vendor_tool'][f"{vendor}/{tool}"] = summarize(entry['latencies'], entry['statuses'])
+                for key, name in (('by_vendor', vendor), ('by_tool', tool)):
+                    bucket = merged[key].setdefault(name, ([], {}))
+                    bucket[0].extend(entry['latencies'])
+                    for status, n in entry['statuses'].items():
+                        bucket[1][status] = bucket[1].get(status, 0) + n
+                all_latencies.extend(entry['latencies'])
+                for status, n in entry['statuses'].items():
+                    all_statuses[status] = all_statuses.get(status, 0) + n
+            for key in ('by_vendor', 'by_tool'):
+                for name, (latencies, statuses) in merged[key].items():
+                    groups[key][name] = summarize(latencies, statuses)
+            groups['overall'] = summarize(all_latencies, all_statuses)
+            return groups
+
+
+WRITE_TOOLS = {tool for _, _, tool, _ in WRITE_MIX}
+
+
+def send(session: requests.Session, endpoint: str, tool: str, target: str, timeout: float):
+    """One gateway request; returns the HTTP status or an exception class name"""
+    body = {'tool': tool, 'target': target}
+    if tool in WRITE_TOOLS:
+        # Each write is its own operation; the router runs it at most once
+        body['idempotency_key'] = uuid.uuid4().hex
+    try:
+        response = session.post(endpoint, json=body,
+                                headers={'Content-Type': 'application/json'}, timeout=timeout)
+        return response.status_code
+    except requests.exceptions.RequestException as e:
+        return type(e).__name__
+
+
+class LoadTest:
+    def __init__(self, endpoint: str, mix: list, timeout: float = 10.0, seed: int = 7):
+        self.endpoint = endpoint
+        self.mix = mix
+        self.weights = [m[0] for m in mix]
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.recorder = Recorder()
+        self.local = threading.local()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _pick(self):
+        with self.random_lock:
+            return self.random.choices(self.mix, weights=self.weights)[0]
+
+    def _one(self, scheduled_at: float = None):
+        _, vendor, tool, target = self._pick()
+        started = time.monotonic()
+        status = send(self._session(), self.endpoint, tool, target, self.timeout)
+        finished = time.monotonic()
+        # Open loop measures from when the request should have been sent
+        self.recorder.record(vendor, tool, (finished - (scheduled_at or started)) * 1000, status)
+
+    def run_open_loop(self, rps: float, duration_s: float, max_workers: int) -> float:
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            total = int(rps * duration_s)
+            for i in range(total):
+                scheduled_at = started + i / rps
+                delay = scheduled_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._one, scheduled_at)
+        return time.monotonic() - started
+
+    def run_closed_loop(self, concurrency: int, duration_s: float) -> float:
+        started = time.monotonic()
+        deadline = started + duration_s
+
+        def worker():
+            while time.monotonic() < deadline:
+                self._one()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.monotonic() - started
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of p95 and error rate against a baseline run"""
+    regressions = []
+    for name, current in result['by_vendor_tool'].items():
+        previous = baseline.get('by_vendor_tool', {}).get(name)
+        if not previous:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms → {current['p95_ms']}ms")
+        if current['error_rate'] > previous['error_rate'] + 0.01:
+            regressions.append(f"{name}: error rate {previous['error_rate']:.2%} → {current['error_rate']:.2%}")
+    return regressions
+
+
+def print_table(result: dict):
+    print(f"{'VENDOR/TOOL':<36} {'REQS':>6} {'ERR%':>6} {'RPS':>7} {'P50':>8} {'P95':>8} {'P99':>8}")
+    rows = list(result['by_vendor_tool'].items()) + [('OVERALL', result['overall'])]
+    for name, r in rows:
+        print(f"{name:<36} {r['requests']:>6} {r['error_rate'] * 100:>5.1f}% {r['throughput_rps']:>7.1f} "
+              f"{r['p50_ms']:>6.0f}ms {r['p95_ms']:>6.0f}ms {r['p99_ms']:>6.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the AURA MCP Gateway")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--rps', type=float, help='Open loop: target requests per second')
+    mode.add_argument('--concurrency', type=int, help='Closed loop: concurrent workers')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+    parser.add_argument('--max-workers', type=int, default=64, help='Open-loop worker threads')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout (s)')
+    parser.add_argument('--mix', help='JSON mix file (list of {weight, vendor, tool, target})')
+    parser.add_argument('--include-writes', action='store_true',
+                        help='Add NTN failovers to the default mix (changes the network)')
+    parser.add_argument('--local', action='store_true', help='Start the local gateway emulator in-process')
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--baseline', help='Previous JSON result to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95 increase vs baseline')
+    args = parser.parse_args()
+
+    if args.local:
+        import local_gateway
+        server = local_gateway.start(port=0, quiet=True)
+        endpoint = local_gateway.endpoint_of(server)
+    else:
+        with open(os.environ.get('AURA_GATEWAY_CONFIG', 'gateway_config.json'), 'r') as f:
+            endpoint = json.load(f)['endpoint']
+
+    mix = load_mix(args.mix) if args.mix else DEFAULT_MIX
+    if args.include_writes:
+        mix = mix + WRITE_MIX
+    test = LoadTest(endpoint, mix, timeout=args.timeout)
+
+    print("=" * 70)
+    print("AURA MCP Gateway - Load Test")
+    print("=" * 70)
+    print(f"Endpoint: {endpoint}")
+    if args.rps:
+        print(f"Mode:     open loop, {args.rps:g} req/s for {args.duration:g}s")
+        elapsed = test.run_open_loop(args.rps, args.duration, args.max_workers)
+    else:
+        print(f"Mode:     closed loop, {args.concurrency} workers for {args.duration:g}s")
+        elapsed = test.run_closed_loop(args.concurrency, args.duration)
+    print()
+
+    result = test.recorder.report(elapsed)
+    result['config'] = {
+        'endpoint': endpoint,
+        'mode': 'open' if args.rps else 'closed',
+        'rps': args.rps,
+        'concurrency': args.concurrency,
+        'duration_s': args.duration,
+        'include_writes': args.include_writes,
+        'elapsed_s': round(elapsed, 2),
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }
+    print_table(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions vs baseline:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions vs baseline")
+
+
+if __name__ == "__main__":
+    main()
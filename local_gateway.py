@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+AURA Local Gateway Emulator
+API Gateway + router Lambda + vendor adapter Lambdas in one HTTP server.
+
+POST /prod/tools is turned into the same proxy event API Gateway sends
+and handed to lambda_gateway_router.lambda_handler. The router's
+lambda_client is replaced with LocalLambdaClient, which calls the adapter
+handlers in-process with the same payload shapes that lambda.invoke uses.
+Because of this, breakers, caching, batching and async operations all
+behave as they do when deployed.
+
+Point the agent at it with a config file:
+
+    python3 local_gateway.py --port 8080 --write-config gateway_config.local.json
+    AURA_GATEWAY_CONFIG=gateway_config.local.json python3 aura_with_gateway.py
+"""
+
+import argparse
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import lambda_cisco_adapter
+import lambda_ericsson_adapter
+import lambda_gateway_router
+import lambda_nokia_adapter
+
+STAGE_PATH = '/prod/tools'
+
+FUNCTIONS = {
+    'AURA-Nokia-Adapter': lambda_nokia_adapter.lambda_handler,
+    'AURA-Ericsson-Adapter': lambda_ericsson_adapter.lambda_handler,
+    'AURA-Cisco-Adapter': lambda_cisco_adapter.lambda_handler,
+    'AURA-Gateway-Router': lambda_gateway_router.lambda_handler,
+}
+
+
+class LambdaContext:
+    """The parts of the Lambda context object the handlers use"""
+
+    def __init__(self, function_name: str, timeout_s: float = 30.0):
+        self.function_name = function_name
+        self.aws_request_id = str(uuid.uuid4())
+        self.memory_limit_in_mb = 256
+        self.deadline = time.monotonic() + timeout_s
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self.deadline - time.monotonic()) * 1000))
+
+
+class LocalLambdaClient:
+    """Stands in for boto3's lambda client by calling handlers directly"""
+
+    def invoke(self, FunctionName, InvocationType='RequestResponse', Payload=b'{}', **kwargs):
+        handler = FUNCTIONS.get(FunctionName)
+        if handler is None:
+            raise ValueError(f"Function not found: {FunctionName}")
+        event = json.loads(Payload)
+
+        if InvocationType == 'Event':
+            threading.Thread(target=handler, args=(event, LambdaContext(FunctionName)),
+                             daemon=True).start()
+            return {'StatusCode': 202, 'Payload': io.BytesIO(b'')}
+
+        try:
+            result = handler(event, LambdaContext(FunctionName))
+            return {'StatusCode': 200, 'Payload': io.BytesIO(json.dumps(result).encode())}
+        except Exception as e:
+            # Same shape Lambda returns for an unhandled exception
+            error = {'errorMessage': str(e), 'errorType': type(e).__name__}
+            return {'StatusCode': 200, 'FunctionError': 'Unhandled',
+                    'Payload': io.BytesIO(json.dumps(error).encode())}
+
+
+def proxy_event(method: str, path: str, headers: dict, body: str) -> dict:
+    """An API Gateway REST proxy integration event"""
+    return {
+        'resource': path,
+        'path': path,
+        'httpMethod': method,
+        'headers': headers,
+        'queryStringParameters': None,
+        'pathParameters': None,
+        'stageVariables': None,
+        'requestContext': {
+            'stage': 'prod',
+            'requestId': str(uuid.uuid4()),
+            'httpMethod': method,
+            'path': path,
+            'requestTimeEpoch': int(time.time() * 1000)
+        },
+        'body': body,
+        'isBase64Encoded': False
+    }
+
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status: int, headers: dict, body: str):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        if self.path.split('?')[0] != STAGE_PATH:
+            # What API Gateway answers for an unknown resource
+            self._send(403, {'Content-Type': 'application/json'},
+                       json.dumps({'message': 'Missing Authentication Token'}))
+            return
+
+        event = proxy_event('POST', STAGE_PATH, dict(self.headers), body)
+        try:
+            result = lambda_gateway_router.lambda_handler(event, LambdaContext('AURA-Gateway-Router'))
+        except Exception as e:
+            self._send(502, {'Content-Type': 'application/json'},
+                       json.dumps({'message': 'Internal server error', 'error': str(e)}))
+            return
+        self._send(result.get('statusCode', 200), result.get('headers') or {},
+                   result.get('body') or '')
+
+    def do_GET(self):
+        self._send(403, {'Content-Type': 'application/json'},
+                   json.dumps({'message': 'Missing Authentication Token'}))
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+def silence(*modules):
+    """Turn off the handlers' structured logging"""
+    for module in modules:
+        module.log.set_level('OFF')
+
+
+def start(host: str = '127.0.0.1', port: int = 8080, quiet: bool = False,
+          access_log: bool = False) -> ThreadingHTTPServer:
+    """Start the emulator on a background thread; returns the server"""
+    lambda_gateway_router.lambda_client = LocalLambdaClient()
+    lambda_gateway_router.operation_lambda_client = lambda_gateway_router.lambda_client
+    if quiet:
+        silence(lambda_gateway_router, lambda_nokia_adapter,
+                lambda_ericsson_adapter, lambda_cisco_adapter)
+    server = ThreadingHTTPServer((host, port), GatewayHandler)
+    server.daemon_threads = True
+    server.access_log = access_log
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def endpoint_of(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{STAGE_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the AURA MCP Gateway locally")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--quiet', action='store_true', help='Suppress Lambda log output')
+    parser.add_argument('--access-log', action='store_true', help='Log every HTTP request')
+    parser.add_argument('--write-config', metavar='PATH',
+                        help='Write a gateway config file pointing at this server')
+    args = parser.parse_args()
+
+    server = start(args.host, args.port, quiet=args.quiet, access_log=args.access_log)
+    endpoint = endpoint_of(server)
+
+    if args.write_config:
+        with open(args.write_config, 'w') as f:
+            json.dump({
+                'api_id': 'local',
+                'region': 'local',
+                'endpoint': endpoint,
+                'deployed_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }, f, indent=2)
+
+    print("=" * 70)
+    print("AURA MCP Gateway - Local Emulator")
+    print("=" * 70)
+    print(f"🌐 Endpoint: {endpoint}")
+    if args.write_config:
+        print(f"📝 Config:   {args.write_config} (use AURA_GATEWAY_CONFIG={args.write_config})")
+    print("Press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n👋 Stopping")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
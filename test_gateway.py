@@ -1,14 +1,12 @@
-import requests
 import json
 
+from aura_gateway_fixtures import gateway_post, load_gateway_endpoint
+
 def test_gateway():
     """Test the AURA MCP Gateway"""
     
     # Load configuration
-    with open('gateway_config.json', 'r') as f:
-        config = json.load(f)
-    
-    endpoint = config['endpoint']
+    endpoint = load_gateway_endpoint()
     
     print("=" * 70)
     print("AURA MCP Gateway - Testing")
@@ -66,7 +64,7 @@ def test_gateway():
         print("-" * 70)
         
         try:
-            response = requests.post(
+            response = gateway_post(
                 endpoint,
                 json=test['payload'],
                 headers={'Content-Type': 'application/json'},
@@ -1,22 +1,31 @@
-from aura_agent import AURAAgent
+import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import aura_agent
+from aura_agent import AURAAgent, bedrock_runtime
+from aura_mock_bedrock import pacing_delay
+from aura_ingest import AgentWorkerPool, run_pipeline
+from aura_quota import (DEFAULT_RPM, DEFAULT_TPM, AdmissionController, IncidentCostModel,
+                        QuotaBudget, install_call_budget)
+from benchmark_scenarios import instrument, run_scenario
+
+SCENARIOS = {
+    "Fiber Failure": "Site DUB-07 has KPI degradation. Investigate.",
+    
+    "Power Outage": "Site LON-15 shows power alarms and backup battery at 20%. Check status.",
+    
+    "Multiple Sites": "We're seeing issues at DUB-07, LON-15, and PAR-03. Please triage.",
+    
+    "False Alarm": "Alert received for DUB-07 but KPIs look normal. Investigate.",
+    
+    "Capacity Issue": "Users complaining about slow data at DUB-07 during peak hours."
+}
 
 def run_scenario_suite():
     """Run multiple test scenarios"""
     
-    scenarios = {
-        "Fiber Failure": "Site DUB-07 has KPI degradation. Investigate.",
-        
-        "Power Outage": "Site LON-15 shows power alarms and backup battery at 20%. Check status.",
-        
-        "Multiple Sites": "We're seeing issues at DUB-07, LON-15, and PAR-03. Please triage.",
-        
-        "False Alarm": "Alert received for DUB-07 but KPIs look normal. Investigate.",
-        
-        "Capacity Issue": "Users complaining about slow data at DUB-07 during peak hours."
-    }
-    
-    for name, scenario in scenarios.items():
+    for name, scenario in SCENARIOS.items():
         print("\n" + "=" * 70)
         print(f"TEST SCENARIO: {name}")
         print("=" * 70)
@@ -30,7 +39,109 @@ def run_scenario_suite():
         print(f"\n🤖 AURA: {response}\n")
         
         print("\n⏳ Waiting 10 seconds before next scenario...")
-        time.sleep(10)
+        time.sleep(pacing_delay(10, bedrock_runtime))
+
+def run_parallel_suite(workers: int, rpm: float, tpm: float) -> dict:
+    """
+    Run the scenarios concurrently, one AURAAgent each. All model calls
+    draw from one RPM/TPM budget instead of the agent's fixed per-call
+    sleep, so the suite runs as fast as the quota allows. Results are
+    reported in SCENARIOS order whatever order they finish in.
+    """
+    budget = QuotaBudget(rpm, tpm)
+    install_call_budget(aura_agent, budget)
+    instrument(aura_agent)
+    # Agent output from concurrent scenarios would interleave
+    aura_agent.print = lambda *args, **kwargs: None
+    
+    print(f"Running {len(SCENARIOS)} scenarios, {workers} at a time "
+          f"(budget {rpm:g} RPM / {tpm:g} TPM)\n")
+    started = time.perf_counter()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_scenario, aura_agent, name, prompt): name
+                   for name, prompt in SCENARIOS.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            print(f"   ✓ {name} finished in {results[name]['wall_s']:.1f}s")
+    elapsed = time.perf_counter() - started
+    
+    for name, scenario in SCENARIOS.items():
+        result = results[name]
+        print("\n" + "=" * 70)
+        print(f"TEST SCENARIO: {name}")
+        print("=" * 70)
+        print(f"\n👤 Operator: {scenario}")
+        print(f"\n🤖 AURA: {result['response']}\n")
+        print(f"   {result['wall_s']:.1f}s | {result['llm_round_trips']} LLM calls "
+              f"({result['throttles']} throttled) | {result['tool_calls']} tool calls | "
+              f"{result['input_tokens']}/{result['output_tokens']} tokens")
+    
+    stats = budget.stats()
+    print("\n" + "=" * 70)
+    print(f"Suite finished in {elapsed:.1f}s | {stats['requests']} model calls, "
+          f"{stats['waits']} waited on the budget ({stats['wait_s']:.1f}s total)")
+    print("=" * 70)
+    return {name: results[name] for name in SCENARIOS}
+
+def run_admission_burst(incidents: int, max_queue: int = 4, max_wait_s: float = 10.0) -> dict:
+    """
+    A burst of unrelated site alarms through the ingest pipeline with
+    admission control against a quota that fits only a few incidents.
+    Intake must finish without waiting on the quota, the queue must stay
+    within max_queue, and the overflow must be shed.
+    """
+    requests, tokens = IncidentCostModel().estimate({'prompt': 'x' * 400})
+    # Room for two incidents up front, then one more per second
+    budget = QuotaBudget(rpm=requests * 60, tpm=tokens * 60)
+    budget.requests, budget.tokens = requests * 2, tokens * 2
+    admission = AdmissionController(budget, max_queue=max_queue, max_wait_s=max_wait_s)
+    
+    handled = []
+    pool = AgentWorkerPool(lambda: handled.append, workers=2, max_pending=8)
+    intake = {}
+    
+    def burst():
+        for i in range(incidents):
+            yield {'element_id': f'BURST-{i:03d}', 'type': 'LINK_DOWN',
+                   'alarm_id': f'burst-{i}', 'description': 'x' * 400}
+        intake['done_s'] = time.perf_counter() - started
+    
+    print(f"Bursting {incidents} incidents into admission "
+          f"(queue {max_queue}, max wait {max_wait_s:g}s)\n")
+    started = time.perf_counter()
+    stats = run_pipeline(burst(), pool, window_s=0.0, admission=admission)
+    elapsed = time.perf_counter() - started
+    admitted = stats['admission']['admitted']
+    
+    checks = {
+        f"intake finished in {intake['done_s']:.2f}s without waiting on the quota":
+            intake['done_s'] < 1.0,
+        f"{stats['admission']['queued']} queued, at most {stats['admission']['queue_peak']} at once":
+            0 < stats['admission']['queue_peak'] <= max_queue,
+        f"{stats['incidents_shed']} of {incidents} shed": stats['incidents_shed'] > 0,
+        f"{admitted} admitted, all dispatched": admitted == len(handled),
+    }
+    for check, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {check}")
+    print(f"\nBurst drained in {elapsed:.1f}s")
+    return dict(stats, passed=all(checks.values()))
 
 if __name__ == "__main__":
-    run_scenario_suite()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the AURA test scenarios")
+    parser.add_argument('--parallel', type=int, metavar='N',
+                        help='Run up to N scenarios concurrently under a shared quota budget')
+    parser.add_argument('--rpm', type=float, default=DEFAULT_RPM, help='Model requests per minute')
+    parser.add_argument('--tpm', type=float, default=DEFAULT_TPM, help='Model tokens per minute')
+    parser.add_argument('--admission-burst', type=int, metavar='N',
+                        help='Check that admission control sheds a burst of N incidents')
+    args = parser.parse_args()
+    
+    if args.admission_burst:
+        if not run_admission_burst(args.admission_burst)['passed']:
+            raise SystemExit(1)
+    elif args.parallel:
+        run_parallel_suite(args.parallel, args.rpm, args.tpm)
+    else:
+        run_scenario_suite()
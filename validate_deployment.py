@@ -1,128 +1,223 @@
 #!/usr/bin/env python3
 """
 Complete validation of AURA MCP Gateway deployment
+
+All checks run concurrently. Each one must succeed and answer within
+its tool's latency SLO, and the whole run must finish inside the time
+budget. A deployment that is functionally correct but slow is rejected,
+for example one suffering cold starts or routed to a distant region.
+
+Usage:
+    python3 validate_deployment.py
+    python3 validate_deployment.py --budget 10 --slo get_cell_kpis=800 --output validation.json
 """
 
+import argparse
 import json
-import requests
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aura_gateway_fixtures import gateway_post, load_gateway_endpoint
+
+# Per-tool latency SLOs (ms), end to end through API Gateway and the router
+DEFAULT_SLOS_MS = {
+    'get_cell_kpis': 1500,
+    'measure_link_latency': 1500,
+    'initiate_ntn_failover': 5000,
+}
+
+# Wall-clock budget for the whole validation run (s)
+DEFAULT_BUDGET_S = 15.0
 
-def validate_gateway():
+# Validation tests
+TESTS = [
+    {
+        "category": "Nokia Adapter",
+        "tests": [
+            ("Cell KPIs", {"tool": "get_cell_kpis", "target": "DUB-07"}),
+            ("Fiber Latency", {"tool": "measure_link_latency", "target": "DUB-07-FIBER"}),
+            ("NTN Latency", {"tool": "measure_link_latency", "target": "DUB-07-NTN"}),
+            ("Failover", {"tool": "initiate_ntn_failover", "target": "DUB-07"}),
+        ]
+    },
+    {
+        "category": "Ericsson Adapter",
+        "tests": [
+            ("Cell KPIs", {"tool": "get_cell_kpis", "target": "LON-15"}),
+            ("Link Latency", {"tool": "measure_link_latency", "target": "LON-15-FIBER"}),
+        ]
+    },
+    {
+        "category": "Cisco Adapter",
+        "tests": [
+            ("Device KPIs", {"tool": "get_cell_kpis", "target": "PAR-03"}),
+            ("Path Latency", {"tool": "measure_link_latency", "target": "PAR-03-MPLS"}),
+        ]
+    },
+]
+
+def run_check(endpoint: str, category: str, name: str, payload: dict,
+              slo_ms: float, timeout: float) -> dict:
+    """One gateway request, judged on correctness and latency"""
+    result = {
+        "category": category,
+        "name": name,
+        "tool": payload["tool"],
+        "target": payload["target"],
+        "slo_ms": slo_ms
+    }
+    started = time.perf_counter()
+    try:
+        response = gateway_post(
+            endpoint,
+            json=payload,
+            headers={'Content-Type': 'application/json'},
+            timeout=timeout
+        )
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["status"] = response.status_code
+        if response.status_code == 200:
+            data = response.json()
+            result["vendor"] = data.get('vendor', 'Unknown')
+            result["success"] = bool(data.get('success', False))
+            result["response"] = data.get('data', {})
+            if not result["success"]:
+                result["failure"] = "Success flag is False"
+        else:
+            result["success"] = False
+            result["failure"] = f"HTTP {response.status_code}: {response.text[:200]}"
+    except Exception as e:
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["success"] = False
+        result["failure"] = f"Exception: {str(e)}"
+
+    result["within_slo"] = result["latency_ms"] <= slo_ms
+    if result["success"] and not result["within_slo"]:
+        result["failure"] = f"Latency {result['latency_ms']:.0f}ms exceeds SLO {slo_ms:.0f}ms"
+    result["passed"] = result["success"] and result["within_slo"]
+    return result
+
+def validate_gateway(slos_ms: dict = None, budget_s: float = DEFAULT_BUDGET_S,
+                     concurrency: int = 8, timeout: float = 10.0, quiet: bool = False) -> dict:
     """Run comprehensive validation tests"""
-    
-    print("╔════════════════════════════════════════════════════════════════════╗")
-    print("║        AURA MCP Gateway - Deployment Validation                   ║")
-    print("╚════════════════════════════════════════════════════════════════════╝")
-    print()
-    
+    slos_ms = dict(DEFAULT_SLOS_MS, **(slos_ms or {}))
+    log = (lambda *args, **kwargs: None) if quiet else print
+
+    log("╔════════════════════════════════════════════════════════════════════╗")
+    log("║        AURA MCP Gateway - Deployment Validation                   ║")
+    log("╚════════════════════════════════════════════════════════════════════╝")
+    log()
+
     # Load configuration
     try:
-        with open('gateway_config.json', 'r') as f:
-            config = json.load(f)
-        endpoint = config['endpoint']
-        print(f"✅ Configuration loaded")
-        print(f"   Endpoint: {endpoint}")
+        endpoint = load_gateway_endpoint()
+        log(f"✅ Configuration loaded")
+        log(f"   Endpoint: {endpoint}")
     except FileNotFoundError:
-        print("❌ gateway_config.json not found!")
-        print("   Run ./create_api_gateway.sh first")
-        return False
-    
-    print()
-    
-    # Validation tests
-    tests = [
-        {
-            "category": "Nokia Adapter",
-            "tests": [
-                ("Cell KPIs", {"tool": "get_cell_kpis", "target": "DUB-07"}),
-                ("Fiber Latency", {"tool": "measure_link_latency", "target": "DUB-07-FIBER"}),
-                ("NTN Latency", {"tool": "measure_link_latency", "target": "DUB-07-NTN"}),
-                ("Failover", {"tool": "initiate_ntn_failover", "target": "DUB-07"}),
-            ]
-        },
-        {
-            "category": "Ericsson Adapter",
-            "tests": [
-                ("Cell KPIs", {"tool": "get_cell_kpis", "target": "LON-15"}),
-                ("Link Latency", {"tool": "measure_link_latency", "target": "LON-15-FIBER"}),
-            ]
-        },
-        {
-            "category": "Cisco Adapter",
-            "tests": [
-                ("Device KPIs", {"tool": "get_cell_kpis", "target": "PAR-03"}),
-                ("Path Latency", {"tool": "measure_link_latency", "target": "PAR-03-MPLS"}),
-            ]
-        },
-    ]
-    
-    total_tests = sum(len(cat["tests"]) for cat in tests)
-    passed = 0
-    failed = 0
-    
-    for category in tests:
-        print(f"\n{'='*70}")
-        print(f"Testing: {category['category']}")
-        print(f"{'='*70}")
-        
-        for test_name, payload in category["tests"]:
-            print(f"\n  ▶ {test_name}")
-            print(f"    Payload: {json.dumps(payload)}")
-            
-            try:
-                response = requests.post(
-                    endpoint,
-                    json=payload,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    vendor = data.get('vendor', 'Unknown')
-                    success = data.get('success', False)
-                    
-                    if success:
-                        print(f"    ✅ PASS - Vendor: {vendor}")
-                        print(f"       Response: {json.dumps(data.get('data', {}), indent=8)[:200]}...")
-                        passed += 1
-                    else:
-                        print(f"    ❌ FAIL - Success flag is False")
-                        failed += 1
-                else:
-                    print(f"    ❌ FAIL - HTTP {response.status_code}")
-                    print(f"       {response.text[:200]}")
-                    failed += 1
-                    
-            except Exception as e:
-                print(f"    ❌ FAIL - Exception: {str(e)}")
-                failed += 1
-            
-            time.sleep(1)  # Rate limiting
-    
+        log("❌ gateway_config.json not found!")
+        log("   Run ./create_api_gateway.sh first")
+        return {"ok": False, "error": "gateway_config.json not found"}
+
+    checks = [(category["category"], name, payload)
+              for category in TESTS for name, payload in category["tests"]]
+    log(f"   Running {len(checks)} checks, {concurrency} at a time "
+        f"(budget {budget_s:g}s)")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_check, endpoint, category, name, payload,
+                               slos_ms.get(payload["tool"], max(slos_ms.values())), timeout)
+                   for category, name, payload in checks]
+        # Collected in declaration order, whatever order they finish in
+        results = [future.result() for future in futures]
+    elapsed_s = time.perf_counter() - started
+
+    for category in TESTS:
+        log(f"\n{'='*70}")
+        log(f"Testing: {category['category']}")
+        log(f"{'='*70}")
+        for result in (r for r in results if r["category"] == category["category"]):
+            latency = f"{result['latency_ms']:.0f}ms / SLO {result['slo_ms']:.0f}ms"
+            log(f"\n  ▶ {result['name']}")
+            log(f"    Payload: {json.dumps({'tool': result['tool'], 'target': result['target']})}")
+            if result["passed"]:
+                log(f"    ✅ PASS - Vendor: {result['vendor']} ({latency})")
+                log(f"       Response: {json.dumps(result['response'], indent=8)[:200]}...")
+            else:
+                log(f"    ❌ FAIL - {result['failure']} ({latency})")
+
+    passed = sum(1 for r in results if r["passed"])
+    failed = len(results) - passed
+    slo_violations = sum(1 for r in results if r["success"] and not r["within_slo"])
+    within_budget = elapsed_s <= budget_s
+    report = {
+        "ok": failed == 0 and within_budget,
+        "endpoint": endpoint,
+        "validated_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        "elapsed_s": round(elapsed_s, 3),
+        "budget_s": budget_s,
+        "within_budget": within_budget,
+        "total": len(results),
+        "passed": passed,
+        "failed": failed,
+        "slo_violations": slo_violations,
+        "slos_ms": slos_ms,
+        "checks": [{k: v for k, v in r.items() if k != "response"} for r in results]
+    }
+
     # Summary
-    print("\n")
-    print("╔════════════════════════════════════════════════════════════════════╗")
-    print("║                      VALIDATION SUMMARY                            ║")
-    print("╚════════════════════════════════════════════════════════════════════╝")
-    print()
-    print(f"Total Tests:  {total_tests}")
-    print(f"✅ Passed:     {passed}")
-    print(f"❌ Failed:     {failed}")
-    print(f"Success Rate: {(passed/total_tests*100):.1f}%")
-    print()
-    
-    if failed == 0:
-        print("🎉 ALL TESTS PASSED! Gateway is ready for production.")
-        print()
-        print("Next Steps:")
-        print("  1. Run: python3 aura_with_gateway.py")
-        print("  2. Test end-to-end agent workflow")
-        print("  3. Proceed to Phase 3: AgentCore deployment")
-        return True
+    log("\n")
+    log("╔════════════════════════════════════════════════════════════════════╗")
+    log("║                      VALIDATION SUMMARY                            ║")
+    log("╚════════════════════════════════════════════════════════════════════╝")
+    log()
+    log(f"Total Tests:  {len(results)}")
+    log(f"✅ Passed:     {passed}")
+    log(f"❌ Failed:     {failed} ({slo_violations} over latency SLO)")
+    log(f"Success Rate: {(passed/len(results)*100):.1f}%")
+    log(f"Elapsed:      {elapsed_s:.2f}s of {budget_s:g}s budget")
+    log()
+
+    if report["ok"]:
+        log("🎉 ALL TESTS PASSED! Gateway is ready for production.")
+        log()
+        log("Next Steps:")
+        log("  1. Run: python3 aura_with_gateway.py")
+        log("  2. Test end-to-end agent workflow")
+        log("  3. Proceed to Phase 3: AgentCore deployment")
+    elif not within_budget:
+        log("⚠️  Validation exceeded its time budget. Check for cold starts or a distant region.")
     else:
-        print("⚠️  Some tests failed. Please review the errors above.")
-        return False
+        log("⚠️  Some tests failed. Please review the errors above.")
+    return report
+
+def parse_slo(value: str):
+    tool, _, ms = value.partition('=')
+    if not ms:
+        raise argparse.ArgumentTypeError(f"expected TOOL=MS, got {value!r}")
+    return tool, float(ms)
 
 if __name__ == "__main__":
-    validate_gateway() # Documentation
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Validate the AURA MCP Gateway deployment")
+    parser.add_argument('--slo', type=parse_slo, action='append', default=[], metavar='TOOL=MS',
+                        help='Latency SLO for a tool (repeatable)')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_S,
+                        help='Wall-clock budget for the whole run (s)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout (s)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--json', action='store_true', help='Print only the JSON report')
+    args = parser.parse_args()
+
+    report = validate_gateway(dict(args.slo), budget_s=args.budget,
+                              concurrency=args.concurrency, timeout=args.timeout,
+                              quiet=args.json)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        if not args.json:
+            print(f"💾 Report written to {args.output}")
+    sys.exit(0 if report["ok"] else 1)